@@ -194,8 +194,13 @@ def _sanitize_space_meta(space_meta: dict[str, Any]) -> dict[str, Any]:
     if isinstance(settings_obj, dict):
         settings = dict(settings_obj)
         settings.pop("hmac_key", None)
-        if "invitations" in settings:
-            settings["invitations"] = {}
+        for key in (
+            "invitations",
+            "invitations_by_token_hash",
+            "pending_invitations_by_user",
+        ):
+            if key in settings:
+                settings[key] = {}
         sanitized["settings"] = settings
     space_id = sanitized.get("id")
     sanitized["is_admin_space"] = isinstance(space_id, str) and _is_admin_space(
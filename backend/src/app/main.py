@@ -105,7 +105,8 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
             logger.warning("Failed to ensure default space: %s", exc)
 
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    await ugoite_core.flush_audit_events()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -17,10 +17,13 @@ MEMBERSHIP_MANAGED_SPACE_SETTING_KEYS = frozenset(
     {
         "admin_user_ids",
         "invitations",
+        "invitations_by_token_hash",
         "member_roles",
         "members",
+        "membership_maps_version",
         "membership_version",
         "owner_user_id",
+        "pending_invitations_by_user",
     },
 )
 TotpCode = Annotated[
@@ -11,10 +11,13 @@ use ugoite_core::sample_data::SampleDataOptions;
 const MEMBERSHIP_MANAGED_SPACE_SETTING_KEYS: &[&str] = &[
     "admin_user_ids",
     "invitations",
+    "invitations_by_token_hash",
     "member_roles",
     "members",
+    "membership_maps_version",
     "membership_version",
     "owner_user_id",
+    "pending_invitations_by_user",
 ];
 
 fn backend_api_mode_error(config: &EndpointConfig, command_name: &str) -> String {
@@ -6,12 +6,14 @@ use serde_json::{json, Value};
 use sha2::{Digest, Sha256};
 use std::collections::HashMap;
 use std::sync::{Arc, OnceLock};
-use tokio::sync::Mutex;
+use tokio::sync::{oneshot, Mutex};
 
 const DEFAULT_AUDIT_LIMIT: usize = 100;
 const MAX_AUDIT_LIMIT: usize = 500;
 const DEFAULT_AUDIT_RETENTION: usize = 5000;
 const MAX_AUDIT_RETENTION: usize = 50000;
+const AUDIT_READ_CHUNK_BYTES: usize = 4 * 1024 * 1024;
+const AUDIT_READ_CONCURRENCY: usize = 4;
 
 #[derive(Debug, Clone)]
 pub struct AuditListOptions {
@@ -34,21 +36,81 @@ impl Default for AuditListOptions {
     }
 }
 
-static SPACE_LOCKS: OnceLock<Mutex<HashMap<String, Arc<Mutex<()>>>>> = OnceLock::new();
+/// Storage-level identity of the audit file, used to detect writes made
+/// outside this process (or tampering) since the cache was primed.
+#[derive(Debug, Clone, PartialEq, Eq)]
+struct AuditFileFingerprint {
+    content_length: u64,
+    last_modified: Option<String>,
+    etag: Option<String>,
+}
+
+impl AuditFileFingerprint {
+    fn is_trustworthy(&self) -> bool {
+        self.last_modified.is_some() || self.etag.is_some()
+    }
+}
+
+/// Verified events of one audit file, kept behind that space's lock so
+/// appends and listings skip the read + chain verification while the file
+/// is unchanged on storage.
+struct CachedAuditLog {
+    fingerprint: Option<AuditFileFingerprint>,
+    events: Vec<Value>,
+    /// Set when the file ends in an unterminated line, so the next write
+    /// replaces the file instead of appending after the torn record.
+    needs_rewrite: bool,
+}
+
+/// Event prepared by its caller and waiting for a group commit; whichever
+/// caller holds the log lock chains and persists every pending event at once.
+struct PendingAppend {
+    event: Value,
+    retention: usize,
+    reply: oneshot::Sender<std::result::Result<Value, String>>,
+}
+
+struct AuditLogSlot {
+    dir_path: String,
+    file_path: String,
+    log: Mutex<Option<CachedAuditLog>>,
+    pending: std::sync::Mutex<Vec<PendingAppend>>,
+}
+
+static SPACE_LOCKS: OnceLock<std::sync::Mutex<HashMap<String, Arc<AuditLogSlot>>>> =
+    OnceLock::new();
 static SPACE_ID_PATTERN: OnceLock<Regex> = OnceLock::new();
 
-fn lock_registry() -> &'static Mutex<HashMap<String, Arc<Mutex<()>>>> {
-    SPACE_LOCKS.get_or_init(|| Mutex::new(HashMap::new()))
+fn lock_registry() -> &'static std::sync::Mutex<HashMap<String, Arc<AuditLogSlot>>> {
+    SPACE_LOCKS.get_or_init(|| std::sync::Mutex::new(HashMap::new()))
 }
 
-async fn space_lock(space_id: &str) -> Arc<Mutex<()>> {
-    let mut registry = lock_registry().lock().await;
-    if let Some(existing) = registry.get(space_id) {
-        return existing.clone();
-    }
-    let created = Arc::new(Mutex::new(()));
-    registry.insert(space_id.to_string(), created.clone());
-    created
+fn audit_log_key(op: &Operator, space_id: &str) -> String {
+    let info = op.info();
+    format!(
+        "{}://{}{}#{space_id}",
+        info.scheme(),
+        info.name(),
+        info.root()
+    )
+}
+
+/// The registry is only held for a map lookup, never across an await, so a
+/// plain mutex is enough and callers do not queue behind an async lock.
+fn space_lock(op: &Operator, space_id: &str) -> Result<Arc<AuditLogSlot>> {
+    let key = audit_log_key(op, space_id);
+    let mut registry = lock_registry()
+        .lock()
+        .map_err(|_| anyhow!("audit lock registry poisoned"))?;
+    let slot = registry.entry(key).or_insert_with(|| {
+        Arc::new(AuditLogSlot {
+            dir_path: format!("spaces/{space_id}/audit/"),
+            file_path: audit_file_path(space_id),
+            log: Mutex::new(None),
+            pending: std::sync::Mutex::new(Vec::new()),
+        })
+    });
+    Ok(Arc::clone(slot))
 }
 
 fn normalize_retention_limit(limit: Option<usize>) -> usize {
@@ -82,28 +144,38 @@ fn audit_file_path(space_id: &str) -> String {
     format!("spaces/{space_id}/audit/events.jsonl")
 }
 
+/// Random v4 id drawn from the OS-seeded thread-local CSPRNG, avoiding an
+/// OS entropy syscall per appended event.
+fn new_audit_event_uuid() -> uuid::Uuid {
+    uuid::Builder::from_random_bytes(rand::random::<u128>().to_le_bytes()).into_uuid()
+}
+
 fn now_iso() -> String {
     Utc::now().to_rfc3339_opts(SecondsFormat::Millis, true)
 }
 
+/// Hash `prev_hash:canonical_json` without materializing the concatenated
+/// material: the canonical payload is serialized straight into the hasher.
 fn event_hash(payload: &Value, prev_hash: &str) -> Result<String> {
-    let canonical = serde_json::to_string(payload)?;
-    let material = format!("{prev_hash}:{canonical}");
-    let digest = Sha256::digest(material.as_bytes());
-    Ok(hex::encode(digest))
+    let mut hasher = Sha256::new();
+    hasher.update(prev_hash.as_bytes());
+    hasher.update(b":");
+    serde_json::to_writer(&mut hasher, payload)?;
+    Ok(hex::encode(hasher.finalize()))
 }
 
-fn verify_chain(events: &[Value]) -> Result<()> {
+fn verify_chain(events: &mut [Value]) -> Result<()> {
     let mut prev_hash = "root".to_string();
-    for event in events {
-        let mut candidate = event.clone();
-        let object = candidate
+    for event in events.iter_mut() {
+        // Detach `event_hash` in place instead of cloning the whole event;
+        // it is restored once the recomputed hash has been compared.
+        let object = event
             .as_object_mut()
             .ok_or_else(|| anyhow!("Audit log contains malformed JSON"))?;
-        let expected_hash = object
-            .remove("event_hash")
-            .and_then(|v| v.as_str().map(str::to_string))
-            .ok_or_else(|| anyhow!("Audit event missing event_hash"))?;
+        let expected_hash = match object.remove("event_hash") {
+            Some(Value::String(hash)) => hash,
+            _ => return Err(anyhow!("Audit event missing event_hash")),
+        };
         let candidate_prev_hash = object
             .get("prev_hash")
             .and_then(Value::as_str)
@@ -111,10 +183,16 @@ fn verify_chain(events: &[Value]) -> Result<()> {
         if candidate_prev_hash != prev_hash {
             return Err(anyhow!("Audit chain prev_hash mismatch"));
         }
-        let actual_hash = event_hash(&candidate, &prev_hash)?;
+        let actual_hash = event_hash(event, &prev_hash)?;
         if actual_hash != expected_hash {
             return Err(anyhow!("Audit chain integrity check failed"));
         }
+        if let Some(object) = event.as_object_mut() {
+            object.insert(
+                "event_hash".to_string(),
+                Value::String(expected_hash.clone()),
+            );
+        }
         prev_hash = expected_hash;
     }
     Ok(())
@@ -140,51 +218,128 @@ fn rehash_chain(events: &mut [Value]) -> Result<()> {
     Ok(())
 }
 
-async fn read_events(op: &Operator, space_id: &str) -> Result<Vec<Value>> {
-    let path = audit_file_path(space_id);
-    if !op.exists(&path).await? {
-        return Ok(Vec::new());
+/// Reads the whole log using the size already known from `stat`. Large logs
+/// are fetched as concurrent ranged chunks instead of one sequential stream.
+///
+/// Also returns whether the file ends in a line without its newline, which
+/// is what an interrupted append leaves behind.
+async fn read_events(
+    op: &Operator,
+    path: &str,
+    fingerprint: Option<&AuditFileFingerprint>,
+) -> Result<(Vec<Value>, bool)> {
+    let Some(fingerprint) = fingerprint else {
+        return Ok((Vec::new(), false));
+    };
+    let content_length = usize::try_from(fingerprint.content_length)?;
+    if content_length == 0 {
+        return Ok((Vec::new(), false));
     }
-    let bytes = op.read(&path).await?;
-    let content = String::from_utf8(bytes.to_vec())?;
+    let bytes = if content_length > AUDIT_READ_CHUNK_BYTES {
+        op.read_with(path)
+            .chunk(AUDIT_READ_CHUNK_BYTES)
+            .concurrent(AUDIT_READ_CONCURRENCY)
+            .await?
+            .to_bytes()
+    } else {
+        op.read(path).await?.to_bytes()
+    };
+    // Lines are parsed straight from the fetched buffer; serde validates UTF-8
+    // inside each record, so no separate whole-file decode pass is needed.
+    let complete_len = bytes
+        .iter()
+        .rposition(|byte| *byte == b'\n')
+        .map_or(0, |index| index + 1);
+    let (complete, tail) = bytes.split_at(complete_len);
     let mut events = Vec::new();
-    for line in content.lines() {
-        let trimmed = line.trim();
+    for line in complete.split(|byte| *byte == b'\n') {
+        let trimmed = line.trim_ascii();
         if trimmed.is_empty() {
             continue;
         }
-        let parsed: Value = serde_json::from_str(trimmed)
+        let parsed: Value = serde_json::from_slice(trimmed)
             .map_err(|_| anyhow!("Audit log contains malformed JSON"))?;
         if parsed.is_object() {
             events.push(parsed);
         }
     }
-    Ok(events)
+    // A truncated record cannot parse as an object, so it is dropped; its
+    // append never reported success. A complete record that only lacks its
+    // newline is kept.
+    let tail = tail.trim_ascii();
+    if tail.is_empty() {
+        return Ok((events, false));
+    }
+    if let Ok(parsed) = serde_json::from_slice::<Value>(tail) {
+        if parsed.is_object() {
+            events.push(parsed);
+        }
+    }
+    Ok((events, true))
 }
 
-async fn write_events(op: &Operator, space_id: &str, events: &[Value]) -> Result<()> {
-    let dir_path = format!("spaces/{space_id}/audit/");
-    op.create_dir(&dir_path).await?;
-    let path = audit_file_path(space_id);
-    let mut lines = Vec::with_capacity(events.len());
+async fn audit_file_fingerprint(op: &Operator, path: &str) -> Result<Option<AuditFileFingerprint>> {
+    match op.stat(path).await {
+        Ok(metadata) => Ok(Some(AuditFileFingerprint {
+            content_length: metadata.content_length(),
+            last_modified: metadata.last_modified().map(|value| format!("{value:?}")),
+            etag: metadata.etag().map(str::to_string),
+        })),
+        Err(err) if err.kind() == opendal::ErrorKind::NotFound => Ok(None),
+        Err(err) => Err(err.into()),
+    }
+}
+
+async fn cached_audit_log<'a>(
+    op: &Operator,
+    path: &str,
+    slot: &'a mut Option<CachedAuditLog>,
+) -> Result<&'a mut CachedAuditLog> {
+    let fingerprint = audit_file_fingerprint(op, path).await?;
+    let is_fresh = matches!(
+        (slot.as_ref(), fingerprint.as_ref()),
+        (Some(cached), Some(current))
+            if current.is_trustworthy() && cached.fingerprint.as_ref() == Some(current)
+    );
+    if !is_fresh {
+        *slot = None;
+        let (mut events, needs_rewrite) = read_events(op, path, fingerprint.as_ref()).await?;
+        verify_chain(&mut events)?;
+        *slot = Some(CachedAuditLog {
+            fingerprint,
+            events,
+            needs_rewrite,
+        });
+    }
+    slot.as_mut()
+        .ok_or_else(|| anyhow!("Audit log cache is unavailable"))
+}
+
+async fn append_event_lines(op: &Operator, path: &str, lines: Vec<u8>) -> Result<()> {
+    op.write_with(path, lines).append(true).await?;
+    Ok(())
+}
+
+/// Full rewrites are staged next to the log and renamed over it where the
+/// backend supports rename, so a crash mid-write cannot leave a truncated
+/// chain behind. Backends without rename publish a write atomically anyway.
+async fn write_events(op: &Operator, path: &str, events: &[Value]) -> Result<()> {
+    let mut payload = Vec::new();
     for item in events {
-        lines.push(serde_json::to_string(item)?);
+        serde_json::to_writer(&mut payload, item)?;
+        payload.push(b'\n');
     }
-    let mut payload = lines.join("\n");
-    if !payload.is_empty() {
-        payload.push('\n');
+    if !op.info().full_capability().rename {
+        op.write(path, payload).await?;
+        return Ok(());
     }
-    op.write(&path, payload.into_bytes()).await?;
+    let staging_path = format!("{path}.tmp");
+    op.write(&staging_path, payload).await?;
+    op.rename(&staging_path, path).await?;
     Ok(())
 }
 
-pub async fn append_audit_event(
-    op: &Operator,
-    space_id: &str,
-    payload: &Value,
-    retention_limit: Option<usize>,
-) -> Result<Value> {
-    let safe_space_id = validate_space_id(space_id)?;
+fn audit_event_draft(safe_space_id: &str, payload: &Value) -> Result<Value> {
     let payload_obj = payload
         .as_object()
         .ok_or_else(|| anyhow!("audit payload must be an object"))?;
@@ -205,34 +360,14 @@ pub async fn append_audit_event(
         .ok_or_else(|| anyhow!("actor_user_id must not be empty"))?
         .to_string();
 
-    let lock = space_lock(&safe_space_id).await;
-    let _guard = lock.lock().await;
-
-    let mut events = read_events(op, &safe_space_id).await?;
-    verify_chain(&events)?;
-
-    let prev_hash = events
-        .last()
-        .and_then(Value::as_object)
-        .and_then(|item| item.get("event_hash"))
-        .and_then(Value::as_str)
-        .unwrap_or("root")
-        .to_string();
-
     let metadata = payload_obj
         .get("metadata")
-        .and_then(Value::as_object)
-        .map(|_| {
-            payload_obj
-                .get("metadata")
-                .cloned()
-                .unwrap_or_else(|| json!({}))
-        })
+        .filter(|value| value.is_object())
+        .cloned()
         .unwrap_or_else(|| json!({}));
 
-    let mut event = json!({
-        "id": format!("audit-{}", uuid::Uuid::new_v4().simple()),
-        "timestamp": now_iso(),
+    Ok(json!({
+        "id": format!("audit-{}", new_audit_event_uuid().simple()),
         "space_id": safe_space_id,
         "action": action,
         "actor_user_id": actor_user_id,
@@ -243,25 +378,179 @@ pub async fn append_audit_event(
         "request_path": payload_obj.get("request_path").cloned().unwrap_or(Value::Null),
         "request_id": payload_obj.get("request_id").cloned().unwrap_or(Value::Null),
         "metadata": metadata,
-        "prev_hash": prev_hash,
-    });
+    }))
+}
 
-    let hash = event_hash(&event, event["prev_hash"].as_str().unwrap_or("root"))?;
-    event["event_hash"] = Value::String(hash);
-    events.push(event.clone());
+pub async fn append_audit_event(
+    op: &Operator,
+    space_id: &str,
+    payload: &Value,
+    retention_limit: Option<usize>,
+) -> Result<Value> {
+    append_audit_events(op, space_id, std::slice::from_ref(payload), retention_limit)
+        .await?
+        .pop()
+        .ok_or_else(|| anyhow!("audit append was dropped before commit"))
+}
+
+/// Append several events in order. They are queued together, so they land in
+/// the same batch write and are chained back to back.
+pub async fn append_audit_events(
+    op: &Operator,
+    space_id: &str,
+    payloads: &[Value],
+    retention_limit: Option<usize>,
+) -> Result<Vec<Value>> {
+    let safe_space_id = validate_space_id(space_id)?;
+    let drafts = payloads
+        .iter()
+        .map(|payload| audit_event_draft(&safe_space_id, payload))
+        .collect::<Result<Vec<_>>>()?;
+    if drafts.is_empty() {
+        return Ok(Vec::new());
+    }
 
     let retention = normalize_retention_limit(retention_limit);
-    if events.len() > retention {
-        let start_index = events.len() - retention;
-        events = events.split_off(start_index);
-        rehash_chain(&mut events)?;
-        if let Some(last) = events.last() {
-            event = last.clone();
+    let mut receivers = Vec::with_capacity(drafts.len());
+    let slot = space_lock(op, &safe_space_id)?;
+    {
+        let mut pending = slot
+            .pending
+            .lock()
+            .map_err(|_| anyhow!("audit append queue lock poisoned"))?;
+        for event in drafts {
+            let (reply, committed) = oneshot::channel();
+            pending.push(PendingAppend {
+                event,
+                retention,
+                reply,
+            });
+            receivers.push(committed);
+        }
+    }
+
+    {
+        let mut log = slot.log.lock().await;
+        let batch = {
+            let mut pending = slot
+                .pending
+                .lock()
+                .map_err(|_| anyhow!("audit append queue lock poisoned"))?;
+            std::mem::take(&mut *pending)
+        };
+        // An empty queue means an earlier lock holder already committed
+        // this caller's events as part of its batch.
+        if !batch.is_empty() {
+            commit_pending(op, &slot, &mut log, batch).await;
+        }
+    }
+
+    let mut appended = Vec::with_capacity(receivers.len());
+    for committed in receivers {
+        let event = committed
+            .await
+            .map_err(|_| anyhow!("audit append was dropped before commit"))?
+            .map_err(|message| anyhow!(message))?;
+        appended.push(event);
+    }
+    Ok(appended)
+}
+
+async fn commit_pending(
+    op: &Operator,
+    audit: &AuditLogSlot,
+    slot: &mut Option<CachedAuditLog>,
+    batch: Vec<PendingAppend>,
+) {
+    let retention = batch
+        .last()
+        .map(|pending| pending.retention)
+        .unwrap_or(DEFAULT_AUDIT_RETENTION);
+    let mut drafts = Vec::with_capacity(batch.len());
+    let mut replies = Vec::with_capacity(batch.len());
+    for pending in batch {
+        drafts.push(pending.event);
+        replies.push(pending.reply);
+    }
+
+    match append_to_cached_log(op, audit, slot, drafts, retention).await {
+        Ok(committed) => {
+            for (reply, event) in replies.into_iter().zip(committed) {
+                let _ = reply.send(Ok(event));
+            }
+        }
+        Err(err) => {
+            // The cached events may be ahead of storage; re-read on next access.
+            *slot = None;
+            let message = err.to_string();
+            for reply in replies {
+                let _ = reply.send(Err(message.clone()));
+            }
         }
     }
+}
+
+async fn append_to_cached_log(
+    op: &Operator,
+    audit: &AuditLogSlot,
+    slot: &mut Option<CachedAuditLog>,
+    drafts: Vec<Value>,
+    retention: usize,
+) -> Result<Vec<Value>> {
+    let log = cached_audit_log(op, &audit.file_path, slot).await?;
+    if log.fingerprint.is_none() {
+        op.create_dir(&audit.dir_path).await?;
+    }
+    // Appending after a torn last line would glue the new record onto it,
+    // so that case goes through the staged full rewrite instead.
+    let can_append = !log.needs_rewrite && op.info().full_capability().write_can_append;
+    let events = &mut log.events;
+    let had_events = !events.is_empty();
+    let first_index = events.len();
+
+    let mut prev_hash = events
+        .last()
+        .and_then(Value::as_object)
+        .and_then(|item| item.get("event_hash"))
+        .and_then(Value::as_str)
+        .unwrap_or("root")
+        .to_string();
+    let mut lines = Vec::new();
+    for mut event in drafts {
+        event["timestamp"] = Value::String(now_iso());
+        event["prev_hash"] = Value::String(prev_hash.clone());
+        let hash = event_hash(&event, &prev_hash)?;
+        event["event_hash"] = Value::String(hash.clone());
+        serde_json::to_writer(&mut lines, &event)?;
+        lines.push(b'\n');
+        events.push(event);
+        prev_hash = hash;
+    }
 
-    write_events(op, &safe_space_id, &events).await?;
-    Ok(event)
+    let committed = if events.len() > retention {
+        let start_index = events.len() - retention;
+        let trimmed: Vec<Value> = events.drain(..start_index).collect();
+        rehash_chain(events)?;
+        write_events(op, &audit.file_path, events).await?;
+        let mut committed: Vec<Value> = trimmed.into_iter().skip(first_index).collect();
+        committed.extend(
+            events[first_index.saturating_sub(start_index)..]
+                .iter()
+                .cloned(),
+        );
+        committed
+    } else {
+        if had_events && can_append {
+            append_event_lines(op, &audit.file_path, lines).await?;
+        } else {
+            write_events(op, &audit.file_path, events).await?;
+        }
+        events[first_index..].to_vec()
+    };
+
+    log.needs_rewrite = false;
+    log.fingerprint = audit_file_fingerprint(op, &audit.file_path).await?;
+    Ok(committed)
 }
 
 pub async fn list_audit_events(
@@ -270,11 +559,9 @@ pub async fn list_audit_events(
     options: AuditListOptions,
 ) -> Result<Value> {
     let safe_space_id = validate_space_id(space_id)?;
-    let lock = space_lock(&safe_space_id).await;
-    let _guard = lock.lock().await;
-
-    let mut events = read_events(op, &safe_space_id).await?;
-    verify_chain(&events)?;
+    let slot = space_lock(op, &safe_space_id)?;
+    let mut log_slot = slot.log.lock().await;
+    let log = cached_audit_log(op, &slot.file_path, &mut log_slot).await?;
 
     let action = options
         .action
@@ -293,50 +580,31 @@ pub async fn list_audit_events(
         .map(str::to_lowercase)
         .filter(|value| !value.is_empty());
 
-    events.retain(|event| {
+    let normalized_limit = options.limit.clamp(1, MAX_AUDIT_LIMIT);
+    let normalized_offset = options.offset;
+
+    // Events are stamped and chained in commit order, so walking the log
+    // backwards already yields newest-first without sorting.
+    let mut total = 0;
+    let mut items: Vec<Value> = Vec::new();
+    for event in log.events.iter().rev() {
         let Some(obj) = event.as_object() else {
-            return false;
+            continue;
         };
-        if let Some(action_value) = action {
-            if obj.get("action").and_then(Value::as_str) != Some(action_value) {
-                return false;
-            }
+        if action.is_some() && obj.get("action").and_then(Value::as_str) != action {
+            continue;
         }
-        if let Some(actor_value) = actor {
-            if obj.get("actor_user_id").and_then(Value::as_str) != Some(actor_value) {
-                return false;
-            }
+        if actor.is_some() && obj.get("actor_user_id").and_then(Value::as_str) != actor {
+            continue;
         }
-        if let Some(ref outcome_value) = outcome {
-            if obj.get("outcome").and_then(Value::as_str) != Some(outcome_value.as_str()) {
-                return false;
-            }
+        if outcome.is_some() && obj.get("outcome").and_then(Value::as_str) != outcome.as_deref() {
+            continue;
         }
-        true
-    });
-
-    events.sort_by(|left, right| {
-        let left_ts = left
-            .as_object()
-            .and_then(|obj| obj.get("timestamp"))
-            .and_then(Value::as_str)
-            .unwrap_or("");
-        let right_ts = right
-            .as_object()
-            .and_then(|obj| obj.get("timestamp"))
-            .and_then(Value::as_str)
-            .unwrap_or("");
-        right_ts.cmp(left_ts)
-    });
-
-    let normalized_limit = options.limit.clamp(1, MAX_AUDIT_LIMIT);
-    let normalized_offset = options.offset;
-    let total = events.len();
-    let items: Vec<Value> = events
-        .into_iter()
-        .skip(normalized_offset)
-        .take(normalized_limit)
-        .collect();
+        if total >= normalized_offset && items.len() < normalized_limit {
+            items.push(event.clone());
+        }
+        total += 1;
+    }
 
     Ok(json!({
         "items": items,
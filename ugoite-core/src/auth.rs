@@ -1,14 +1,51 @@
 use base64::{engine::general_purpose::URL_SAFE_NO_PAD, Engine as _};
 use hmac::{Hmac, KeyInit, Mac};
 use serde_json::{json, Map, Value};
+use sha2::{Digest, Sha256};
 use sha2_hmac::Sha256 as HmacSha256Digest;
-use std::collections::{HashMap, HashSet};
+use std::collections::{HashMap, HashSet, VecDeque};
+use std::hash::{BuildHasherDefault, Hasher};
+use std::sync::{Arc, Mutex, OnceLock};
 use subtle::ConstantTimeEq;
 
+// Both sha2 versions select SHA-NI / ARMv8 SHA2 instructions at runtime via
+// cpufeatures, so signed-token verification needs no build-time flags.
 type HmacSha256 = Hmac<HmacSha256Digest>;
+/// Static credentials are indexed by SHA-256 of the secret so lookups probe
+/// fixed-length digests instead of comparing attacker-controlled strings.
+type CredentialDigest = [u8; 32];
+type DigestMap<V> = HashMap<CredentialDigest, V, BuildHasherDefault<DigestHasher>>;
+
+/// Credential digests are already uniformly distributed SHA-256 output, so
+/// their leading bytes serve as the table hash without rehashing them. Keys
+/// only come from configuration or verified tokens, never raw request input.
+#[derive(Default)]
+struct DigestHasher(u64);
+
+impl Hasher for DigestHasher {
+    fn finish(&self) -> u64 {
+        self.0
+    }
+
+    fn write(&mut self, bytes: &[u8]) {
+        let mut prefix = [0u8; 8];
+        let len = bytes.len().min(prefix.len());
+        prefix[..len].copy_from_slice(&bytes[..len]);
+        self.0 ^= u64::from_le_bytes(prefix);
+    }
+
+    // Digests are fixed-size, so the slice length prefix carries no entropy.
+    fn write_usize(&mut self, _: usize) {}
+}
 
 const AUTH_HEADER_PARTS: usize = 2;
 const SIGNED_TOKEN_PARTS: usize = 3;
+/// An unpadded base64url HMAC-SHA256 signature is always 43 characters.
+const SIGNATURE_SEGMENT_LEN: usize = 43;
+/// Decoded signature size plus base64 decode slack.
+const SIGNATURE_BUFFER_BYTES: usize = 48;
+const SIGNED_TOKEN_CACHE_MAX: usize = 4096;
+const PRINCIPAL_TYPES: [&str; 2] = ["user", "service"];
 
 #[derive(Debug, Clone)]
 pub struct CoreAuthError {
@@ -51,36 +88,22 @@ fn parse_json_map(raw: Option<&str>) -> Map<String, Value> {
     let Some(raw_text) = raw else {
         return Map::new();
     };
-    let Ok(parsed) = serde_json::from_str::<Value>(raw_text) else {
-        return Map::new();
-    };
-    parsed.as_object().cloned().unwrap_or_default()
+    match serde_json::from_str::<Value>(raw_text) {
+        Ok(Value::Object(map)) => map,
+        _ => Map::new(),
+    }
 }
 
-fn parse_key_value_map(raw: Option<&str>) -> HashMap<String, String> {
-    let mut result = HashMap::new();
-    let Some(raw_text) = raw else {
-        return result;
-    };
-    for pair in raw_text.split(',') {
-        let item = pair.trim();
-        if item.is_empty() {
-            continue;
-        }
-        let mut parts = item.splitn(2, ':');
-        let Some(key) = parts.next() else {
-            continue;
-        };
-        let Some(value) = parts.next() else {
-            continue;
-        };
-        let key_trimmed = key.trim();
-        let value_trimmed = value.trim();
-        if !key_trimmed.is_empty() && !value_trimmed.is_empty() {
-            result.insert(key_trimmed.to_string(), value_trimmed.to_string());
-        }
-    }
-    result
+/// Trimmed, non-empty `key:value` pairs of a comma-separated list, borrowed
+/// straight from the raw string.
+fn key_value_pairs<'a>(raw: Option<&'a str>) -> impl Iterator<Item = (&'a str, &'a str)> {
+    raw.into_iter()
+        .flat_map(|text| text.split(','))
+        .filter_map(|pair| {
+            let (key, value) = pair.split_once(':')?;
+            let (key, value) = (key.trim(), value.trim());
+            (!key.is_empty() && !value.is_empty()).then_some((key, value))
+        })
 }
 
 fn parse_string_set(raw: Option<&str>) -> HashSet<String> {
@@ -101,20 +124,37 @@ fn parse_scopes(value: Option<&Value>) -> Vec<String> {
     let Some(Value::Array(items)) = value else {
         return Vec::new();
     };
-    let mut scopes: Vec<String> = items
-        .iter()
-        .filter_map(Value::as_str)
-        .map(str::trim)
-        .filter(|scope| !scope.is_empty())
-        .map(ToString::to_string)
-        .collect();
-    scopes.sort();
+    let mut scopes = Vec::with_capacity(items.len());
+    scopes.extend(
+        items
+            .iter()
+            .filter_map(Value::as_str)
+            .map(str::trim)
+            .filter(|scope| !scope.is_empty())
+            .map(ToString::to_string),
+    );
+    // Scope lists are short and usually already ordered; skip the sort then.
+    if !scopes.is_sorted() {
+        scopes.sort_unstable();
+    }
     scopes.dedup();
     scopes
 }
 
-fn parse_record_map(raw: Option<&str>) -> HashMap<String, CredentialRecord> {
-    let mut records = HashMap::new();
+/// Moves a string field out of a parsed JSON object instead of cloning it.
+fn take_string(obj: &mut Map<String, Value>, key: &str) -> Option<String> {
+    match obj.remove(key) {
+        Some(Value::String(value)) => Some(value),
+        _ => None,
+    }
+}
+
+fn credential_digest(credential: &str) -> CredentialDigest {
+    Sha256::digest(credential.as_bytes()).into()
+}
+
+fn parse_record_map(raw: Option<&str>) -> DigestMap<CredentialRecord> {
+    let mut records = DigestMap::default();
     for (credential, entry) in parse_json_map(raw) {
         let Some(obj) = entry.as_object() else {
             continue;
@@ -130,7 +170,7 @@ fn parse_record_map(raw: Option<&str>) -> HashMap<String, CredentialRecord> {
             .get("principal_type")
             .and_then(Value::as_str)
             .unwrap_or("user");
-        if principal_type != "user" && principal_type != "service" {
+        if !PRINCIPAL_TYPES.contains(&principal_type) {
             continue;
         }
 
@@ -157,7 +197,7 @@ fn parse_record_map(raw: Option<&str>) -> HashMap<String, CredentialRecord> {
             .unwrap_or(false);
 
         records.insert(
-            credential,
+            credential_digest(&credential),
             CredentialRecord {
                 user_id: user_id.to_string(),
                 principal_type: principal_type.to_string(),
@@ -173,77 +213,397 @@ fn parse_record_map(raw: Option<&str>) -> HashMap<String, CredentialRecord> {
     records
 }
 
-fn identity_from_record(record: &CredentialRecord, auth_method: &str) -> Value {
-    json!({
-        "user_id": record.user_id,
-        "principal_type": record.principal_type,
-        "display_name": record.display_name,
-        "auth_method": auth_method,
-        "key_id": record.key_id,
-        "scopes": record.scopes,
-        "scope_enforced": record.scope_enforced,
-        "service_account_id": record.service_account_id,
-    })
+/// Static bearer tokens, API keys and revoked key ids.
+struct CredentialTables {
+    bearer_tokens: DigestMap<CredentialRecord>,
+    api_keys: DigestMap<CredentialRecord>,
+    revoked_key_ids: HashSet<String>,
+}
+
+impl CredentialTables {
+    fn parse(config: [Option<&str>; 5]) -> Self {
+        let [bearer_json, api_keys_json, revoked_raw, bootstrap_token, bootstrap_user_id] = config;
+        let mut bearer_tokens = parse_record_map(bearer_json);
+        if bearer_tokens.is_empty() {
+            if let Some(token) = bootstrap_token.filter(|value| !value.trim().is_empty()) {
+                bearer_tokens.insert(
+                    credential_digest(token),
+                    CredentialRecord {
+                        user_id: bootstrap_user_id
+                            .filter(|value| !value.trim().is_empty())
+                            .unwrap_or("bootstrap-user")
+                            .to_string(),
+                        principal_type: "user".to_string(),
+                        display_name: Some("Local Bootstrap User".to_string()),
+                        key_id: Some("bootstrap".to_string()),
+                        disabled: false,
+                        scopes: Vec::new(),
+                        scope_enforced: false,
+                        service_account_id: None,
+                    },
+                );
+            }
+        }
+        Self {
+            bearer_tokens,
+            api_keys: parse_record_map(api_keys_json),
+            revoked_key_ids: parse_string_set(revoked_raw),
+        }
+    }
+}
+
+/// Authenticated principal resolved by the core.
+#[derive(Debug, Clone)]
+pub struct CoreIdentity {
+    pub user_id: String,
+    pub principal_type: String,
+    pub display_name: Option<String>,
+    pub auth_method: &'static str,
+    pub key_id: Option<String>,
+    pub scopes: Vec<String>,
+    pub scope_enforced: bool,
+    pub service_account_id: Option<String>,
+}
+
+impl CoreIdentity {
+    pub fn as_json(&self) -> Value {
+        json!({
+            "user_id": self.user_id,
+            "principal_type": self.principal_type,
+            "display_name": self.display_name,
+            "auth_method": self.auth_method,
+            "key_id": self.key_id,
+            "scopes": self.scopes,
+            "scope_enforced": self.scope_enforced,
+            "service_account_id": self.service_account_id,
+        })
+    }
+}
+
+fn identity_from_record(record: &CredentialRecord, auth_method: &'static str) -> CoreIdentity {
+    CoreIdentity {
+        user_id: record.user_id.clone(),
+        principal_type: record.principal_type.clone(),
+        display_name: record.display_name.clone(),
+        auth_method,
+        key_id: record.key_id.clone(),
+        scopes: record.scopes.clone(),
+        scope_enforced: record.scope_enforced,
+        service_account_id: record.service_account_id.clone(),
+    }
+}
+
+/// Signed-token settings. Each secret is kept as keyed HMAC state, so
+/// verification clones it instead of re-deriving the inner and outer key
+/// pads on every request.
+struct SigningConfig {
+    keys: HashMap<String, HmacSha256>,
+    active_kids: HashSet<String>,
+    revoked_key_ids: HashSet<String>,
+}
+
+impl SigningConfig {
+    fn parse(config: [Option<&str>; 3]) -> Self {
+        let [bearer_secrets, active_kids_raw, revoked_key_ids_raw] = config;
+        let keys = key_value_pairs(bearer_secrets)
+            .filter_map(|(kid, secret)| {
+                HmacSha256::new_from_slice(secret.as_bytes())
+                    .ok()
+                    .map(|mac| (kid.to_string(), mac))
+            })
+            .collect();
+        Self {
+            keys,
+            active_kids: parse_string_set(active_kids_raw),
+            revoked_key_ids: parse_string_set(revoked_key_ids_raw),
+        }
+    }
+}
+
+/// Successful signed-token verifications keyed by token digest, valid for the
+/// lifetime of the `AuthConfig` that owns them.
+#[derive(Default)]
+struct SignedTokenCache {
+    identities: DigestMap<(CoreIdentity, f64)>,
+    insertion_order: VecDeque<CredentialDigest>,
+}
+
+impl SignedTokenCache {
+    fn get(&self, digest: &CredentialDigest, now: f64) -> Option<CoreIdentity> {
+        self.identities
+            .get(digest)
+            .filter(|(_, exp)| *exp >= now)
+            .map(|(identity, _)| identity.clone())
+    }
+
+    fn insert(&mut self, digest: CredentialDigest, identity: CoreIdentity, exp: f64) {
+        if self.identities.insert(digest, (identity, exp)).is_some() {
+            return;
+        }
+        self.insertion_order.push_back(digest);
+        while self.insertion_order.len() > SIGNED_TOKEN_CACHE_MAX {
+            if let Some(evicted) = self.insertion_order.pop_front() {
+                self.identities.remove(&evicted);
+            }
+        }
+    }
+}
+
+/// Authentication settings parsed once and reused across requests. Any change
+/// to the raw settings means building a new `AuthConfig`, which also discards
+/// every signed token verified under the old one.
+pub struct AuthConfig {
+    tables: CredentialTables,
+    signing: SigningConfig,
+    signed_tokens: Mutex<SignedTokenCache>,
+}
+
+impl AuthConfig {
+    pub fn parse(
+        bearer_tokens_json: Option<&str>,
+        api_keys_json: Option<&str>,
+        bearer_secrets: Option<&str>,
+        active_kids_raw: Option<&str>,
+        revoked_key_ids_raw: Option<&str>,
+        bootstrap_token: Option<&str>,
+        bootstrap_user_id: Option<&str>,
+    ) -> Self {
+        Self {
+            tables: CredentialTables::parse([
+                bearer_tokens_json,
+                api_keys_json,
+                revoked_key_ids_raw,
+                bootstrap_token,
+                bootstrap_user_id,
+            ]),
+            signing: SigningConfig::parse([bearer_secrets, active_kids_raw, revoked_key_ids_raw]),
+            signed_tokens: Mutex::new(SignedTokenCache::default()),
+        }
+    }
+
+    fn authenticate_signed_bearer(&self, token: &str) -> Result<CoreIdentity, CoreAuthError> {
+        let digest = credential_digest(token);
+        let now = chrono::Utc::now().timestamp() as f64;
+        if let Ok(cache) = self.signed_tokens.lock() {
+            if let Some(identity) = cache.get(&digest, now) {
+                return Ok(identity);
+            }
+        }
+
+        let (identity, exp) = authenticate_signed_bearer(token, &self.signing, now)?;
+        if let Ok(mut cache) = self.signed_tokens.lock() {
+            cache.insert(digest, identity.clone(), exp);
+        }
+        Ok(identity)
+    }
+
+    fn authenticate_static(
+        &self,
+        record: Option<&CredentialRecord>,
+        auth_method: &'static str,
+        invalid_detail: &str,
+        revoked_detail: &str,
+    ) -> Result<CoreIdentity, CoreAuthError> {
+        let record =
+            record.ok_or_else(|| CoreAuthError::new("invalid_credentials", invalid_detail))?;
+        if record
+            .key_id
+            .as_ref()
+            .is_some_and(|key_id| self.tables.revoked_key_ids.contains(key_id))
+        {
+            return Err(CoreAuthError::new("revoked_key", revoked_detail));
+        }
+        if record.disabled {
+            return Err(CoreAuthError::new(
+                "disabled_identity",
+                "Principal is disabled",
+            ));
+        }
+        Ok(identity_from_record(record, auth_method))
+    }
+
+    fn authenticate_authorization(&self, auth_header: &str) -> Result<CoreIdentity, CoreAuthError> {
+        let parts: Vec<&str> = auth_header.splitn(AUTH_HEADER_PARTS, ' ').collect();
+        if parts.len() != AUTH_HEADER_PARTS || parts[0].to_lowercase() != "bearer" {
+            return Err(CoreAuthError::new(
+                "invalid_credentials",
+                "Authorization header must use Bearer scheme",
+            ));
+        }
+        let token = parts[1].trim();
+        if token.is_empty() {
+            return Err(CoreAuthError::new(
+                "missing_credentials",
+                "Missing bearer token",
+            ));
+        }
+        if token.starts_with("v1.") {
+            return self.authenticate_signed_bearer(token);
+        }
+        self.authenticate_static(
+            self.tables.bearer_tokens.get(&credential_digest(token)),
+            "bearer",
+            "Invalid bearer token",
+            "Bearer token has been revoked",
+        )
+    }
+
+    pub fn authenticate_identity(
+        &self,
+        authorization: Option<&str>,
+        api_key: Option<&str>,
+    ) -> Result<CoreIdentity, CoreAuthError> {
+        if let Some(auth_header) = authorization.filter(|value| !value.trim().is_empty()) {
+            self.authenticate_authorization(auth_header)
+        } else if let Some(raw_key) = api_key.filter(|value| !value.trim().is_empty()) {
+            self.authenticate_static(
+                self.tables.api_keys.get(&credential_digest(raw_key.trim())),
+                "api_key",
+                "Invalid API key",
+                "API key has been revoked",
+            )
+        } else {
+            Err(CoreAuthError::new(
+                "missing_credentials",
+                "Authentication required. Provide Authorization: Bearer <token> or X-API-Key.",
+            ))
+        }
+    }
+
+    pub fn has_static_api_keys(&self) -> bool {
+        !self.tables.api_keys.is_empty()
+    }
+
+    pub fn authenticate(&self, authorization: Option<&str>, api_key: Option<&str>) -> Value {
+        match self.authenticate_identity(authorization, api_key) {
+            Ok(identity) => json!({"ok": true, "identity": identity.as_json()}),
+            Err(error) => json!({"ok": false, "error": error.as_json()}),
+        }
+    }
+}
+
+type AuthConfigEntry = ([Option<String>; 7], Arc<AuthConfig>);
+
+fn auth_config_cache() -> &'static Mutex<Option<AuthConfigEntry>> {
+    static CONFIG: OnceLock<Mutex<Option<AuthConfigEntry>>> = OnceLock::new();
+    CONFIG.get_or_init(|| Mutex::new(None))
+}
+
+fn cached_auth_config(
+    bearer_tokens_json: Option<&str>,
+    api_keys_json: Option<&str>,
+    bearer_secrets: Option<&str>,
+    active_kids_raw: Option<&str>,
+    revoked_key_ids_raw: Option<&str>,
+    bootstrap_token: Option<&str>,
+    bootstrap_user_id: Option<&str>,
+) -> Arc<AuthConfig> {
+    let raw = [
+        bearer_tokens_json,
+        api_keys_json,
+        bearer_secrets,
+        active_kids_raw,
+        revoked_key_ids_raw,
+        bootstrap_token,
+        bootstrap_user_id,
+    ];
+    let build = || {
+        Arc::new(AuthConfig::parse(
+            bearer_tokens_json,
+            api_keys_json,
+            bearer_secrets,
+            active_kids_raw,
+            revoked_key_ids_raw,
+            bootstrap_token,
+            bootstrap_user_id,
+        ))
+    };
+    let Ok(mut cached) = auth_config_cache().lock() else {
+        return build();
+    };
+    if let Some((previous_raw, config)) = cached.as_ref() {
+        if previous_raw
+            .iter()
+            .zip(raw)
+            .all(|(previous, current)| previous.as_deref() == current)
+        {
+            return Arc::clone(config);
+        }
+    }
+    let config = build();
+    *cached = Some((
+        raw.map(|value| value.map(ToString::to_string)),
+        Arc::clone(&config),
+    ));
+    config
+}
+
+/// Drops the configuration cached for `authenticate_headers_core`, including
+/// its signed-token verifications, so the next call re-parses everything.
+pub fn clear_auth_caches() {
+    if let Ok(mut cached) = auth_config_cache().lock() {
+        *cached = None;
+    }
 }
 
 fn authenticate_signed_bearer(
     token: &str,
-    signing_secrets: &HashMap<String, String>,
-    active_kids: &HashSet<String>,
-    revoked_key_ids: &HashSet<String>,
-) -> Result<Value, CoreAuthError> {
+    signing: &SigningConfig,
+    now: f64,
+) -> Result<(CoreIdentity, f64), CoreAuthError> {
+    let malformed = || CoreAuthError::new("invalid_signature", "Malformed signed bearer token");
     let parts: Vec<&str> = token.split('.').collect();
-    if parts.len() != SIGNED_TOKEN_PARTS {
-        return Err(CoreAuthError::new(
-            "invalid_signature",
-            "Malformed signed bearer token",
-        ));
+    // Reject wrong shapes before doing any decoding work.
+    if parts.len() != SIGNED_TOKEN_PARTS
+        || parts[1].is_empty()
+        || parts[2].len() != SIGNATURE_SEGMENT_LEN
+    {
+        return Err(malformed());
     }
 
     let payload_segment = parts[1];
     let signature_segment = parts[2];
+    let mut signature_buffer = [0u8; SIGNATURE_BUFFER_BYTES];
+    let signature_len = URL_SAFE_NO_PAD
+        .decode_slice(signature_segment, &mut signature_buffer)
+        .map_err(|_| malformed())?;
     let payload_bytes = URL_SAFE_NO_PAD
         .decode(payload_segment)
-        .map_err(|_| CoreAuthError::new("invalid_signature", "Malformed signed bearer token"))?;
-    let signature_bytes = URL_SAFE_NO_PAD
-        .decode(signature_segment)
-        .map_err(|_| CoreAuthError::new("invalid_signature", "Malformed signed bearer token"))?;
-
-    let payload: Value = serde_json::from_slice(&payload_bytes)
-        .map_err(|_| CoreAuthError::new("invalid_signature", "Invalid signed token payload"))?;
-    let payload_obj = payload
-        .as_object()
-        .ok_or_else(|| CoreAuthError::new("invalid_signature", "Invalid signed token payload"))?;
-
-    let kid = payload_obj
-        .get("kid")
-        .and_then(Value::as_str)
+        .map_err(|_| malformed())?;
+
+    let Ok(Value::Object(mut payload_obj)) = serde_json::from_slice(&payload_bytes) else {
+        return Err(CoreAuthError::new(
+            "invalid_signature",
+            "Invalid signed token payload",
+        ));
+    };
+
+    let kid = take_string(&mut payload_obj, "kid")
         .filter(|value| !value.is_empty())
         .ok_or_else(|| CoreAuthError::new("invalid_signature", "Signed token missing key id"))?;
 
-    if !active_kids.is_empty() && !active_kids.contains(kid) {
+    if !signing.active_kids.is_empty() && !signing.active_kids.contains(&kid) {
         return Err(CoreAuthError::new(
             "revoked_key",
             "Token signed by inactive key",
         ));
     }
-    if revoked_key_ids.contains(kid) {
+    if signing.revoked_key_ids.contains(&kid) {
         return Err(CoreAuthError::new(
             "revoked_key",
             "Token key id has been revoked",
         ));
     }
 
-    let secret = signing_secrets
-        .get(kid)
+    let mut mac = signing
+        .keys
+        .get(&kid)
+        .cloned()
         .ok_or_else(|| CoreAuthError::new("invalid_signature", "Unknown token signing key"))?;
-    let mut mac = HmacSha256::new_from_slice(secret.as_bytes())
-        .map_err(|_| CoreAuthError::new("invalid_signature", "Invalid token signing key"))?;
     mac.update(payload_segment.as_bytes());
     let expected = mac.finalize().into_bytes();
-    if expected.len() != signature_bytes.len()
-        || !bool::from(expected.as_slice().ct_eq(signature_bytes.as_slice()))
-    {
+    let signature = &signature_buffer[..signature_len];
+    if expected.len() != signature.len() || !bool::from(expected.as_slice().ct_eq(signature)) {
         return Err(CoreAuthError::new(
             "invalid_signature",
             "Invalid bearer token signature",
@@ -254,7 +614,6 @@ fn authenticate_signed_bearer(
         .get("exp")
         .and_then(Value::as_f64)
         .ok_or_else(|| CoreAuthError::new("invalid_credentials", "Signed token missing exp"))?;
-    let now = chrono::Utc::now().timestamp() as f64;
     if exp < now {
         return Err(CoreAuthError::new(
             "expired_token",
@@ -262,9 +621,7 @@ fn authenticate_signed_bearer(
         ));
     }
 
-    let user_id = payload_obj
-        .get("sub")
-        .and_then(Value::as_str)
+    let user_id = take_string(&mut payload_obj, "sub")
         .filter(|value| !value.is_empty())
         .ok_or_else(|| CoreAuthError::new("invalid_credentials", "Signed token missing subject"))?;
     if payload_obj
@@ -282,37 +639,33 @@ fn authenticate_signed_bearer(
         .get("principal_type")
         .and_then(Value::as_str)
         .unwrap_or("user");
-    if principal_type != "user" && principal_type != "service" {
+    if !PRINCIPAL_TYPES.contains(&principal_type) {
         return Err(CoreAuthError::new(
             "invalid_credentials",
             "Invalid principal type",
         ));
     }
 
-    let display_name = payload_obj
-        .get("display_name")
-        .and_then(Value::as_str)
-        .map(ToString::to_string);
-    let service_account_id = payload_obj
-        .get("service_account_id")
-        .and_then(Value::as_str)
-        .map(ToString::to_string);
+    let principal_type = principal_type.to_string();
+    let display_name = take_string(&mut payload_obj, "display_name");
+    let service_account_id = take_string(&mut payload_obj, "service_account_id");
     let scopes = parse_scopes(payload_obj.get("scopes"));
     let scope_enforced = payload_obj
         .get("scope_enforced")
         .and_then(Value::as_bool)
         .unwrap_or(false);
 
-    Ok(json!({
-        "user_id": user_id,
-        "principal_type": principal_type,
-        "display_name": display_name,
-        "auth_method": "bearer",
-        "key_id": kid,
-        "scopes": scopes,
-        "scope_enforced": scope_enforced,
-        "service_account_id": service_account_id,
-    }))
+    let identity = CoreIdentity {
+        user_id,
+        principal_type,
+        display_name,
+        auth_method: "bearer",
+        key_id: Some(kid),
+        scopes,
+        scope_enforced,
+        service_account_id,
+    };
+    Ok((identity, exp))
 }
 
 #[allow(clippy::too_many_arguments)]
@@ -327,115 +680,16 @@ pub fn authenticate_headers_core(
     bootstrap_token: Option<&str>,
     bootstrap_user_id: Option<&str>,
 ) -> Value {
-    let mut bearer_tokens = parse_record_map(bearer_tokens_json);
-    if bearer_tokens.is_empty() {
-        if let Some(token) = bootstrap_token.filter(|value| !value.trim().is_empty()) {
-            bearer_tokens.insert(
-                token.to_string(),
-                CredentialRecord {
-                    user_id: bootstrap_user_id
-                        .filter(|value| !value.trim().is_empty())
-                        .unwrap_or("bootstrap-user")
-                        .to_string(),
-                    principal_type: "user".to_string(),
-                    display_name: Some("Local Bootstrap User".to_string()),
-                    key_id: Some("bootstrap".to_string()),
-                    disabled: false,
-                    scopes: Vec::new(),
-                    scope_enforced: false,
-                    service_account_id: None,
-                },
-            );
-        }
-    }
-
-    let api_keys = parse_record_map(api_keys_json);
-    let signing_secrets = parse_key_value_map(bearer_secrets);
-    let active_kids = parse_string_set(active_kids_raw);
-    let revoked_key_ids = parse_string_set(revoked_key_ids_raw);
-
-    let result = if let Some(auth_header) = authorization.filter(|value| !value.trim().is_empty()) {
-        let parts: Vec<&str> = auth_header.splitn(AUTH_HEADER_PARTS, ' ').collect();
-        if parts.len() != AUTH_HEADER_PARTS || parts[0].to_lowercase() != "bearer" {
-            Err(CoreAuthError::new(
-                "invalid_credentials",
-                "Authorization header must use Bearer scheme",
-            ))
-        } else {
-            let token = parts[1].trim();
-            if token.is_empty() {
-                Err(CoreAuthError::new(
-                    "missing_credentials",
-                    "Missing bearer token",
-                ))
-            } else if token.starts_with("v1.") {
-                authenticate_signed_bearer(token, &signing_secrets, &active_kids, &revoked_key_ids)
-            } else {
-                let record = bearer_tokens.get(token).ok_or_else(|| {
-                    CoreAuthError::new("invalid_credentials", "Invalid bearer token")
-                });
-                match record {
-                    Ok(record) => {
-                        if record
-                            .key_id
-                            .as_ref()
-                            .is_some_and(|key_id| revoked_key_ids.contains(key_id))
-                        {
-                            Err(CoreAuthError::new(
-                                "revoked_key",
-                                "Bearer token has been revoked",
-                            ))
-                        } else if record.disabled {
-                            Err(CoreAuthError::new(
-                                "disabled_identity",
-                                "Principal is disabled",
-                            ))
-                        } else {
-                            Ok(identity_from_record(record, "bearer"))
-                        }
-                    }
-                    Err(err) => Err(err),
-                }
-            }
-        }
-    } else if let Some(raw_key) = api_key.filter(|value| !value.trim().is_empty()) {
-        let key_value = raw_key.trim();
-        let record = api_keys
-            .get(key_value)
-            .ok_or_else(|| CoreAuthError::new("invalid_credentials", "Invalid API key"));
-        match record {
-            Ok(record) => {
-                if record
-                    .key_id
-                    .as_ref()
-                    .is_some_and(|key_id| revoked_key_ids.contains(key_id))
-                {
-                    Err(CoreAuthError::new(
-                        "revoked_key",
-                        "API key has been revoked",
-                    ))
-                } else if record.disabled {
-                    Err(CoreAuthError::new(
-                        "disabled_identity",
-                        "Principal is disabled",
-                    ))
-                } else {
-                    Ok(identity_from_record(record, "api_key"))
-                }
-            }
-            Err(err) => Err(err),
-        }
-    } else {
-        Err(CoreAuthError::new(
-            "missing_credentials",
-            "Authentication required. Provide Authorization: Bearer <token> or X-API-Key.",
-        ))
-    };
-
-    match result {
-        Ok(identity) => json!({"ok": true, "identity": identity}),
-        Err(error) => json!({"ok": false, "error": error.as_json()}),
-    }
+    cached_auth_config(
+        bearer_tokens_json,
+        api_keys_json,
+        bearer_secrets,
+        active_kids_raw,
+        revoked_key_ids_raw,
+        bootstrap_token,
+        bootstrap_user_id,
+    )
+    .authenticate(authorization, api_key)
 }
 
 pub fn auth_capabilities_snapshot(
@@ -447,7 +701,9 @@ pub fn auth_capabilities_snapshot(
 ) -> Value {
     let bearer_tokens = parse_record_map(bearer_tokens_json);
     let api_keys = parse_record_map(api_keys_json);
-    let signing_secrets = parse_key_value_map(bearer_secrets);
+    let signing_kids: HashSet<&str> = key_value_pairs(bearer_secrets)
+        .map(|(kid, _)| kid)
+        .collect();
     let mut active_kids: Vec<String> = parse_string_set(active_kids_raw).into_iter().collect();
     active_kids.sort();
     let mut revoked_key_ids: Vec<String> =
@@ -466,7 +722,7 @@ pub fn auth_capabilities_snapshot(
                 "supports_static_tokens": true,
                 "supports_signed_tokens": true,
                 "configured_static_token_count": bearer_tokens.len(),
-                "configured_signing_kid_count": signing_secrets.len(),
+                "configured_signing_kid_count": signing_kids.len(),
                 "active_kids": active_kids,
                 "active_kids_source": "UGOITE_AUTH_BEARER_ACTIVE_KIDS"
             },
@@ -479,7 +735,7 @@ pub fn auth_capabilities_snapshot(
             }
         },
         "identity_model": {
-            "principal_types": ["user", "service"],
+            "principal_types": PRINCIPAL_TYPES,
             "fields": [
                 "user_id",
                 "principal_type",
@@ -499,3 +755,36 @@ pub fn auth_capabilities_snapshot(
         ]
     })
 }
+
+/// Group ids per user per space: `{space_id: {user_id: [group]}}`.
+pub type UserGroupsMap = HashMap<String, HashMap<String, Vec<String>>>;
+
+/// Parses `UGOITE_AUTHZ_USER_GROUPS_JSON`, skipping malformed entries and
+/// users or spaces left without groups.
+pub fn parse_user_groups_map(raw: Option<&str>) -> UserGroupsMap {
+    parse_json_map(raw)
+        .into_iter()
+        .filter_map(|(space_id, users)| {
+            let Value::Object(users) = users else {
+                return None;
+            };
+            let users: HashMap<String, Vec<String>> = users
+                .into_iter()
+                .filter_map(|(user_id, groups)| {
+                    let Value::Array(groups) = groups else {
+                        return None;
+                    };
+                    let groups: Vec<String> = groups
+                        .into_iter()
+                        .filter_map(|group| match group {
+                            Value::String(group) if !group.is_empty() => Some(group),
+                            _ => None,
+                        })
+                        .collect();
+                    (!groups.is_empty()).then_some((user_id, groups))
+                })
+                .collect();
+            (!users.is_empty()).then_some((space_id, users))
+        })
+        .collect()
+}
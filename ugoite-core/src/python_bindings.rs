@@ -1,30 +1,120 @@
+use hmac::{Hmac, KeyInit, Mac};
 use opendal::Operator;
 use pyo3::exceptions::{PyRuntimeError, PyValueError};
 use pyo3::prelude::*;
+use pyo3::pybacked::PyBackedStr;
 use pyo3::types::{PyBytes, PyDict, PyList, PyTuple};
 use pyo3::IntoPyObjectExt;
 use serde_json::Value;
 use sha2::{Digest, Sha256 as LegacySha256};
 use sha2_hmac::Sha256 as Pbkdf2Sha256;
+use std::num::NonZeroUsize;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::OnceLock;
 use subtle::ConstantTimeEq;
 
 use super::*;
 
 use integrity::RealIntegrityProvider;
 
-const API_KEY_HASH_ALGORITHM: &str = "pbkdf2_sha256_v1";
+/// Algorithm for newly created keys. API key secrets are 256-bit random
+/// tokens, so a single keyed hash is enough; iterated stretching only pays
+/// off for low-entropy passwords.
+const API_KEY_HASH_ALGORITHM: &str = "hmac_sha256_v1";
+/// Algorithm of keys created before `hmac_sha256_v1`, still verified.
+const API_KEY_PBKDF2_ALGORITHM: &str = "pbkdf2_sha256_v1";
 const API_KEY_HASH_ITERATIONS: u32 = 240_000;
 
-fn hash_service_api_key_secret_impl(secret: &str, salt: &str) -> String {
+/// A presented API key secret, keyed into HMAC-SHA256 once. Hashing it for
+/// several stored salts clones the keyed state instead of re-deriving the
+/// inner and outer key pads per salt.
+struct PreparedApiKeySecret<'a> {
+    secret: &'a str,
+    prf: Hmac<Pbkdf2Sha256>,
+    legacy_hash: OnceLock<String>,
+}
+
+impl<'a> PreparedApiKeySecret<'a> {
+    fn new(secret: &'a str) -> Self {
+        let prf = Hmac::<Pbkdf2Sha256>::new_from_slice(secret.as_bytes())
+            .expect("HMAC accepts keys of any length");
+        Self {
+            secret,
+            prf,
+            legacy_hash: OnceLock::new(),
+        }
+    }
+
+    /// HMAC-SHA256 of the salt, keyed by the secret.
+    fn hmac(&self, salt: &str) -> [u8; 32] {
+        let mut mac = self.prf.clone();
+        mac.update(salt.as_bytes());
+        let mut digest = [0_u8; 32];
+        digest.copy_from_slice(&mac.finalize().into_bytes());
+        digest
+    }
+
+    /// PBKDF2-HMAC-SHA256 with a single 32-byte output block.
+    fn pbkdf2(&self, salt: &str) -> [u8; 32] {
+        let mut mac = self.prf.clone();
+        mac.update(salt.as_bytes());
+        mac.update(&1_u32.to_be_bytes());
+        let mut block = [0_u8; 32];
+        block.copy_from_slice(&mac.finalize().into_bytes());
+        let mut derived = block;
+        for _ in 1..API_KEY_HASH_ITERATIONS {
+            let mut mac = self.prf.clone();
+            mac.update(&block);
+            block.copy_from_slice(&mac.finalize().into_bytes());
+            for (out, byte) in derived.iter_mut().zip(block) {
+                *out ^= byte;
+            }
+        }
+        derived
+    }
+
+    fn digest(&self, hash_algorithm: &str, salt: &str) -> Option<[u8; 32]> {
+        match hash_algorithm {
+            API_KEY_HASH_ALGORITHM => Some(self.hmac(salt)),
+            API_KEY_PBKDF2_ALGORITHM => Some(self.pbkdf2(salt)),
+            _ => None,
+        }
+    }
+
+    fn matches(
+        &self,
+        key_hash: &str,
+        hash_algorithm: Option<&str>,
+        secret_salt: Option<&str>,
+    ) -> bool {
+        if let (Some(hash_algorithm), Some(salt)) =
+            (hash_algorithm, secret_salt.filter(|salt| !salt.is_empty()))
+        {
+            if let Some(expected) = self.digest(hash_algorithm, salt) {
+                return verify_encoded_digest(key_hash, &expected);
+            }
+        }
+        let legacy = self
+            .legacy_hash
+            .get_or_init(|| hash_legacy_service_api_key_secret(self.secret));
+        verify_digest(key_hash, legacy)
+    }
+}
+
+/// Compare a stored digest with raw digest bytes, decoding the stored value
+/// onto the stack rather than encoding the computed one. New keys store hex;
+/// keys created before that store unpadded base64url.
+fn verify_encoded_digest(stored: &str, computed: &[u8; 32]) -> bool {
     use base64::{engine::general_purpose::URL_SAFE_NO_PAD, Engine as _};
-    let mut derived = [0_u8; 32];
-    pbkdf2::pbkdf2_hmac::<Pbkdf2Sha256>(
-        secret.as_bytes(),
-        salt.as_bytes(),
-        API_KEY_HASH_ITERATIONS,
-        &mut derived,
-    );
-    URL_SAFE_NO_PAD.encode(derived)
+    let mut decoded = [0_u8; 36];
+    let decoded_len = if stored.len() == 64 {
+        hex::decode_to_slice(stored, &mut decoded[..32])
+            .ok()
+            .map(|()| 32)
+    } else {
+        URL_SAFE_NO_PAD.decode_slice(stored, &mut decoded).ok()
+    };
+    decoded_len == Some(32) && bool::from(decoded[..32].ct_eq(computed))
 }
 
 fn verify_digest(stored: &str, computed: &str) -> bool {
@@ -89,7 +179,10 @@ fn hash_service_api_key_secret(secret: String, salt: String) -> PyResult<String>
     if salt.is_empty() {
         return Err(PyValueError::new_err("secret salt must not be empty"));
     }
-    Ok(hash_service_api_key_secret_impl(&secret, &salt))
+    let digest = PreparedApiKeySecret::new(&secret)
+        .digest(API_KEY_HASH_ALGORITHM, &salt)
+        .expect("current API key hash algorithm is supported");
+    Ok(hex::encode(digest))
 }
 
 #[pyfunction]
@@ -100,17 +193,79 @@ fn verify_service_api_key_secret(
     hash_algorithm: Option<String>,
     secret_salt: Option<String>,
 ) -> bool {
-    if hash_algorithm.as_deref() == Some(API_KEY_HASH_ALGORITHM) {
-        if let Some(salt) = secret_salt {
-            if !salt.is_empty() {
-                let expected = hash_service_api_key_secret_impl(&secret, &salt);
-                return verify_digest(&key_hash, &expected);
-            }
+    PreparedApiKeySecret::new(&secret).matches(
+        &key_hash,
+        hash_algorithm.as_deref(),
+        secret_salt.as_deref(),
+    )
+}
+
+type ApiKeyCandidate = (PyBackedStr, Option<PyBackedStr>, Option<PyBackedStr>);
+
+fn first_matching_candidate(
+    prepared: &PreparedApiKeySecret<'_>,
+    candidates: &[ApiKeyCandidate],
+) -> Option<usize> {
+    let matches = |(key_hash, hash_algorithm, secret_salt): &ApiKeyCandidate| {
+        prepared.matches(key_hash, hash_algorithm.as_deref(), secret_salt.as_deref())
+    };
+
+    // Each PBKDF2 candidate is an independent 240,000-round chain, so several
+    // of them are spread over worker threads; cheap candidates stay inline.
+    let pbkdf2_candidates = candidates
+        .iter()
+        .filter(|(_, hash_algorithm, _)| {
+            hash_algorithm.as_deref() == Some(API_KEY_PBKDF2_ALGORITHM)
+        })
+        .count();
+    let workers = std::thread::available_parallelism()
+        .map_or(1, NonZeroUsize::get)
+        .min(pbkdf2_candidates);
+    if workers < 2 {
+        return candidates.iter().position(matches);
+    }
+
+    // Workers share the lowest matched index so far and stop before any
+    // candidate past it; later chunks then skip their remaining PBKDF2 runs.
+    let chunk_len = candidates.len().div_ceil(workers);
+    let first_match = AtomicUsize::new(usize::MAX);
+    std::thread::scope(|scope| {
+        for (chunk_index, chunk) in candidates.chunks(chunk_len).enumerate() {
+            let first_match = &first_match;
+            scope.spawn(move || {
+                let offset = chunk_index * chunk_len;
+                for (index, candidate) in (offset..).zip(chunk) {
+                    if index >= first_match.load(Ordering::Relaxed) {
+                        return;
+                    }
+                    if matches(candidate) {
+                        first_match.fetch_min(index, Ordering::Relaxed);
+                        return;
+                    }
+                }
+            });
         }
+    });
+    match first_match.into_inner() {
+        usize::MAX => None,
+        index => Some(index),
     }
+}
 
-    let legacy = hash_legacy_service_api_key_secret(&secret);
-    verify_digest(&key_hash, &legacy)
+/// Index of the first `(key_hash, hash_algorithm, secret_salt)` candidate the
+/// secret matches, keying the secret into HMAC once for all candidates. The
+/// candidate strings are borrowed from their Python objects, not copied, and
+/// the GIL is released while hashing.
+#[pyfunction]
+fn match_service_api_key_secret(
+    py: Python<'_>,
+    secret: &str,
+    candidates: Vec<ApiKeyCandidate>,
+) -> Option<usize> {
+    py.allow_threads(|| {
+        let prepared = PreparedApiKeySecret::new(secret);
+        first_matching_candidate(&prepared, &candidates)
+    })
 }
 
 #[pyfunction]
@@ -178,6 +333,94 @@ fn auth_capabilities_snapshot_core(
     json_to_py(py, result)
 }
 
+#[pyfunction]
+fn clear_auth_caches_core() {
+    auth::clear_auth_caches();
+}
+
+#[pyfunction]
+#[pyo3(signature = (raw=None))]
+fn parse_user_groups_map_core(raw: Option<&str>) -> auth::UserGroupsMap {
+    auth::parse_user_groups_map(raw)
+}
+
+/// Parsed authentication settings held by the Python `AuthManager`, so each
+/// request passes a handle instead of raw configuration strings.
+#[pyclass(frozen, name = "AuthConfig", module = "ugoite_core._ugoite_core")]
+struct PyAuthConfig {
+    inner: auth::AuthConfig,
+}
+
+#[pyfunction]
+#[pyo3(signature = (
+    bearer_tokens_json=None,
+    api_keys_json=None,
+    bearer_secrets=None,
+    active_kids=None,
+    revoked_key_ids=None,
+    bootstrap_token=None,
+    bootstrap_user_id=None,
+))]
+fn build_auth_config_core(
+    bearer_tokens_json: Option<String>,
+    api_keys_json: Option<String>,
+    bearer_secrets: Option<String>,
+    active_kids: Option<String>,
+    revoked_key_ids: Option<String>,
+    bootstrap_token: Option<String>,
+    bootstrap_user_id: Option<String>,
+) -> PyAuthConfig {
+    PyAuthConfig {
+        inner: auth::AuthConfig::parse(
+            bearer_tokens_json.as_deref(),
+            api_keys_json.as_deref(),
+            bearer_secrets.as_deref(),
+            active_kids.as_deref(),
+            revoked_key_ids.as_deref(),
+            bootstrap_token.as_deref(),
+            bootstrap_user_id.as_deref(),
+        ),
+    }
+}
+
+/// Returns `(True, identity)` or `(False, (code, detail, status_code))`, with
+/// identity as a fixed-order tuple matching `RequestIdentity`'s fields.
+#[pyfunction]
+#[pyo3(signature = (config, authorization=None, api_key=None))]
+fn authenticate_with_config_core(
+    py: Python<'_>,
+    config: Bound<'_, PyAuthConfig>,
+    authorization: Option<String>,
+    api_key: Option<String>,
+) -> PyResult<PyObject> {
+    let result = config
+        .get()
+        .inner
+        .authenticate_identity(authorization.as_deref(), api_key.as_deref());
+    match result {
+        Ok(identity) => (
+            true,
+            (
+                identity.user_id,
+                identity.auth_method,
+                identity.principal_type,
+                identity.display_name,
+                identity.key_id,
+                identity.scopes,
+                identity.scope_enforced,
+                identity.service_account_id,
+            ),
+        )
+            .into_py_any(py),
+        Err(error) => (false, (error.code, error.detail, error.status_code)).into_py_any(py),
+    }
+}
+
+#[pyfunction]
+fn auth_config_has_api_keys_core(config: Bound<'_, PyAuthConfig>) -> bool {
+    config.get().inner.has_static_api_keys()
+}
+
 // Space
 
 #[pyfunction]
@@ -331,17 +574,53 @@ fn test_storage_connection_py<'a>(
 // Audit
 
 #[pyfunction]
-#[pyo3(signature = (storage_config, space_id, payload_json, retention_limit=None))]
+#[allow(clippy::too_many_arguments)]
+#[pyo3(signature = (
+    storage_config,
+    space_id,
+    action,
+    actor_user_id,
+    outcome,
+    target_type=None,
+    target_id=None,
+    request_method=None,
+    request_path=None,
+    request_id=None,
+    metadata_json=None,
+    retention_limit=None,
+))]
 fn append_audit_event_py<'a>(
     py: Python<'a>,
     storage_config: Bound<'a, PyDict>,
     space_id: String,
-    payload_json: String,
+    action: String,
+    actor_user_id: String,
+    outcome: String,
+    target_type: Option<String>,
+    target_id: Option<String>,
+    request_method: Option<String>,
+    request_path: Option<String>,
+    request_id: Option<String>,
+    metadata_json: Option<String>,
     retention_limit: Option<usize>,
 ) -> PyResult<Bound<'a, PyAny>> {
     let op = get_operator(py, &storage_config)?;
-    let payload: Value = serde_json::from_str(&payload_json)
-        .map_err(|e| PyValueError::new_err(format!("Invalid audit payload JSON: {e}")))?;
+    let metadata = match metadata_json {
+        Some(raw) => serde_json::from_str::<Value>(&raw)
+            .map_err(|e| PyValueError::new_err(format!("Invalid audit metadata JSON: {e}")))?,
+        None => serde_json::json!({}),
+    };
+    let payload = serde_json::json!({
+        "action": action,
+        "actor_user_id": actor_user_id,
+        "outcome": outcome,
+        "target_type": target_type,
+        "target_id": target_id,
+        "request_method": request_method,
+        "request_path": request_path,
+        "request_id": request_id,
+        "metadata": metadata,
+    });
     pyo3_async_runtimes::tokio::future_into_py(py, async move {
         let appended = audit::append_audit_event(&op, &space_id, &payload, retention_limit)
             .await
@@ -351,41 +630,27 @@ fn append_audit_event_py<'a>(
 }
 
 #[pyfunction]
-#[pyo3(signature = (storage_config, space_id, filters_json=None))]
+#[allow(clippy::too_many_arguments)]
+#[pyo3(signature = (
+    storage_config,
+    space_id,
+    offset=0,
+    limit=100,
+    action=None,
+    actor_user_id=None,
+    outcome=None,
+))]
 fn list_audit_events_py<'a>(
     py: Python<'a>,
     storage_config: Bound<'a, PyDict>,
     space_id: String,
-    filters_json: Option<String>,
+    offset: usize,
+    limit: usize,
+    action: Option<String>,
+    actor_user_id: Option<String>,
+    outcome: Option<String>,
 ) -> PyResult<Bound<'a, PyAny>> {
     let op = get_operator(py, &storage_config)?;
-    let filters_value = match filters_json {
-        Some(raw) => serde_json::from_str::<Value>(&raw)
-            .map_err(|e| PyValueError::new_err(format!("Invalid audit filters JSON: {e}")))?,
-        None => Value::Null,
-    };
-    let offset = filters_value
-        .get("offset")
-        .and_then(Value::as_u64)
-        .and_then(|value| usize::try_from(value).ok())
-        .unwrap_or(0);
-    let limit = filters_value
-        .get("limit")
-        .and_then(Value::as_u64)
-        .and_then(|value| usize::try_from(value).ok())
-        .unwrap_or(100);
-    let action = filters_value
-        .get("action")
-        .and_then(Value::as_str)
-        .map(str::to_string);
-    let actor_user_id = filters_value
-        .get("actor_user_id")
-        .and_then(Value::as_str)
-        .map(str::to_string);
-    let outcome = filters_value
-        .get("outcome")
-        .and_then(Value::as_str)
-        .map(str::to_string);
     let options = audit::AuditListOptions {
         offset,
         limit,
@@ -660,6 +925,52 @@ fn patch_space<'a>(
     })
 }
 
+#[pyfunction]
+#[pyo3(signature = (storage_config, space_id, patch_json, audit_events_json, retention_limit=None))]
+fn patch_space_with_audit<'a>(
+    py: Python<'a>,
+    storage_config: Bound<'a, PyDict>,
+    space_id: String,
+    patch_json: String,
+    audit_events_json: String,
+    retention_limit: Option<usize>,
+) -> PyResult<Bound<'a, PyAny>> {
+    let op = get_operator(py, &storage_config)?;
+    let patch_value: serde_json::Value =
+        serde_json::from_str(&patch_json).map_err(|e| PyValueError::new_err(e.to_string()))?;
+    let audit_events: Vec<Value> = serde_json::from_str(&audit_events_json)
+        .map_err(|e| PyValueError::new_err(format!("Invalid audit events JSON: {e}")))?;
+    pyo3_async_runtimes::tokio::future_into_py(py, async move {
+        let updated = space::patch_space_with_audit(
+            &op,
+            &space_id,
+            &patch_value,
+            &audit_events,
+            retention_limit,
+        )
+        .await
+        .map_err(|e| PyRuntimeError::new_err(e.to_string()))?;
+        Python::with_gil(|py| json_to_py(py, updated))
+    })
+}
+
+#[pyfunction]
+fn record_service_api_key_use<'a>(
+    py: Python<'a>,
+    storage_config: Bound<'a, PyDict>,
+    space_id: String,
+    service_account_id: String,
+    key_id: String,
+    used_at: String,
+) -> PyResult<Bound<'a, PyAny>> {
+    let op = get_operator(py, &storage_config)?;
+    pyo3_async_runtimes::tokio::future_into_py(py, async move {
+        space::record_service_api_key_use(&op, &space_id, &service_account_id, &key_id, &used_at)
+            .await
+            .map_err(|e| PyRuntimeError::new_err(e.to_string()))
+    })
+}
+
 #[pyfunction]
 fn get_user_preferences<'a>(
     py: Python<'a>,
@@ -1324,8 +1635,15 @@ fn get_sql_session_rows_all_scoped<'a>(
 fn _ugoite_core(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(hash_service_api_key_secret, m)?)?;
     m.add_function(wrap_pyfunction!(verify_service_api_key_secret, m)?)?;
+    m.add_function(wrap_pyfunction!(match_service_api_key_secret, m)?)?;
     m.add_function(wrap_pyfunction!(authenticate_headers_core, m)?)?;
     m.add_function(wrap_pyfunction!(auth_capabilities_snapshot_core, m)?)?;
+    m.add_function(wrap_pyfunction!(clear_auth_caches_core, m)?)?;
+    m.add_function(wrap_pyfunction!(parse_user_groups_map_core, m)?)?;
+    m.add_class::<PyAuthConfig>()?;
+    m.add_function(wrap_pyfunction!(build_auth_config_core, m)?)?;
+    m.add_function(wrap_pyfunction!(authenticate_with_config_core, m)?)?;
+    m.add_function(wrap_pyfunction!(auth_config_has_api_keys_core, m)?)?;
 
     m.add_function(wrap_pyfunction!(list_spaces, m)?)?;
     m.add_function(wrap_pyfunction!(create_space, m)?)?;
@@ -1366,6 +1684,8 @@ fn _ugoite_core(m: &Bound<'_, PyModule>) -> PyResult<()> {
 
     m.add_function(wrap_pyfunction!(get_space, m)?)?;
     m.add_function(wrap_pyfunction!(patch_space, m)?)?;
+    m.add_function(wrap_pyfunction!(patch_space_with_audit, m)?)?;
+    m.add_function(wrap_pyfunction!(record_service_api_key_use, m)?)?;
     m.add_function(wrap_pyfunction!(get_user_preferences, m)?)?;
     m.add_function(wrap_pyfunction!(patch_user_preferences, m)?)?;
 
@@ -6,6 +6,7 @@ use rand::TryRng;
 #[cfg(unix)]
 use std::path::{Path, PathBuf};
 
+use crate::audit;
 use crate::form;
 use crate::storage::{OpendalStorage, StorageBackend};
 pub use ugoite_minimum::space::{storage_type_and_root, SpaceMeta, StorageConfig};
@@ -285,6 +286,80 @@ pub async fn patch_space(
     patch_space_with_storage(&storage, space_id, patch).await
 }
 
+/// Apply a space patch and append the audit events describing it in one
+/// native call. The patch is written first, so a rejected patch records no
+/// events.
+pub async fn patch_space_with_audit(
+    op: &Operator,
+    space_id: &str,
+    patch: &serde_json::Value,
+    audit_events: &[serde_json::Value],
+    retention_limit: Option<usize>,
+) -> Result<serde_json::Value> {
+    let updated = patch_space(op, space_id, patch).await?;
+    audit::append_audit_events(op, space_id, audit_events, retention_limit).await?;
+    Ok(updated)
+}
+
+fn usage_count_value(value: &serde_json::Value) -> Option<u64> {
+    value
+        .as_u64()
+        .or_else(|| value.as_str().and_then(|raw| raw.trim().parse().ok()))
+}
+
+async fn record_service_api_key_use_with_storage<S: StorageBackend + ?Sized>(
+    storage: &S,
+    space_id: &str,
+    service_account_id: &str,
+    key_id: &str,
+    used_at: &str,
+) -> Result<u64> {
+    let settings_path = format!("spaces/{space_id}/settings.json");
+    if !storage.exists(&settings_path).await? {
+        return Err(anyhow!("Service account key not found: {key_id}"));
+    }
+
+    let mut settings: serde_json::Value = storage.read_json(&settings_path).await?;
+    let key = settings
+        .get_mut("service_accounts")
+        .and_then(|accounts| accounts.get_mut(service_account_id))
+        .and_then(|account| account.get_mut("keys"))
+        .and_then(|keys| keys.get_mut(key_id))
+        .and_then(serde_json::Value::as_object_mut)
+        .ok_or_else(|| anyhow!("Service account key not found: {key_id}"))?;
+    if key
+        .get("revoked_at")
+        .is_some_and(|revoked_at| !revoked_at.is_null())
+    {
+        return Err(anyhow!("API key has been revoked"));
+    }
+
+    let usage_count = key
+        .get("usage_count")
+        .and_then(usage_count_value)
+        .unwrap_or(0)
+        + 1;
+    key.insert("usage_count".to_string(), usage_count.into());
+    key.insert("last_used_at".to_string(), used_at.into());
+
+    storage.write_json(&settings_path, &settings).await?;
+    Ok(usage_count)
+}
+
+/// Record one use of a service-account API key, touching only that key's
+/// `usage_count` and `last_used_at`. Returns the new usage count.
+pub async fn record_service_api_key_use(
+    op: &Operator,
+    space_id: &str,
+    service_account_id: &str,
+    key_id: &str,
+    used_at: &str,
+) -> Result<u64> {
+    let storage = OpendalStorage::from_operator(op);
+    record_service_api_key_use_with_storage(&storage, space_id, service_account_id, key_id, used_at)
+        .await
+}
+
 /// Test a storage connection by checking if the URI is accessible.
 pub async fn test_storage_connection(uri: &str) -> Result<serde_json::Value> {
     if uri.starts_with("memory://") {
@@ -84,6 +84,44 @@ async def test_audit_detects_chain_tampering(tmp_path: pathlib.Path) -> None:
         await ugoite_core.list_audit_events(config, "audit-space")
 
 
+@pytest.mark.asyncio
+async def test_audit_detects_tampering_after_cached_reads(
+    tmp_path: pathlib.Path,
+) -> None:
+    """REQ-SEC-008: warm in-process audit state never masks on-disk tampering."""
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    await ugoite_core.create_space(config, "audit-space")
+
+    for index in range(3):
+        await ugoite_core.append_audit_event(
+            config,
+            "audit-space",
+            ugoite_core.AuditEventInput(
+                action="entry.update",
+                actor_user_id="alice",
+                outcome="success",
+                target_id=f"entry-{index}",
+            ),
+        )
+    listed = await ugoite_core.list_audit_events(config, "audit-space")
+    assert listed["total"] == 3
+
+    audit_file = Path(root) / "spaces" / "audit-space" / "audit" / "events.jsonl"
+    records = [
+        line for line in audit_file.read_text(encoding="utf-8").splitlines() if line
+    ]
+    assert len(records) == 3
+    tampered = json.loads(records[1])
+    tampered["actor_user_id"] = "mallory"
+    records[1] = json.dumps(tampered, separators=(",", ":"), sort_keys=True)
+    audit_file.write_text("\n".join(records) + "\n", encoding="utf-8")
+
+    with pytest.raises(RuntimeError, match="integrity"):
+        await ugoite_core.list_audit_events(config, "audit-space")
+
+
 @pytest.mark.asyncio
 async def test_audit_retention_preserves_chain_integrity(
     tmp_path: pathlib.Path,
@@ -111,6 +149,8 @@ async def test_audit_retention_preserves_chain_integrity(
 
     result = await ugoite_core.list_audit_events(config, "audit-space")
     assert result["total"] == 100
+    audit_dir = root / "spaces" / "audit-space" / "audit"
+    assert [path.name for path in audit_dir.iterdir()] == ["events.jsonl"]
 
 
 @pytest.mark.asyncio
@@ -130,3 +170,74 @@ async def test_audit_rejects_invalid_space_id(tmp_path: pathlib.Path) -> None:
                 outcome="success",
             ),
         )
+
+
+@pytest.mark.asyncio
+async def test_audit_deferred_events_are_flushed_before_listing(
+    tmp_path: pathlib.Path,
+) -> None:
+    """REQ-SEC-008: deferred events are visible to the next audit read."""
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    await ugoite_core.create_space(config, "audit-space")
+
+    for index in range(3):
+        await ugoite_core.defer_audit_event(
+            config,
+            "audit-space",
+            ugoite_core.AuditEventInput(
+                action="entry.read",
+                actor_user_id="alice",
+                outcome="success",
+                target_id=f"entry-{index}",
+            ),
+        )
+
+    result = await ugoite_core.list_audit_events(config, "audit-space")
+    assert sorted(item["target_id"] for item in result["items"]) == [
+        "entry-0",
+        "entry-1",
+        "entry-2",
+    ]
+
+    with pytest.raises(RuntimeError, match="actor_user_id"):
+        await ugoite_core.defer_audit_event(
+            config,
+            "audit-space",
+            ugoite_core.AuditEventInput(
+                action="entry.read",
+                actor_user_id=" ",
+                outcome="success",
+            ),
+        )
+    await ugoite_core.flush_audit_events()
+
+
+@pytest.mark.asyncio
+async def test_audit_recovers_from_torn_last_line(tmp_path: pathlib.Path) -> None:
+    """REQ-SEC-008: an interrupted append does not break later reads or appends."""
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    await ugoite_core.create_space(config, "audit-space")
+
+    event = ugoite_core.AuditEventInput(
+        action="entry.update",
+        actor_user_id="alice",
+        outcome="success",
+    )
+    await ugoite_core.append_audit_event(config, "audit-space", event)
+
+    audit_file = Path(root) / "spaces" / "audit-space" / "audit" / "events.jsonl"
+    with audit_file.open("a", encoding="utf-8") as handle:
+        handle.write('{"action":"entry.upd')
+
+    listed = await ugoite_core.list_audit_events(config, "audit-space")
+    assert listed["total"] == 1
+
+    await ugoite_core.append_audit_event(config, "audit-space", event)
+    listed = await ugoite_core.list_audit_events(config, "audit-space")
+    assert listed["total"] == 2
+    lines = audit_file.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["action"] for line in lines] == ["entry.update"] * 2
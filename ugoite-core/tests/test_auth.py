@@ -178,6 +178,31 @@ def test_authenticate_headers_req_sec_003_rejects_revoked_key_after_cache_expiry
     assert excinfo.value.code == "revoked_key"
 
 
+def test_authenticate_headers_req_sec_003_accepts_mixed_case_header_names(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-003: credential headers are matched case-insensitively."""
+    secret = "test-" + "secret"
+    monkeypatch.setenv("UGOITE_AUTH_BEARER_SECRETS", f"dev-local-v1:{secret}")
+    monkeypatch.delenv("UGOITE_AUTH_BEARER_ACTIVE_KIDS", raising=False)
+    monkeypatch.delenv("UGOITE_AUTH_BEARER_TOKENS_JSON", raising=False)
+    monkeypatch.delenv("UGOITE_BOOTSTRAP_BEARER_TOKEN", raising=False)
+    monkeypatch.delenv("UGOITE_AUTH_REVOKED_KEY_IDS", raising=False)
+    clear_auth_manager_cache()
+
+    token = mint_signed_bearer_token(
+        user_id="dev-user",
+        key_id="dev-local-v1",
+        secret=secret,
+        expires_at=2_000_000_000,
+    )
+
+    identity = authenticate_headers(
+        {"Content-Type": "application/json", "Authorization": f"Bearer {token}"},
+    )
+    assert identity.user_id == "dev-user"
+
+
 def _totp_code(secret: str, timestamp: int) -> str:
     decoded_secret = base64.b32decode(secret.upper(), casefold=True)
     counter = timestamp // 30
@@ -0,0 +1,233 @@
+"""Authorization policy tests.
+
+REQ-SEC-006: Space-Scoped Authorization and Form ACL.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import pytest
+
+import ugoite_core
+from ugoite_core.auth import RequestIdentity
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+async def _acl_space(config: dict[str, str], space_id: str) -> None:
+    await ugoite_core.create_space(config, space_id)
+    for form_name in ("PublicTask", "RestrictedTask"):
+        await ugoite_core.upsert_form(
+            config,
+            space_id,
+            json.dumps(
+                {
+                    "name": form_name,
+                    "version": 1,
+                    "template": f"# {form_name}\n\n## Summary\n",
+                    "fields": {"Summary": {"type": "string", "required": True}},
+                },
+            ),
+        )
+    await ugoite_core.patch_space(
+        config,
+        space_id,
+        json.dumps(
+            {
+                "settings": {
+                    "member_roles": {
+                        "owner-user": "owner",
+                        "viewer-user": "viewer",
+                    },
+                    "form_acls": {
+                        "RestrictedTask": {
+                            "read_principals": [
+                                {"kind": "user", "id": "owner-user"},
+                                {"kind": "user_group", "id": "auditors"},
+                            ],
+                        },
+                    },
+                },
+            },
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_filter_readable_entries_req_sec_006_resolves_space_once(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-006: bulk filtering reads the space and each form once per call."""
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    space_id = "authz-space"
+    await _acl_space(config, space_id)
+
+    get_space = ugoite_core.get_space
+    get_form = ugoite_core.get_form
+    calls: list[str] = []
+    form_calls: list[str] = []
+
+    async def _counting_get_space(
+        storage_config: dict[str, str],
+        requested_space_id: str,
+    ) -> object:
+        calls.append(requested_space_id)
+        return await get_space(storage_config, requested_space_id)
+
+    async def _counting_get_form(
+        storage_config: dict[str, str],
+        requested_space_id: str,
+        form_name: str,
+    ) -> object:
+        form_calls.append(form_name)
+        return await get_form(storage_config, requested_space_id, form_name)
+
+    monkeypatch.setattr(
+        "ugoite_core.authz._core_any.get_space",
+        _counting_get_space,
+    )
+    monkeypatch.setattr(
+        "ugoite_core.authz._core_any.get_form",
+        _counting_get_form,
+    )
+
+    entries = [
+        {"id": "public-a", "form": "PublicTask"},
+        {"id": "restricted-z", "form": "RestrictedTask"},
+        {"id": "plain"},
+        {"id": "public-b", "properties": {"form": "PublicTask"}},
+    ]
+    viewer = RequestIdentity(user_id="viewer-user", auth_method="bearer")
+    filtered = await ugoite_core.filter_readable_entries(
+        config,
+        space_id,
+        viewer,
+        entries,
+    )
+
+    assert [entry["id"] for entry in filtered] == ["public-a", "plain", "public-b"]
+    assert calls == [space_id]
+    assert form_calls == ["PublicTask", "RestrictedTask"]
+
+    outsider = RequestIdentity(user_id="outsider", auth_method="bearer")
+    assert (
+        await ugoite_core.filter_readable_entries(config, space_id, outsider, entries)
+        == []
+    )
+
+
+@pytest.mark.asyncio
+async def test_filter_readable_entries_req_sec_006_uses_env_user_groups(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-006: env-configured groups satisfy user_group Form ACLs."""
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    space_id = "authz-groups-space"
+    await _acl_space(config, space_id)
+    monkeypatch.setenv(
+        "UGOITE_AUTHZ_USER_GROUPS_JSON",
+        json.dumps(
+            {
+                space_id: {"viewer-user": ["auditors", "", 7], "other": "x"},
+                "other-space": ["not", "a", "map"],
+            },
+        ),
+    )
+
+    entries = [
+        {"id": "public-a", "form": "PublicTask"},
+        {"id": "restricted-z", "form": "RestrictedTask"},
+    ]
+    viewer = RequestIdentity(user_id="viewer-user", auth_method="bearer")
+    filtered = await ugoite_core.filter_readable_entries(
+        config,
+        space_id,
+        viewer,
+        entries,
+    )
+
+    assert [entry["id"] for entry in filtered] == ["public-a", "restricted-z"]
+
+
+def test_form_name_from_entry_req_sec_006_reads_markdown_forms() -> None:
+    """REQ-SEC-006: markdown forms resolve from front matter or a form section."""
+    assert (
+        ugoite_core.form_name_from_entry(
+            {"markdown": "---\nform: PublicTask\n---\n# Title\n"},
+        )
+        == "PublicTask"
+    )
+    assert (
+        ugoite_core.form_name_from_entry(
+            {"content": "# Title\n\n## form\nRestrictedTask\n"},
+        )
+        == "RestrictedTask"
+    )
+    assert ugoite_core.form_name_from_entry({"markdown": "# Title\n\nBody\n"}) is None
+
+
+def test_form_name_from_entry_req_sec_006_accepts_mapping_subclasses() -> None:
+    """REQ-SEC-006: callers may pass dict and str subclasses, not just JSON."""
+
+    class _FormName(str):
+        __slots__ = ()
+
+    properties = OrderedDict(form=_FormName(" PublicTask "))
+    assert ugoite_core.form_name_from_entry({"properties": properties}) == "PublicTask"
+
+
+@pytest.mark.asyncio
+async def test_resolve_access_context_req_sec_006_reloads_default_role(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-006: default role env changes apply once auth config reloads."""
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    space_id = "authz-default-role-space"
+    await ugoite_core.create_space(config, space_id)
+    identity = RequestIdentity(user_id="someone", auth_method="bearer")
+
+    monkeypatch.setenv("UGOITE_AUTHZ_DEFAULT_USER_ROLE", "viewer")
+    ugoite_core.clear_auth_manager_cache()
+    access = await ugoite_core.resolve_access_context(config, space_id, identity)
+    assert access.role == "viewer"
+
+    monkeypatch.delenv("UGOITE_AUTHZ_DEFAULT_USER_ROLE")
+    ugoite_core.clear_auth_manager_cache()
+    access = await ugoite_core.resolve_access_context(config, space_id, identity)
+    assert access.role == "editor"
+
+
+def test_form_name_from_entry_req_sec_006_caches_large_markdown_by_digest(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-006: repeated large markdown bodies are extracted once."""
+    extract_properties = ugoite_core.extract_properties
+    extracted: list[int] = []
+
+    def _counting_extract(markdown: str) -> object:
+        extracted.append(len(markdown))
+        return extract_properties(markdown)
+
+    monkeypatch.setattr(
+        "ugoite_core.authz._core_any.extract_properties",
+        _counting_extract,
+    )
+    markdown = "---\nform: PublicTask\n---\n# Title\n\n" + "body line\n" * 500
+    for _ in range(3):
+        assert ugoite_core.form_name_from_entry({"markdown": markdown}) == (
+            "PublicTask"
+        )
+    assert extracted == [len(markdown)]
@@ -0,0 +1,455 @@
+"""Space membership tests.
+
+REQ-SEC-007: Space Membership Lifecycle and Invitation Collaboration.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+import ugoite_core
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+async def _member_space(tmp_path: Path, space_id: str) -> dict[str, str]:
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    await ugoite_core.create_space(config, space_id)
+    await ugoite_core.bootstrap_space_owner(config, space_id, "owner-user")
+    return config
+
+
+def _count_writes(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    patch_space = ugoite_core.patch_space
+    writes: list[str] = []
+
+    async def _counting_patch_space(
+        storage_config: dict[str, str],
+        space_id: str,
+        patch_json: str,
+    ) -> object:
+        writes.append(space_id)
+        return await patch_space(storage_config, space_id, patch_json)
+
+    monkeypatch.setattr(
+        "ugoite_core.membership._core_any.patch_space",
+        _counting_patch_space,
+    )
+    return writes
+
+
+@pytest.mark.asyncio
+async def test_accept_invitation_req_sec_007_uses_token_index(tmp_path: Path) -> None:
+    """REQ-SEC-007: invitation tokens resolve through the token-hash index."""
+    space_id = "members-index"
+    config = await _member_space(tmp_path, space_id)
+
+    invited = await ugoite_core.create_invitation(
+        config,
+        space_id,
+        ugoite_core.InviteMemberInput(
+            user_id="alice-user",
+            role="viewer",
+            invited_by_user_id="owner-user",
+        ),
+    )
+    invitation = invited["invitation"]
+    space = await ugoite_core.get_space(config, space_id)
+    assert space["settings"]["invitations_by_token_hash"] == {
+        invitation["token_hash_b"]: invitation["id"],
+    }
+
+    # Spaces written before the index existed rebuild it on read, including
+    # invitations that still carry the legacy hex `token_hash`.
+    invitations = space["settings"]["invitations"]
+    legacy = invitations[invitation["id"]]
+    del legacy["token_hash_b"]
+    legacy["token_hash"] = hashlib.sha256(invitation["token"].encode()).hexdigest()
+    await ugoite_core.patch_space(
+        config,
+        space_id,
+        json.dumps(
+            {
+                "settings": {
+                    "invitations": invitations,
+                    "invitations_by_token_hash": None,
+                },
+            },
+        ),
+    )
+    accepted = await ugoite_core.accept_invitation(
+        config,
+        space_id,
+        ugoite_core.AcceptInvitationInput(
+            token=invitation["token"],
+            accepted_by_user_id="alice-user",
+        ),
+    )
+    assert accepted["member"]["state"] == "active"
+
+    unknown_token = invitation["token"][::-1]
+    with pytest.raises(RuntimeError, match="not found"):
+        await ugoite_core.accept_invitation(
+            config,
+            space_id,
+            ugoite_core.AcceptInvitationInput(
+                token=unknown_token,
+                accepted_by_user_id="alice-user",
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_revoke_member_req_sec_007_revokes_indexed_invitations(
+    tmp_path: Path,
+) -> None:
+    """REQ-SEC-007: revocation invalidates every pending invitation for the user."""
+    space_id = "members-revoke"
+    config = await _member_space(tmp_path, space_id)
+    invite = ugoite_core.InviteMemberInput(
+        user_id="bob-user",
+        role="editor",
+        invited_by_user_id="owner-user",
+    )
+    first = await ugoite_core.create_invitation(config, space_id, invite)
+    second = await ugoite_core.create_invitation(config, space_id, invite)
+
+    space = await ugoite_core.get_space(config, space_id)
+    assert space["settings"]["pending_invitations_by_user"] == {
+        "bob-user": [first["invitation"]["id"], second["invitation"]["id"]],
+    }
+
+    await ugoite_core.revoke_member(
+        config,
+        space_id,
+        ugoite_core.RevokeMemberInput(
+            member_user_id="bob-user",
+            revoked_by_user_id="owner-user",
+        ),
+    )
+
+    settings = (await ugoite_core.get_space(config, space_id))["settings"]
+    assert settings["pending_invitations_by_user"] == {}
+    assert {item["state"] for item in settings["invitations"].values()} == {
+        "revoked",
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_invitation_req_sec_007_batches_queued_writes(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-007: invitations queued behind the space lock share one write."""
+    space_id = "members-batch"
+    config = await _member_space(tmp_path, space_id)
+
+    writes = _count_writes(monkeypatch)
+    user_ids = [f"user-{index}" for index in range(5)]
+    results = await asyncio.gather(
+        *(
+            ugoite_core.create_invitation(
+                config,
+                space_id,
+                ugoite_core.InviteMemberInput(
+                    user_id=user_id,
+                    role="viewer",
+                    invited_by_user_id="owner-user",
+                ),
+            )
+            for user_id in user_ids
+        ),
+    )
+
+    assert [result["invitation"]["user_id"] for result in results] == user_ids
+    assert len(writes) < len(user_ids)
+    members = await ugoite_core.list_members(config, space_id)
+    invited = [member["user_id"] for member in members if member["state"] == "invited"]
+    assert invited == user_ids
+
+
+@pytest.mark.asyncio
+async def test_member_updates_req_sec_007_skip_writes_for_no_ops(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-007: unchanged roles and repeated revocations do not rewrite."""
+    space_id = "members-noop"
+    config = await _member_space(tmp_path, space_id)
+    await ugoite_core.create_invitation(
+        config,
+        space_id,
+        ugoite_core.InviteMemberInput(
+            user_id="carol-user",
+            role="viewer",
+            invited_by_user_id="owner-user",
+        ),
+    )
+    writes = _count_writes(monkeypatch)
+
+    unchanged = await ugoite_core.update_member_role(
+        config,
+        space_id,
+        ugoite_core.UpdateMemberRoleInput(
+            member_user_id="carol-user",
+            role="viewer",
+            changed_by_user_id="owner-user",
+        ),
+    )
+    assert unchanged["member"]["role"] == "viewer"
+    assert writes == []
+
+    revoke = ugoite_core.RevokeMemberInput(
+        member_user_id="carol-user",
+        revoked_by_user_id="owner-user",
+    )
+    await ugoite_core.revoke_member(config, space_id, revoke)
+    repeated = await ugoite_core.revoke_member(config, space_id, revoke)
+    assert repeated["member"]["state"] == "revoked"
+    assert writes == [space_id]
+
+
+@pytest.mark.asyncio
+async def test_membership_patch_req_sec_007_leaves_other_settings_alone(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-007: membership writes only send membership-managed settings."""
+    space_id = "members-patch"
+    config = await _member_space(tmp_path, space_id)
+    await ugoite_core.patch_space(
+        config,
+        space_id,
+        json.dumps({"settings": {"default_form": "Task"}}),
+    )
+
+    patch_space = ugoite_core.patch_space
+    patches: list[dict[str, dict[str, object]]] = []
+
+    async def _capturing_patch_space(
+        storage_config: dict[str, str],
+        requested_space_id: str,
+        patch_json: str,
+    ) -> object:
+        patches.append(json.loads(patch_json))
+        return await patch_space(storage_config, requested_space_id, patch_json)
+
+    monkeypatch.setattr(
+        "ugoite_core.membership._core_any.patch_space",
+        _capturing_patch_space,
+    )
+    await ugoite_core.create_invitation(
+        config,
+        space_id,
+        ugoite_core.InviteMemberInput(
+            user_id="dana-user",
+            role="editor",
+            invited_by_user_id="owner-user",
+        ),
+    )
+
+    assert list(patches[0]) == ["settings"]
+    assert "default_form" not in patches[0]["settings"]
+    space = await ugoite_core.get_space(config, space_id)
+    assert space["settings"]["default_form"] == "Task"
+    assert space["settings"]["members"]["dana-user"]["state"] == "invited"
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_invitations_req_sec_007_writes_each_space_once(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-007: bulk invites write each space once and keep input order."""
+    config = await _member_space(tmp_path, "members-bulk-a")
+    await ugoite_core.create_space(config, "members-bulk-b")
+    await ugoite_core.bootstrap_space_owner(config, "members-bulk-b", "owner-user")
+
+    writes = _count_writes(monkeypatch)
+    items = [
+        (
+            space_id,
+            ugoite_core.InviteMemberInput(
+                user_id=user_id,
+                role="viewer",
+                invited_by_user_id="owner-user",
+            ),
+        )
+        for space_id, user_id in [
+            ("members-bulk-a", "user-1"),
+            ("members-bulk-b", "user-2"),
+            ("members-bulk-a", "user-3"),
+            ("members-bulk-b", "owner-user"),
+        ]
+    ]
+    results = await ugoite_core.bulk_create_invitations(
+        config,
+        items,
+        return_exceptions=True,
+    )
+
+    assert [result["invitation"]["user_id"] for result in results[:3]] == [
+        "user-1",
+        "user-2",
+        "user-3",
+    ]
+    assert isinstance(results[3], RuntimeError)
+    assert sorted(writes) == ["members-bulk-a", "members-bulk-b"]
+
+
+@pytest.mark.asyncio
+async def test_create_invitation_req_sec_007_survives_cancelled_caller(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-007: cancelling a queued caller does not strand later invites."""
+    space_id = "members-cancel"
+    config = await _member_space(tmp_path, space_id)
+
+    patch_space = ugoite_core.patch_space
+    writing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _gated_patch_space(
+        storage_config: dict[str, str],
+        requested_space_id: str,
+        patch_json: str,
+    ) -> object:
+        writing.set()
+        await release.wait()
+        return await patch_space(storage_config, requested_space_id, patch_json)
+
+    monkeypatch.setattr(
+        "ugoite_core.membership._core_any.patch_space",
+        _gated_patch_space,
+    )
+
+    def _invite(user_id: str) -> asyncio.Task[dict[str, object]]:
+        return asyncio.create_task(
+            ugoite_core.create_invitation(
+                config,
+                space_id,
+                ugoite_core.InviteMemberInput(
+                    user_id=user_id,
+                    role="viewer",
+                    invited_by_user_id="owner-user",
+                ),
+            ),
+        )
+
+    # The first write holds the space lock until released; the second caller
+    # opens a new batch behind it and is cancelled while waiting.
+    holder = _invite("user-holder")
+    await writing.wait()
+    cancelled = _invite("user-cancelled")
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    joined = _invite("user-joined")
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.wait_for(holder, timeout=5)
+    result = await asyncio.wait_for(joined, timeout=5)
+
+    assert result["invitation"]["user_id"] == "user-joined"
+    members = await ugoite_core.list_members(config, space_id)
+    invited = {member["user_id"] for member in members if member["state"] == "invited"}
+    assert invited == {"user-holder", "user-joined"}
+
+
+@pytest.mark.asyncio
+async def test_membership_req_sec_007_handles_invitations_missing_from_index(
+    tmp_path: Path,
+) -> None:
+    """REQ-SEC-007: invitations written without index entries still resolve."""
+    space_id = "members-stale-index"
+    config = await _member_space(tmp_path, space_id)
+    invited = await ugoite_core.create_invitation(
+        config,
+        space_id,
+        ugoite_core.InviteMemberInput(
+            user_id="erin-user",
+            role="viewer",
+            invited_by_user_id="owner-user",
+        ),
+    )
+
+    # Simulate writers that do not maintain the indexes: their invitations
+    # land in `invitations` and `members` only.
+    settings = (await ugoite_core.get_space(config, space_id))["settings"]
+    tokens = {user_id: f"{user_id}-token" for user_id in ("frank-user", "gina-user")}
+    for user_id, token in tokens.items():
+        settings["invitations"][f"{user_id}-invite"] = {
+            "id": f"{user_id}-invite",
+            "token_hash": hashlib.sha256(token.encode()).hexdigest(),
+            "user_id": user_id,
+            "role": "viewer",
+            "state": "pending",
+            "invited_by": "owner-user",
+            "invited_at": "2026-01-01T00:00:00Z",
+            "expires_at": "2099-01-01T00:00:00+00:00",
+        }
+        settings["members"][user_id] = {
+            "user_id": user_id,
+            "role": "viewer",
+            "state": "invited",
+        }
+    await ugoite_core.patch_space(
+        config,
+        space_id,
+        json.dumps(
+            {
+                "settings": {
+                    "invitations": settings["invitations"],
+                    "members": settings["members"],
+                },
+            },
+        ),
+    )
+
+    accepted = await ugoite_core.accept_invitation(
+        config,
+        space_id,
+        ugoite_core.AcceptInvitationInput(
+            token=tokens["frank-user"],
+            accepted_by_user_id="frank-user",
+        ),
+    )
+    assert accepted["member"]["state"] == "active"
+
+    await ugoite_core.revoke_member(
+        config,
+        space_id,
+        ugoite_core.RevokeMemberInput(
+            member_user_id="gina-user",
+            revoked_by_user_id="owner-user",
+        ),
+    )
+    with pytest.raises(RuntimeError, match="not pending"):
+        await ugoite_core.accept_invitation(
+            config,
+            space_id,
+            ugoite_core.AcceptInvitationInput(
+                token=tokens["gina-user"],
+                accepted_by_user_id="gina-user",
+            ),
+        )
+
+    # Only the still-pending invitation remains indexed.
+    settings = (await ugoite_core.get_space(config, space_id))["settings"]
+    assert settings["invitations_by_token_hash"] == {
+        invited["invitation"]["token_hash_b"]: invited["invitation"]["id"],
+    }
+    assert settings["pending_invitations_by_user"] == {
+        "erin-user": [invited["invitation"]["id"]],
+    }
@@ -5,11 +5,16 @@ REQ-SEC-009: Service Accounts and Scoped API Keys for Automation.
 
 from __future__ import annotations
 
+import base64
+import hashlib
+import json
 from typing import TYPE_CHECKING
 
 import pytest
 
 import ugoite_core
+from ugoite_core import _ugoite_core
+from ugoite_core.service_accounts import resolve_service_api_key
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -160,3 +165,225 @@ async def test_service_account_key_usage_is_audit_logged(tmp_path: Path) -> None
     latest = events["items"][0]
     assert latest["action"] == "service_account.key.use"
     assert latest["request_path"] == "/spaces/audit-space/entries"
+
+
+@pytest.mark.asyncio
+async def test_service_account_key_resolves_among_many_keys(tmp_path: Path) -> None:
+    """REQ-SEC-009: a key resolves to its own account when many keys exist."""
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    await ugoite_core.create_space(config, "many-keys-space")
+
+    key_secrets: dict[str, str] = {}
+    for display_name in ("Reader Bot", "Writer Bot"):
+        created = await ugoite_core.create_service_account(
+            config,
+            "many-keys-space",
+            ugoite_core.CreateServiceAccountInput(
+                display_name=display_name,
+                scopes=["entry_read"],
+                created_by_user_id="owner",
+            ),
+        )
+        for key_name in ("primary", "secondary"):
+            key_result = await ugoite_core.create_service_account_key(
+                config,
+                "many-keys-space",
+                ugoite_core.CreateServiceAccountKeyInput(
+                    service_account_id=str(created["id"]),
+                    key_name=key_name,
+                    created_by_user_id="owner",
+                ),
+            )
+            key_secrets[str(key_result["key"]["id"])] = str(key_result["secret"])
+
+    for key_id, secret in key_secrets.items():
+        resolved = await resolve_service_api_key(
+            config,
+            "many-keys-space",
+            secret,
+        )
+        assert resolved.key_id == key_id
+
+    with pytest.raises(RuntimeError, match="Invalid API key"):
+        await resolve_service_api_key(
+            config,
+            "many-keys-space",
+            "ugsk_" + "x" * 43,
+        )
+
+
+@pytest.mark.asyncio
+async def test_service_account_writes_leave_other_settings_alone(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-009: writes send only the service account table and its audit."""
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    await ugoite_core.create_space(config, "patch-space")
+    await ugoite_core.patch_space(
+        config,
+        "patch-space",
+        json.dumps({"settings": {"default_form": "Task"}}),
+    )
+
+    patch_space_with_audit = _ugoite_core.patch_space_with_audit
+    patches: list[dict[str, dict[str, object]]] = []
+    audit_actions: list[str] = []
+
+    def _capturing_patch_space_with_audit(
+        storage_config: dict[str, str],
+        space_id: str,
+        patch_json: str,
+        audit_events_json: str,
+        **kwargs: object,
+    ) -> object:
+        patches.append(json.loads(patch_json))
+        audit_actions.extend(event["action"] for event in json.loads(audit_events_json))
+        return patch_space_with_audit(
+            storage_config,
+            space_id,
+            patch_json,
+            audit_events_json,
+            **kwargs,
+        )
+
+    monkeypatch.setattr(
+        "ugoite_core.audit._core_any.patch_space_with_audit",
+        _capturing_patch_space_with_audit,
+    )
+    created = await ugoite_core.create_service_account(
+        config,
+        "patch-space",
+        ugoite_core.CreateServiceAccountInput(
+            display_name="Sync Bot",
+            scopes=["entry_read"],
+            created_by_user_id="owner",
+        ),
+    )
+
+    assert [list(patch["settings"]) for patch in patches] == [["service_accounts"]]
+    assert audit_actions == ["service_account.create"]
+    space = await ugoite_core.get_space(config, "patch-space")
+    assert space["settings"]["default_form"] == "Task"
+    assert created["id"] in space["settings"]["service_accounts"]
+
+
+@pytest.mark.asyncio
+async def test_service_account_key_lookup_reuses_verified_secret(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQ-SEC-009: repeat lookups skip hashing until the key is revoked."""
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    await ugoite_core.create_space(config, "cache-space")
+    created = await ugoite_core.create_service_account(
+        config,
+        "cache-space",
+        ugoite_core.CreateServiceAccountInput(
+            display_name="Cache Bot",
+            scopes=["entry_read"],
+            created_by_user_id="owner",
+        ),
+    )
+    key_result = await ugoite_core.create_service_account_key(
+        config,
+        "cache-space",
+        ugoite_core.CreateServiceAccountKeyInput(
+            service_account_id=str(created["id"]),
+            key_name="cached",
+            created_by_user_id="owner",
+        ),
+    )
+    secret = str(key_result["secret"])
+
+    match_secret = _ugoite_core.match_service_api_key_secret
+    match_calls: list[int] = []
+
+    def _counting_match(
+        secret: str,
+        candidates: list[tuple[str, str | None, str | None]],
+    ) -> int | None:
+        match_calls.append(len(candidates))
+        return match_secret(secret, candidates)
+
+    monkeypatch.setattr(
+        "ugoite_core.service_accounts._core_any.match_service_api_key_secret",
+        _counting_match,
+    )
+    for _ in range(3):
+        resolved = await resolve_service_api_key(config, "cache-space", secret)
+        assert resolved.key_id == key_result["key"]["id"]
+    assert match_calls == [1]
+
+    await ugoite_core.revoke_service_account_key(
+        config,
+        "cache-space",
+        ugoite_core.RevokeServiceAccountKeyInput(
+            service_account_id=str(created["id"]),
+            key_id=str(key_result["key"]["id"]),
+            revoked_by_user_id="owner",
+        ),
+    )
+    with pytest.raises(RuntimeError, match="revoked"):
+        await resolve_service_api_key(config, "cache-space", secret)
+
+
+@pytest.mark.asyncio
+async def test_service_account_legacy_pbkdf2_key_resolves(tmp_path: Path) -> None:
+    """REQ-SEC-009: keys stored as PBKDF2-HMAC-SHA256 keep authenticating."""
+    root = tmp_path / "storage"
+    root.mkdir()
+    config = {"uri": f"fs://{root}"}
+    await ugoite_core.create_space(config, "pbkdf2-space")
+    created = await ugoite_core.create_service_account(
+        config,
+        "pbkdf2-space",
+        ugoite_core.CreateServiceAccountInput(
+            display_name="Legacy Bot",
+            scopes=["entry_read"],
+            created_by_user_id="owner",
+        ),
+    )
+    key_result = await ugoite_core.create_service_account_key(
+        config,
+        "pbkdf2-space",
+        ugoite_core.CreateServiceAccountKeyInput(
+            service_account_id=str(created["id"]),
+            key_name="legacy",
+            created_by_user_id="owner",
+        ),
+    )
+    secret = str(key_result["secret"])
+    key_id = str(key_result["key"]["id"])
+
+    # Rewrite the key the way keys created before `hmac_sha256_v1` were
+    # stored: 240k rounds of PBKDF2-HMAC-SHA256, unpadded base64url.
+    settings = (await ugoite_core.get_space(config, "pbkdf2-space"))["settings"]
+    accounts = settings["service_accounts"]
+    key_obj = accounts[str(created["id"])]["keys"][key_id]
+    digest = hashlib.pbkdf2_hmac(
+        "sha256",
+        secret.encode(),
+        key_obj["secret_salt"].encode(),
+        240_000,
+    )
+    key_obj["secret_hash"] = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+    key_obj["hash_algorithm"] = "pbkdf2_sha256_v1"
+    await ugoite_core.patch_space(
+        config,
+        "pbkdf2-space",
+        json.dumps({"settings": {"service_accounts": accounts}}),
+    )
+
+    resolved = await resolve_service_api_key(config, "pbkdf2-space", secret)
+    assert resolved.key_id == key_id
+
+    wrong_secret = secret[:-1] + ("A" if secret[-1] != "A" else "B")
+    with pytest.raises(RuntimeError, match="Invalid API key"):
+        await resolve_service_api_key(config, "pbkdf2-space", wrong_secret)
@@ -1,5 +1,5 @@
 mod common;
-use _ugoite_core::{form, space};
+use _ugoite_core::{audit, form, space};
 use common::setup_operator;
 #[cfg(unix)]
 use opendal::services::Fs;
@@ -168,3 +168,72 @@ async fn test_space_req_sto_002_test_storage_connection_unknown() -> anyhow::Res
     assert_eq!(result["mode"], "unknown");
     Ok(())
 }
+
+#[tokio::test]
+/// REQ-SEC-009
+async fn test_space_req_sec_009_record_service_api_key_use() -> anyhow::Result<()> {
+    let op = setup_operator()?;
+    let ws_id = "key-usage-space";
+    space::create_space(&op, ws_id, "/tmp/ugoite").await?;
+    let patch = serde_json::json!({
+        "settings": {
+            "default_form": "Task",
+            "service_accounts": {
+                "svc-1": {
+                    "keys": {
+                        "sak-1": {"usage_count": "2", "revoked_at": null},
+                        "sak-2": {"revoked_at": "2026-01-01T00:00:00Z"},
+                    },
+                },
+            },
+        },
+    });
+    space::patch_space(&op, ws_id, &patch).await?;
+
+    let used_at = "2026-02-01T00:00:00Z";
+    let count = space::record_service_api_key_use(&op, ws_id, "svc-1", "sak-1", used_at).await?;
+    assert_eq!(count, 3);
+
+    let meta = space::get_space_raw(&op, ws_id).await?;
+    let key = &meta["settings"]["service_accounts"]["svc-1"]["keys"]["sak-1"];
+    assert_eq!(key["usage_count"], 3);
+    assert_eq!(key["last_used_at"], used_at);
+    assert_eq!(meta["settings"]["default_form"], "Task");
+
+    let revoked = space::record_service_api_key_use(&op, ws_id, "svc-1", "sak-2", used_at).await;
+    assert!(revoked.unwrap_err().to_string().contains("revoked"));
+    let missing = space::record_service_api_key_use(&op, ws_id, "svc-1", "sak-3", used_at).await;
+    assert!(missing.unwrap_err().to_string().contains("not found"));
+    Ok(())
+}
+
+#[tokio::test]
+/// REQ-SEC-008, REQ-SEC-009
+async fn test_space_req_sec_009_patch_space_with_audit() -> anyhow::Result<()> {
+    let op = setup_operator()?;
+    let ws_id = "patch-audit-space";
+    space::create_space(&op, ws_id, "/tmp/ugoite").await?;
+    let patch = serde_json::json!({"settings": {"service_accounts": {"svc-1": {"keys": {}}}}});
+    let events = [
+        serde_json::json!({"action": "service_account.key.revoke", "actor_user_id": "owner"}),
+        serde_json::json!({"action": "service_account.key.rotate", "actor_user_id": "owner"}),
+    ];
+
+    space::patch_space_with_audit(&op, ws_id, &patch, &events, None).await?;
+
+    let meta = space::get_space_raw(&op, ws_id).await?;
+    assert!(meta["settings"]["service_accounts"]["svc-1"].is_object());
+    let listed = audit::list_audit_events(&op, ws_id, audit::AuditListOptions::default()).await?;
+    let actions: Vec<&str> = listed["items"]
+        .as_array()
+        .map(|items| {
+            items
+                .iter()
+                .filter_map(|item| item["action"].as_str())
+                .collect()
+        })
+        .unwrap_or_default();
+    assert_eq!(actions.len(), 2);
+    assert!(actions.contains(&"service_account.key.rotate"));
+    Ok(())
+}
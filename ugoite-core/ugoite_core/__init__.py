@@ -8,6 +8,8 @@ from .audit import (
     AuditEventInput,
     AuditListFilter,
     append_audit_event,
+    defer_audit_event,
+    flush_audit_events,
     list_audit_events,
 )
 from .auth import (
@@ -53,6 +55,7 @@ from .membership import (
     accept_invitation,
     admin_space_id,
     bootstrap_space_owner,
+    bulk_create_invitations,
     create_invitation,
     ensure_admin_space,
     is_active_member,
@@ -181,6 +184,7 @@ __all__ = [
     "bootstrap_space_owner",
     "build_response_signature",
     "build_sql_schema",
+    "bulk_create_invitations",
     "clear_auth_manager_cache",
     "compose_entry_markdown_from_chat",
     "compose_entry_markdown_from_fields",
@@ -193,6 +197,7 @@ __all__ = [
     "create_space",
     "create_sql",
     "create_sql_session",
+    "defer_audit_event",
     "delete_asset",
     "delete_entry",
     "delete_sql",
@@ -200,6 +205,7 @@ __all__ = [
     "export_authentication_overview",
     "extract_properties",
     "filter_readable_entries",
+    "flush_audit_events",
     "form_name_from_entry",
     "get_entry",
     "get_entry_history",
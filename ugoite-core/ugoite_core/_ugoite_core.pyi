@@ -1,4 +1,5 @@
 from collections.abc import Awaitable
+from typing import Any
 
 def list_workspaces(
     *args: object,
@@ -176,3 +177,35 @@ def auth_capabilities_snapshot_core(
     *args: object,
     **kwargs: object,
 ) -> dict[str, object]: ...
+def clear_auth_caches_core() -> None: ...
+def parse_user_groups_map_core(
+    raw: str | None = None,
+) -> dict[str, dict[str, list[str]]]: ...
+def match_service_api_key_secret(
+    secret: str,
+    candidates: list[tuple[str, str | None, str | None]],
+) -> int | None: ...
+
+class AuthConfig: ...
+
+def build_auth_config_core(
+    *args: object,
+    **kwargs: object,
+) -> AuthConfig: ...
+def authenticate_with_config_core(
+    *args: object,
+    **kwargs: object,
+) -> tuple[bool, tuple[Any, ...]]: ...
+def auth_config_has_api_keys_core(config: AuthConfig) -> bool: ...
+def append_audit_event_py(
+    *args: object,
+    **kwargs: object,
+) -> Awaitable[dict[str, object]]: ...
+def list_audit_events_py(
+    *args: object,
+    **kwargs: object,
+) -> Awaitable[dict[str, object]]: ...
+def patch_space_with_audit(
+    *args: object,
+    **kwargs: object,
+) -> Awaitable[dict[str, object]]: ...
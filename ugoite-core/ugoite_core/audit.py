@@ -2,17 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import os
 from dataclasses import dataclass
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from . import _ugoite_core as _core
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
 _DEFAULT_AUDIT_LIMIT = 100
 _DEFAULT_AUDIT_RETENTION = 5000
 _MAX_AUDIT_RETENTION = 50000
 _core_any = cast("Any", _core)
+_AUDIT_OUTCOMES = frozenset({"success", "deny", "error"})
+_MAX_DEFERRED_AUDIT_EVENTS = 10_000
+_deferred_appends: set[asyncio.Task[Any]] = set()
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -54,16 +64,13 @@ def _retention_limit() -> int:
 
 
 def _normalize_outcome(outcome: str) -> str:
+    if outcome in _AUDIT_OUTCOMES:
+        return outcome
     value = outcome.strip().lower()
-    return value if value in {"success", "deny", "error"} else "success"
+    return value if value in _AUDIT_OUTCOMES else "success"
 
 
-async def append_audit_event(
-    storage_config: dict[str, str],
-    space_id: str,
-    payload: AuditEventInput,
-) -> dict[str, Any]:
-    """Append a tamper-evident audit event to the space's JSONL audit log file."""
+def _event_payload(payload: AuditEventInput) -> dict[str, Any]:
     action = payload.action.strip()
     if not action:
         msg = "audit action must not be empty"
@@ -73,7 +80,7 @@ async def append_audit_event(
     if not actor_user_id:
         msg = "actor_user_id must not be empty"
         raise RuntimeError(msg)
-    event_payload = {
+    return {
         "action": action,
         "actor_user_id": actor_user_id,
         "outcome": _normalize_outcome(payload.outcome),
@@ -84,14 +91,95 @@ async def append_audit_event(
         "request_id": payload.request_id,
         "metadata": payload.metadata or {},
     }
+
+
+async def append_audit_event(
+    storage_config: dict[str, str],
+    space_id: str,
+    payload: AuditEventInput,
+) -> dict[str, Any]:
+    """Append a tamper-evident audit event to the space's JSONL audit log file."""
+    event = _event_payload(payload)
     return await _core_any.append_audit_event_py(
         storage_config,
         space_id,
-        json.dumps(event_payload, separators=(",", ":"), sort_keys=True),
-        _retention_limit(),
+        event["action"],
+        event["actor_user_id"],
+        event["outcome"],
+        target_type=event["target_type"],
+        target_id=event["target_id"],
+        request_method=event["request_method"],
+        request_path=event["request_path"],
+        request_id=event["request_id"],
+        metadata_json=(
+            json.dumps(event["metadata"], separators=(",", ":"))
+            if event["metadata"]
+            else None
+        ),
+        retention_limit=_retention_limit(),
     )
 
 
+async def patch_space_with_audit(
+    storage_config: dict[str, str],
+    space_id: str,
+    patch_json: str,
+    events: Sequence[AuditEventInput],
+) -> dict[str, Any]:
+    """Patch space metadata and append the events describing it in one call.
+
+    The patch is written before the events, and the events share one audit
+    log write.
+    """
+    events_json = json.dumps(
+        [_event_payload(event) for event in events],
+        separators=(",", ":"),
+    )
+    return await _core_any.patch_space_with_audit(
+        storage_config,
+        space_id,
+        patch_json,
+        events_json,
+        retention_limit=_retention_limit(),
+    )
+
+
+def _deferred_append_done(task: asyncio.Task[Any]) -> None:
+    _deferred_appends.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Deferred audit append failed", exc_info=task.exception())
+
+
+async def defer_audit_event(
+    storage_config: dict[str, str],
+    space_id: str,
+    payload: AuditEventInput,
+) -> None:
+    """Append an audit event in the background without waiting for the write.
+
+    The event is written shortly after this returns; readers going through
+    `list_audit_events` flush pending writes first. Events still pending when
+    the process dies are lost, so call `flush_audit_events` on shutdown. When
+    too many writes are pending, the event is written before returning.
+    """
+    _event_payload(payload)
+    if len(_deferred_appends) >= _MAX_DEFERRED_AUDIT_EVENTS:
+        await append_audit_event(storage_config, space_id, payload)
+        return
+    task = asyncio.get_running_loop().create_task(
+        append_audit_event(storage_config, space_id, payload),
+    )
+    _deferred_appends.add(task)
+    task.add_done_callback(_deferred_append_done)
+
+
+async def flush_audit_events() -> None:
+    """Wait for audit events deferred on the running event loop."""
+    loop = asyncio.get_running_loop()
+    while pending := [task for task in _deferred_appends if task.get_loop() is loop]:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 async def list_audit_events(
     storage_config: dict[str, str],
     space_id: str,
@@ -99,18 +187,13 @@ async def list_audit_events(
 ) -> dict[str, Any]:
     """List audit events with optional filters and pagination."""
     options = filters or AuditListFilter()
+    await flush_audit_events()
     return await _core_any.list_audit_events_py(
         storage_config,
         space_id,
-        json.dumps(
-            {
-                "offset": max(0, options.offset),
-                "limit": max(1, options.limit),
-                "action": options.action,
-                "actor_user_id": options.actor_user_id,
-                "outcome": options.outcome,
-            },
-            separators=(",", ":"),
-            sort_keys=True,
-        ),
+        offset=max(0, options.offset),
+        limit=max(1, options.limit),
+        action=options.action,
+        actor_user_id=options.actor_user_id,
+        outcome=options.outcome,
     )
@@ -12,10 +12,11 @@ import os
 import secrets
 import threading
 import time
-from dataclasses import dataclass
-from typing import Literal, NoReturn, cast
+from dataclasses import dataclass, field
+from typing import Literal, NoReturn
 
 from . import _ugoite_core as _core
+from .authz import _reload_defaults
 from .service_accounts import resolve_service_api_key
 
 DEFAULT_UNAUTHORIZED_STATUS_CODE = 401
@@ -43,34 +44,66 @@ def _raise_auth(code: str, detail: str) -> NoReturn:
     raise AuthError(code, detail)
 
 
+def _lowercase_headers(headers: dict[str, str]) -> dict[str, str]:
+    return {
+        key.lower(): value
+        for key, value in headers.items()
+        if isinstance(key, str) and isinstance(value, str)
+    }
+
+
 def _header_value(headers: dict[str, str] | object, name: str) -> str | None:
     if isinstance(headers, dict):
-        target = name.lower()
-        for key, value in headers.items():
-            if (
-                isinstance(key, str)
-                and key.lower() == target
-                and isinstance(value, str)
-            ):
-                return value
+        exact = headers.get(name)
+        if isinstance(exact, str):
+            return exact
+        return _lowercase_headers(headers).get(name.lower())
 
     getter = getattr(headers, "get", None)
     if getter is None:
         return None
-    for candidate in (name, name.lower(), name.upper()):
-        value = getter(candidate)
-        if isinstance(value, str):
-            return value
-    return None
+    value = getter(name)
+    if isinstance(value, str):
+        return value
+    lowered = name.lower()
+    if lowered == name:
+        return None
+    value = getter(lowered)
+    return value if isinstance(value, str) else None
 
 
-def _as_object_dict(value: object) -> dict[str, object] | None:
-    if not isinstance(value, dict):
-        return None
-    return {key: item for key, item in value.items() if isinstance(key, str)}
+def _credential_headers(
+    headers: dict[str, str] | object,
+) -> tuple[str | None, str | None]:
+    """Return `(authorization, x-api-key)` with at most one pass over a dict."""
+    if not isinstance(headers, dict):
+        return (
+            _header_value(headers, "authorization"),
+            _header_value(headers, "x-api-key"),
+        )
 
+    authorization = headers.get("authorization")
+    api_key = headers.get("x-api-key")
+    exact_authorization = isinstance(authorization, str)
+    exact_api_key = isinstance(api_key, str)
+    if exact_authorization and exact_api_key:
+        return authorization, api_key
+    if not exact_authorization:
+        authorization = None
+    if not exact_api_key:
+        api_key = None
+    for key, value in headers.items():
+        if not isinstance(key, str) or not isinstance(value, str):
+            continue
+        lowered = key.lower()
+        if lowered == "authorization" and not exact_authorization:
+            authorization = value
+        elif lowered == "x-api-key" and not exact_api_key:
+            api_key = value
+    return authorization, api_key
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class RequestIdentity:
     """Resolved request identity."""
 
@@ -102,16 +135,29 @@ class AuthError(Exception):
 
 @dataclass(frozen=True)
 class AuthManager:
-    """Thin manager delegating auth checks to rust core implementation."""
+    """Thin manager delegating auth checks to rust core implementation.
+
+    Credential settings are read from the environment and parsed by the rust
+    core once, when the manager is built; `get_auth_manager` rebuilds it after
+    the cache TTL or `clear_auth_manager_cache`.
+    """
 
     bootstrap_token: str | None
     bootstrap_user_id: str
+    core_config: _core.AuthConfig = field(repr=False, compare=False)
+    has_static_api_keys: bool = False
 
     def authenticate_headers(self, headers: dict[str, str] | object) -> RequestIdentity:
         """Resolve identity from request headers using rust-core auth logic."""
-        authorization = _header_value(headers, "authorization")
-        api_key = _header_value(headers, "x-api-key")
+        authorization, api_key = _credential_headers(headers)
+        return self.authenticate_credentials(authorization, api_key)
 
+    def authenticate_credentials(
+        self,
+        authorization: str | None,
+        api_key: str | None,
+    ) -> RequestIdentity:
+        """Resolve identity from already-extracted credential header values."""
         if authorization:
             parts = authorization.split(" ", 1)
             if len(parts) != AUTH_HEADER_PARTS or parts[0].lower() != "bearer":
@@ -120,73 +166,34 @@ class AuthManager:
                     "Authorization header must use Bearer scheme",
                 )
 
-        raw = _core.authenticate_headers_core(
+        ok, result = _core.authenticate_with_config_core(
+            self.core_config,
             authorization=authorization,
             api_key=api_key,
-            bearer_tokens_json=os.environ.get("UGOITE_AUTH_BEARER_TOKENS_JSON"),
-            api_keys_json=os.environ.get("UGOITE_AUTH_API_KEYS_JSON"),
-            bearer_secrets=os.environ.get("UGOITE_AUTH_BEARER_SECRETS"),
-            active_kids=os.environ.get("UGOITE_AUTH_BEARER_ACTIVE_KIDS"),
-            revoked_key_ids=os.environ.get("UGOITE_AUTH_REVOKED_KEY_IDS"),
-            bootstrap_token=self.bootstrap_token,
-            bootstrap_user_id=self.bootstrap_user_id,
-        )
-        payload = _as_object_dict(raw)
-        if payload is None or not isinstance(payload.get("ok"), bool):
-            _raise_auth("invalid_credentials", "Invalid authentication response")
-
-        if not payload["ok"]:
-            error = _as_object_dict(payload.get("error"))
-            if error is not None:
-                code = error.get("code")
-                detail = error.get("detail")
-                status_code = error.get("status_code")
-                raise AuthError(
-                    code if isinstance(code, str) else "invalid_credentials",
-                    detail if isinstance(detail, str) else "Authentication failed",
-                    int(status_code)
-                    if isinstance(status_code, int)
-                    else DEFAULT_UNAUTHORIZED_STATUS_CODE,
-                )
-            _raise_auth("invalid_credentials", "Authentication failed")
-
-        identity = _as_object_dict(payload.get("identity"))
-        if identity is None:
-            _raise_auth("invalid_credentials", "Missing identity payload")
-
-        user_id = identity.get("user_id")
-        auth_method_obj = identity.get("auth_method")
-        principal_type_obj = identity.get("principal_type", "user")
-
-        if not isinstance(user_id, str) or not user_id:
-            _raise_auth("invalid_credentials", "Invalid identity user_id")
-        if auth_method_obj not in {"bearer", "api_key"}:
-            _raise_auth("invalid_credentials", "Invalid identity auth_method")
-        if principal_type_obj not in {"user", "service"}:
-            _raise_auth("invalid_credentials", "Invalid identity principal_type")
-
-        scopes_obj = identity.get("scopes")
-        scopes = (
-            frozenset(scope for scope in scopes_obj if isinstance(scope, str) and scope)
-            if isinstance(scopes_obj, list)
-            else frozenset()
         )
-
-        display_name = identity.get("display_name")
-        key_id = identity.get("key_id")
-        service_account_id = identity.get("service_account_id")
-
+        if not ok:
+            code, detail, status_code = result
+            raise AuthError(code, detail, status_code)
+
+        (
+            user_id,
+            auth_method,
+            principal_type,
+            display_name,
+            key_id,
+            scopes,
+            scope_enforced,
+            service_account_id,
+        ) = result
         return RequestIdentity(
             user_id=user_id,
-            principal_type=cast("Literal['user', 'service']", principal_type_obj),
-            display_name=display_name if isinstance(display_name, str) else None,
-            auth_method=cast("Literal['bearer', 'api_key']", auth_method_obj),
-            key_id=key_id if isinstance(key_id, str) else None,
-            scopes=scopes,
-            scope_enforced=bool(identity.get("scope_enforced", False)),
-            service_account_id=(
-                service_account_id if isinstance(service_account_id, str) else None
-            ),
+            principal_type=principal_type,
+            display_name=display_name,
+            auth_method=auth_method,
+            key_id=key_id,
+            scopes=frozenset(scopes),
+            scope_enforced=scope_enforced,
+            service_account_id=service_account_id,
         )
 
 
@@ -212,8 +219,8 @@ def _has_configured_bearer_credentials() -> bool:
     return isinstance(bearer_secrets, str) and bool(bearer_secrets.strip())
 
 
-def _base64url_encode(data: bytes) -> str:
-    return base64.urlsafe_b64encode(data).decode("utf-8").rstrip("=")
+def _base64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
 
 
 def _totp_counter(timestamp: int, *, step_seconds: int) -> int:
@@ -221,11 +228,7 @@ def _totp_counter(timestamp: int, *, step_seconds: int) -> int:
 
 
 def _hotp_value(secret: bytes, counter: int, *, digits: int) -> str:
-    digest = hmac.new(
-        secret,
-        counter.to_bytes(8, "big"),
-        hashlib.sha1,
-    ).digest()
+    digest = hmac.digest(secret, counter.to_bytes(8, "big"), "sha1")
     offset = digest[-1] & 0x0F
     binary = int.from_bytes(digest[offset : offset + 4], "big") & 0x7FFFFFFF
     return f"{binary % (10**digits):0{digits}d}"
@@ -321,16 +324,14 @@ def mint_signed_bearer_token(
     payload_segment = _base64url_encode(
         json.dumps(payload, separators=(",", ":")).encode("utf-8"),
     )
-    signature = hmac.new(
-        secret.encode("utf-8"),
-        payload_segment.encode("utf-8"),
-        hashlib.sha256,
-    ).digest()
-    return (
-        f"{DEFAULT_SIGNED_BEARER_VERSION}."
-        f"{payload_segment}."
-        f"{_base64url_encode(signature)}"
-    )
+    signature = hmac.digest(secret.encode("utf-8"), payload_segment, "sha256")
+    return b".".join(
+        (
+            DEFAULT_SIGNED_BEARER_VERSION.encode("ascii"),
+            payload_segment,
+            _base64url_encode(signature),
+        ),
+    ).decode("ascii")
 
 
 def _build_auth_manager() -> AuthManager:
@@ -353,9 +354,21 @@ def _build_auth_manager() -> AuthManager:
                 )
             bootstrap_token = _AUTH_MANAGER_CACHE.generated_bootstrap_token
 
+    bootstrap_user_id = os.environ.get("UGOITE_BOOTSTRAP_USER_ID", "bootstrap-user")
+    core_config = _core.build_auth_config_core(
+        bearer_tokens_json=os.environ.get("UGOITE_AUTH_BEARER_TOKENS_JSON"),
+        api_keys_json=os.environ.get("UGOITE_AUTH_API_KEYS_JSON"),
+        bearer_secrets=os.environ.get("UGOITE_AUTH_BEARER_SECRETS"),
+        active_kids=os.environ.get("UGOITE_AUTH_BEARER_ACTIVE_KIDS"),
+        revoked_key_ids=os.environ.get("UGOITE_AUTH_REVOKED_KEY_IDS"),
+        bootstrap_token=bootstrap_token,
+        bootstrap_user_id=bootstrap_user_id,
+    )
     return AuthManager(
         bootstrap_token=bootstrap_token,
-        bootstrap_user_id=os.environ.get("UGOITE_BOOTSTRAP_USER_ID", "bootstrap-user"),
+        bootstrap_user_id=bootstrap_user_id,
+        core_config=core_config,
+        has_static_api_keys=_core.auth_config_has_api_keys_core(core_config),
     )
 
 
@@ -366,12 +379,14 @@ def get_auth_manager() -> AuthManager:
         cache_entry = _AUTH_MANAGER_CACHE.entry
         if cache_entry is None:
             manager = _build_auth_manager()
+            _reload_defaults()
             _AUTH_MANAGER_CACHE.entry = (now, manager)
             return manager
 
         cached_at, manager = cache_entry
         if now - cached_at >= AUTH_MANAGER_TTL_SECONDS:
             manager = _build_auth_manager()
+            _reload_defaults()
             _AUTH_MANAGER_CACHE.entry = (now, manager)
         return manager
 
@@ -382,6 +397,8 @@ def clear_auth_manager_cache() -> None:
         _AUTH_MANAGER_CACHE.entry = None
         _AUTH_MANAGER_CACHE.generated_bootstrap_token = None
     _LAST_ACCEPTED_TOTP_COUNTERS.clear()
+    _reload_defaults()
+    _core.clear_auth_caches_core()
 
 
 def authenticate_headers(headers: dict[str, str] | object) -> RequestIdentity:
@@ -399,19 +416,19 @@ async def authenticate_headers_for_space(
     request_id: str | None = None,
 ) -> RequestIdentity:
     """Resolve identity with support for space-scoped service-account API keys."""
-    authorization = _header_value(headers, "authorization")
-    if authorization:
-        return authenticate_headers(headers)
-
-    api_key = _header_value(headers, "x-api-key")
-    if not api_key:
-        return authenticate_headers(headers)
-
-    try:
-        return get_auth_manager().authenticate_headers(headers)
-    except AuthError as exc:
-        if exc.code != "invalid_credentials":
-            raise
+    authorization, api_key = _credential_headers(headers)
+    manager = get_auth_manager()
+    if authorization or not api_key:
+        return manager.authenticate_credentials(authorization, api_key)
+
+    # Without static API keys the global lookup can only fail, so go straight
+    # to the space's service-account keys.
+    if manager.has_static_api_keys or not api_key.strip():
+        try:
+            return manager.authenticate_credentials(authorization, api_key)
+        except AuthError as exc:
+            if exc.code != "invalid_credentials":
+                raise
 
     try:
         resolved = await resolve_service_api_key(
@@ -451,16 +468,16 @@ def export_authentication_overview() -> dict[str, object]:
         active_kids=os.environ.get("UGOITE_AUTH_BEARER_ACTIVE_KIDS"),
         revoked_key_ids=os.environ.get("UGOITE_AUTH_REVOKED_KEY_IDS"),
     )
-    payload = _as_object_dict(snapshot)
-    if payload is None:
+    # The core builds a fresh dict per call, so it can be amended in place.
+    if not isinstance(snapshot, dict):
         return {}
-    payload["channels"] = [
+    snapshot["channels"] = [
         "backend(rest)",
         "backend(mcp)",
         "cli(via backend)",
         "frontend(via backend)",
     ]
-    return payload
+    return snapshot
 
 
 def auth_headers_from_environment() -> dict[str, str]:
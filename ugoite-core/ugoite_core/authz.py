@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
 import os
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Literal, NoReturn, cast
+from functools import lru_cache, reduce
+from operator import or_
+from typing import TYPE_CHECKING, Any, Literal, NoReturn, cast, get_args
 
 from . import _ugoite_core as _core
 from .membership import admin_space_id
@@ -15,6 +18,9 @@ if TYPE_CHECKING:
 
 _core_any = cast("Any", _core)
 
+# Form ACL principals split into (user ids, group ids) for set lookups.
+_PrincipalIndex = tuple[frozenset[str], frozenset[str]]
+
 RoleName = Literal["owner", "admin", "editor", "viewer", "service"]
 ActionName = Literal[
     "space_list",
@@ -30,77 +36,111 @@ ActionName = Literal[
     "sql_write",
 ]
 
-_VALID_ROLES: set[str] = {"owner", "admin", "editor", "viewer", "service"}
+# Maps each valid role string to its canonical `RoleName`.
+_ROLE_TABLE: dict[str, RoleName] = {role: role for role in get_args(RoleName)}
+# Roles that bypass Form ACLs.
+_ADMIN_ROLES: frozenset[RoleName] = frozenset({"owner", "admin"})
+_MEMBERSHIP_KEYS = ("members", "member_roles", "owner_user_id", "admin_user_ids")
 
-_ROLE_PERMISSIONS: dict[RoleName, set[ActionName]] = {
-    "owner": {
-        "space_list",
-        "space_read",
-        "space_admin",
-        "entry_read",
-        "entry_write",
-        "form_read",
-        "form_write",
-        "asset_read",
-        "asset_write",
-        "sql_read",
-        "sql_write",
-    },
-    "admin": {
-        "space_list",
-        "space_read",
-        "space_admin",
-        "entry_read",
-        "entry_write",
-        "form_read",
-        "form_write",
-        "asset_read",
-        "asset_write",
-        "sql_read",
-        "sql_write",
-    },
-    "editor": {
-        "space_list",
-        "space_read",
-        "entry_read",
-        "entry_write",
-        "form_read",
-        "form_write",
-        "asset_read",
-        "asset_write",
-        "sql_read",
-        "sql_write",
-    },
-    "viewer": {
-        "space_list",
-        "space_read",
-        "entry_read",
-        "form_read",
-        "asset_read",
-        "sql_read",
-    },
-    "service": {
-        "space_list",
-        "space_read",
-        "entry_read",
-        "entry_write",
-        "form_read",
-        "asset_read",
-        "asset_write",
-        "sql_read",
-        "sql_write",
-    },
+_ROLE_PERMISSIONS: dict[RoleName, frozenset[ActionName]] = {
+    "owner": frozenset(
+        {
+            "space_list",
+            "space_read",
+            "space_admin",
+            "entry_read",
+            "entry_write",
+            "form_read",
+            "form_write",
+            "asset_read",
+            "asset_write",
+            "sql_read",
+            "sql_write",
+        },
+    ),
+    "admin": frozenset(
+        {
+            "space_list",
+            "space_read",
+            "space_admin",
+            "entry_read",
+            "entry_write",
+            "form_read",
+            "form_write",
+            "asset_read",
+            "asset_write",
+            "sql_read",
+            "sql_write",
+        },
+    ),
+    "editor": frozenset(
+        {
+            "space_list",
+            "space_read",
+            "entry_read",
+            "entry_write",
+            "form_read",
+            "form_write",
+            "asset_read",
+            "asset_write",
+            "sql_read",
+            "sql_write",
+        },
+    ),
+    "viewer": frozenset(
+        {
+            "space_list",
+            "space_read",
+            "entry_read",
+            "form_read",
+            "asset_read",
+            "sql_read",
+        },
+    ),
+    "service": frozenset(
+        {
+            "space_list",
+            "space_read",
+            "entry_read",
+            "entry_write",
+            "form_read",
+            "asset_read",
+            "asset_write",
+            "sql_read",
+            "sql_write",
+        },
+    ),
+}
+_NO_PERMISSIONS: frozenset[ActionName] = frozenset()
+
+# Permission checks test one bit per action against a precomputed role mask.
+_ACTION_BITS: dict[ActionName, int] = {
+    action: 1 << index for index, action in enumerate(get_args(ActionName))
+}
+_ROLE_MASKS: dict[RoleName, int] = {
+    role: reduce(or_, (_ACTION_BITS[action] for action in actions), 0)
+    for role, actions in _ROLE_PERMISSIONS.items()
 }
 
 
-@dataclass(frozen=True)
 class AuthorizationError(Exception):
     """Raised when an authenticated principal is not authorized."""
 
-    code: str
-    detail: str
-    action: ActionName
-    status_code: int = 403
+    __slots__ = ("action", "code", "detail", "status_code")
+
+    def __init__(
+        self,
+        code: str,
+        detail: str,
+        action: ActionName,
+        status_code: int = 403,
+    ) -> None:
+        """Create an authorization error for `action` with HTTP status."""
+        super().__init__(detail)
+        self.code = code
+        self.detail = detail
+        self.action = action
+        self.status_code = status_code
 
 
 @dataclass(frozen=True)
@@ -112,138 +152,166 @@ class AccessContext:
     role: RoleName
     groups: frozenset[str]
     form_acls: dict[str, dict[str, Any]]
+    permission_mask: int = 0
+    is_admin_like: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class _SpaceMeta:
+    """Authorization-relevant space metadata, type-checked once per resolve.
+
+    Tables that may appear both on the space and under `settings` are kept
+    as tuples in precedence order (space first), with empty tables dropped.
+    """
+
+    members: tuple[dict[str, Any], ...]
+    member_roles: tuple[dict[str, Any], ...]
+    owner_user_id: str | None
+    admin_user_ids: frozenset[str]
+    user_groups: tuple[dict[str, Any], ...]
+    form_acls: dict[str, dict[str, Any]]
+    membership_configured: bool
+
+
+def _role_name(raw: object) -> RoleName | None:
+    return _ROLE_TABLE.get(raw) if isinstance(raw, str) else None
 
 
 def _normalized_role(raw: object, fallback: RoleName) -> RoleName:
-    if isinstance(raw, str) and raw in _VALID_ROLES:
-        return cast("RoleName", raw)
-    return fallback
+    return _role_name(raw) or fallback
+
+
+def _read_default_roles() -> tuple[RoleName, RoleName]:
+    return (
+        _normalized_role(os.environ.get("UGOITE_AUTHZ_DEFAULT_USER_ROLE"), "editor"),
+        _normalized_role(
+            os.environ.get("UGOITE_AUTHZ_DEFAULT_SERVICE_ROLE"),
+            "service",
+        ),
+    )
+
+
+# Read at import and again whenever the auth manager is rebuilt or its
+# cache is cleared, so edits follow the rest of the auth env config.
+_DEFAULT_USER_ROLE, _DEFAULT_SERVICE_ROLE = _read_default_roles()
+
+
+def _reload_defaults() -> None:
+    global _DEFAULT_USER_ROLE, _DEFAULT_SERVICE_ROLE
+    _DEFAULT_USER_ROLE, _DEFAULT_SERVICE_ROLE = _read_default_roles()
 
 
 def _default_user_role() -> RoleName:
-    return _normalized_role(os.environ.get("UGOITE_AUTHZ_DEFAULT_USER_ROLE"), "editor")
+    return _DEFAULT_USER_ROLE
 
 
 def _default_service_role() -> RoleName:
-    return _normalized_role(
-        os.environ.get("UGOITE_AUTHZ_DEFAULT_SERVICE_ROLE"),
-        "service",
-    )
+    return _DEFAULT_SERVICE_ROLE
 
 
-def _permissions_for_role(role: RoleName) -> set[ActionName]:
-    return _ROLE_PERMISSIONS.get(role, set())
+def _permissions_for_role(role: RoleName) -> frozenset[ActionName]:
+    return _ROLE_PERMISSIONS.get(role, _NO_PERMISSIONS)
 
 
+@lru_cache(maxsize=4)
 def _parse_groups_map(raw: str | None) -> dict[str, dict[str, list[str]]]:
+    # Keyed on the raw env value, so edits are picked up on the next call.
+    # Callers share the cached result and must treat it as read-only.
     if not raw:
         return {}
-    try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
-        return {}
-    if not isinstance(data, dict):
-        return {}
-
-    result: dict[str, dict[str, list[str]]] = {}
-    for space_id, users in data.items():
-        if not isinstance(space_id, str) or not isinstance(users, dict):
-            continue
-        normalized_users: dict[str, list[str]] = {}
-        for user_id, groups in users.items():
-            if not isinstance(user_id, str) or not isinstance(groups, list):
-                continue
-            normalized = [item for item in groups if isinstance(item, str) and item]
-            if normalized:
-                normalized_users[user_id] = normalized
-        if normalized_users:
-            result[space_id] = normalized_users
-    return result
+    return _core.parse_user_groups_map_core(raw)
 
 
 def _groups_from_space_meta(
     space_id: str,
     user_id: str,
-    space_meta: dict[str, Any],
+    meta: _SpaceMeta,
 ) -> frozenset[str]:
     groups: set[str] = set()
-    settings = space_meta.get("settings")
-    settings_map = settings if isinstance(settings, dict) else {}
-
-    user_groups = space_meta.get("user_groups")
-    if isinstance(user_groups, dict):
+    for user_groups in meta.user_groups:
         values = user_groups.get(user_id)
-        if isinstance(values, list):
-            groups.update(item for item in values if isinstance(item, str) and item)
-    settings_groups = settings_map.get("user_groups")
-    if isinstance(settings_groups, dict):
-        values = settings_groups.get(user_id)
-        if isinstance(values, list):
-            groups.update(item for item in values if isinstance(item, str) and item)
+        if type(values) is list:
+            groups.update(item for item in values if type(item) is str and item)
 
     configured = _parse_groups_map(os.environ.get("UGOITE_AUTHZ_USER_GROUPS_JSON"))
     groups.update(configured.get(space_id, {}).get(user_id, []))
     return frozenset(groups)
 
 
-def _resolve_role(
-    space_meta: dict[str, Any],
-    identity: RequestIdentity,
-) -> RoleName | None:
-    settings = space_meta.get("settings")
-    settings_map = settings if isinstance(settings, dict) else {}
+def _as_dict(value: object) -> dict[str, Any]:
+    return value if isinstance(value, dict) else {}
 
-    if identity.principal_type == "service":
-        return _default_service_role()
 
-    membership_configured = any(
-        key in space_meta or key in settings_map
-        for key in ("members", "member_roles", "owner_user_id", "admin_user_ids")
+def _tables(
+    space_meta: dict[str, Any],
+    settings: dict[str, Any],
+    key: str,
+) -> tuple[dict[str, Any], ...]:
+    return tuple(
+        table
+        for table in (_as_dict(space_meta.get(key)), _as_dict(settings.get(key)))
+        if table
     )
 
-    members = space_meta.get("members")
-    if isinstance(members, dict):
-        member = members.get(identity.user_id)
-        if isinstance(member, dict):
-            state = member.get("state")
-            role = member.get("role")
-            if state == "active" and isinstance(role, str) and role in _VALID_ROLES:
-                return cast("RoleName", role)
-
-    settings_members = settings_map.get("members")
-    if isinstance(settings_members, dict):
-        member = settings_members.get(identity.user_id)
-        if isinstance(member, dict):
-            state = member.get("state")
-            role = member.get("role")
-            if state == "active" and isinstance(role, str) and role in _VALID_ROLES:
-                return cast("RoleName", role)
-
-    member_roles = space_meta.get("member_roles")
-    if isinstance(member_roles, dict):
-        explicit = member_roles.get(identity.user_id)
-        if isinstance(explicit, str) and explicit in _VALID_ROLES:
-            return cast("RoleName", explicit)
-
-    settings_roles = settings_map.get("member_roles")
-    if isinstance(settings_roles, dict):
-        explicit = settings_roles.get(identity.user_id)
-        if isinstance(explicit, str) and explicit in _VALID_ROLES:
-            return cast("RoleName", explicit)
+
+def _normalize_space_meta(space_meta: dict[str, Any]) -> _SpaceMeta:
+    settings = _as_dict(space_meta.get("settings"))
 
     owner_user_id = space_meta.get("owner_user_id")
     if not isinstance(owner_user_id, str):
-        owner_user_id = settings_map.get("owner_user_id")
-    if isinstance(owner_user_id, str) and owner_user_id == identity.user_id:
-        return "owner"
-
+        owner_user_id = settings.get("owner_user_id")
     admin_user_ids = space_meta.get("admin_user_ids")
     if not isinstance(admin_user_ids, list):
-        admin_user_ids = settings_map.get("admin_user_ids")
-    if isinstance(admin_user_ids, list) and identity.user_id in admin_user_ids:
+        admin_user_ids = settings.get("admin_user_ids")
+    admin_ids = (
+        frozenset(item for item in admin_user_ids if isinstance(item, str))
+        if isinstance(admin_user_ids, list)
+        else frozenset()
+    )
+
+    return _SpaceMeta(
+        members=_tables(space_meta, settings, "members"),
+        member_roles=_tables(space_meta, settings, "member_roles"),
+        owner_user_id=owner_user_id if isinstance(owner_user_id, str) else None,
+        admin_user_ids=admin_ids,
+        user_groups=_tables(space_meta, settings, "user_groups"),
+        form_acls={
+            key: value
+            for key, value in _as_dict(settings.get("form_acls")).items()
+            if isinstance(key, str) and isinstance(value, dict)
+        },
+        membership_configured=any(
+            key in space_meta or key in settings for key in _MEMBERSHIP_KEYS
+        ),
+    )
+
+
+def _resolve_role(
+    meta: _SpaceMeta,
+    identity: RequestIdentity,
+) -> RoleName | None:
+    if identity.principal_type == "service":
+        return _default_service_role()
+
+    user_id = identity.user_id
+    for members in meta.members:
+        member = members.get(user_id)
+        if isinstance(member, dict) and member.get("state") == "active":
+            role = _role_name(member.get("role"))
+            if role:
+                return role
+
+    for member_roles in meta.member_roles:
+        role = _role_name(member_roles.get(user_id))
+        if role:
+            return role
+
+    if meta.owner_user_id == user_id:
+        return "owner"
+    if user_id in meta.admin_user_ids:
         return "admin"
 
-    if membership_configured:
+    if meta.membership_configured:
         return None
 
     return _default_user_role()
@@ -256,8 +324,8 @@ async def resolve_access_context(
 ) -> AccessContext:
     """Resolve role/group context for a principal in a space."""
     space_meta_obj = await _core_any.get_space(storage_config, space_id)
-    space_meta = cast("dict[str, Any]", space_meta_obj)
-    role = _resolve_role(space_meta, identity)
+    meta = _normalize_space_meta(cast("dict[str, Any]", space_meta_obj))
+    role = _resolve_role(meta, identity)
     if role is None:
         _deny(
             "space_read",
@@ -266,22 +334,14 @@ async def resolve_access_context(
                 f"of space '{space_id}'."
             ),
         )
-    groups = _groups_from_space_meta(space_id, identity.user_id, space_meta)
-    settings = space_meta.get("settings")
-    settings_map = settings if isinstance(settings, dict) else {}
-    form_acls_obj = settings_map.get("form_acls")
-    form_acls = form_acls_obj if isinstance(form_acls_obj, dict) else {}
-
     return AccessContext(
         space_id=space_id,
         user_id=identity.user_id,
         role=role,
-        groups=groups,
-        form_acls={
-            key: value
-            for key, value in form_acls.items()
-            if isinstance(key, str) and isinstance(value, dict)
-        },
+        groups=_groups_from_space_meta(space_id, identity.user_id, meta),
+        form_acls=meta.form_acls,
+        permission_mask=_ROLE_MASKS.get(role, 0),
+        is_admin_like=role in _ADMIN_ROLES,
     )
 
 
@@ -293,30 +353,55 @@ def _deny(action: ActionName, detail: str) -> NoReturn:
     )
 
 
-async def require_space_action(
-    storage_config: dict[str, str],
-    space_id: str,
+def _role_permits(access: AccessContext, action: ActionName) -> bool:
+    return bool(access.permission_mask & _ACTION_BITS[action])
+
+
+def _scope_permits(identity: RequestIdentity, action: ActionName) -> bool:
+    return not identity.scope_enforced or action in identity.scopes
+
+
+def _space_action_permits(
+    access: AccessContext,
     identity: RequestIdentity,
     action: ActionName,
-) -> AccessContext:
-    """Require role-based permission for a space-scoped action."""
-    access = await resolve_access_context(storage_config, space_id, identity)
-    if action not in _permissions_for_role(access.role):
+) -> bool:
+    return _role_permits(access, action) and _scope_permits(identity, action)
+
+
+def _check_space_action(
+    access: AccessContext,
+    identity: RequestIdentity,
+    action: ActionName,
+) -> None:
+    if not _role_permits(access, action):
         _deny(
             action,
             (
                 f"Principal '{identity.user_id}' with role '{access.role}' "
-                f"is not allowed to perform '{action}' in space '{space_id}'."
+                f"is not allowed to perform '{action}' in space "
+                f"'{access.space_id}'."
             ),
         )
-    if identity.scope_enforced and action not in identity.scopes:
+    if not _scope_permits(identity, action):
         _deny(
             action,
             (
                 f"Principal '{identity.user_id}' is missing required scope "
-                f"'{action}' in space '{space_id}'."
+                f"'{action}' in space '{access.space_id}'."
             ),
         )
+
+
+async def require_space_action(
+    storage_config: dict[str, str],
+    space_id: str,
+    identity: RequestIdentity,
+    action: ActionName,
+) -> AccessContext:
+    """Require role-based permission for a space-scoped action."""
+    access = await resolve_access_context(storage_config, space_id, identity)
+    _check_space_action(access, identity, action)
     return access
 
 
@@ -357,7 +442,15 @@ async def require_space_creation_permission(
         raise
 
 
-def _form_name_from_markdown(markdown: str) -> str | None:
+# Form names extracted from markdown bodies, most recently used last. Bodies
+# up to _FORM_NAME_CACHE_INLINE_LIMIT characters are their own key; longer
+# ones are keyed by length and BLAKE2b digest so the cache does not pin them.
+_form_names: OrderedDict[str | tuple[int, bytes], str | None] = OrderedDict()
+_FORM_NAME_CACHE_CAPACITY = 256
+_FORM_NAME_CACHE_INLINE_LIMIT = 1024
+
+
+def _extract_form_name(markdown: str) -> str | None:
     extracted = _core_any.extract_properties(markdown)
     if isinstance(extracted, dict):
         raw = extracted.get("form")
@@ -366,6 +459,28 @@ def _form_name_from_markdown(markdown: str) -> str | None:
     return None
 
 
+def _form_name_from_markdown(markdown: str) -> str | None:
+    # A `form` property comes from front matter at the very start of the
+    # body or from a `## form` section; without either there is nothing to
+    # extract, so skip the parser.
+    if not markdown.startswith("---") and "form" not in markdown:
+        return None
+    # Extraction is pure, and the same body is often authorized more than
+    # once in a request (write check, then listing), so reuse the result.
+    cache_key: str | tuple[int, bytes] = markdown
+    if len(markdown) > _FORM_NAME_CACHE_INLINE_LIMIT:
+        digest = hashlib.blake2b(markdown.encode(), digest_size=16).digest()
+        cache_key = (len(markdown), digest)
+    if cache_key in _form_names:
+        _form_names.move_to_end(cache_key)
+        return _form_names[cache_key]
+    form_name = _extract_form_name(markdown)
+    _form_names[cache_key] = form_name
+    while len(_form_names) > _FORM_NAME_CACHE_CAPACITY:
+        _form_names.popitem(last=False)
+    return form_name
+
+
 def form_name_from_entry(entry: dict[str, Any]) -> str | None:
     """Resolve form name from an entry payload."""
     form = entry.get("form")
@@ -389,53 +504,76 @@ def form_name_from_entry(entry: dict[str, Any]) -> str | None:
     return None
 
 
-def _principal_matches(
-    principal: dict[str, Any],
+def _index_principals(principals: list[Any]) -> _PrincipalIndex:
+    user_ids: set[str] = set()
+    group_ids: set[str] = set()
+    for principal in principals:
+        if type(principal) is not dict:
+            continue
+        kind = principal.get("kind")
+        principal_id = principal.get("id")
+        if type(principal_id) is not str:
+            continue
+        if kind == "user":
+            user_ids.add(principal_id)
+        elif kind == "user_group":
+            group_ids.add(principal_id)
+    return frozenset(user_ids), frozenset(group_ids)
+
+
+def _form_acl_permits(
+    principals: object,
     identity: RequestIdentity,
-    groups: frozenset[str],
+    access: AccessContext,
 ) -> bool:
-    kind = principal.get("kind")
-    principal_id = principal.get("id")
-    if not isinstance(kind, str) or not isinstance(principal_id, str):
-        return False
-
-    if kind == "user":
-        return principal_id == identity.user_id
-    if kind == "user_group":
-        return principal_id in groups
-    return False
+    if principals is None:
+        return True
+    if access.is_admin_like:
+        return True
+    if not isinstance(principals, list):
+        return True
+    user_ids, group_ids = _index_principals(principals)
+    return identity.user_id in user_ids or not access.groups.isdisjoint(group_ids)
 
 
 def _check_form_acl(
-    form_def: dict[str, Any],
-    acl_field: str,
+    principals: object,
     identity: RequestIdentity,
     access: AccessContext,
     action: ActionName,
+    *,
+    form_name: str,
+    acl_field: str,
 ) -> None:
-    principals = form_def.get(acl_field)
-    if principals is None:
-        return
-    if access.role in {"owner", "admin"}:
-        return
-    if not isinstance(principals, list):
+    if _form_acl_permits(principals, identity, access):
         return
-    for principal in principals:
-        if isinstance(principal, dict) and _principal_matches(
-            principal,
-            identity,
-            access.groups,
-        ):
-            return
     _deny(
         action,
         (
             f"Principal '{identity.user_id}' is not allowed by '{acl_field}' "
-            f"for form '{form_def.get('name', '<unknown>')}'."
+            f"for form '{form_name}'."
         ),
     )
 
 
+async def _form_principals(
+    storage_config: dict[str, str],
+    access: AccessContext,
+    form_name: str,
+    acl_field: str,
+) -> object:
+    form_def_obj = await _core_any.get_form(
+        storage_config,
+        access.space_id,
+        form_name,
+    )
+    form_def = cast("dict[str, Any]", form_def_obj)
+    if acl_field in form_def:
+        return form_def[acl_field]
+    acl = access.form_acls.get(form_name)
+    return acl.get(acl_field) if acl is not None else None
+
+
 async def require_form_read(
     storage_config: dict[str, str],
     space_id: str,
@@ -444,20 +582,19 @@ async def require_form_read(
 ) -> AccessContext:
     """Require read access to a form using role + ACL checks."""
     access = await require_space_action(storage_config, space_id, identity, "form_read")
-    form_def_obj = await _core_any.get_form(storage_config, space_id, form_name)
-    form_def = cast("dict[str, Any]", form_def_obj)
-    effective_form = dict(form_def)
-    effective_form.setdefault("name", form_name)
-    if "read_principals" not in effective_form:
-        acl = access.form_acls.get(form_name)
-        if isinstance(acl, dict) and "read_principals" in acl:
-            effective_form["read_principals"] = acl.get("read_principals")
-    _check_form_acl(
-        effective_form,
+    principals = await _form_principals(
+        storage_config,
+        access,
+        form_name,
         "read_principals",
+    )
+    _check_form_acl(
+        principals,
         identity,
         access,
         "form_read",
+        form_name=form_name,
+        acl_field="read_principals",
     )
     return access
 
@@ -475,20 +612,19 @@ async def require_form_write(
         identity,
         "entry_write",
     )
-    form_def_obj = await _core_any.get_form(storage_config, space_id, form_name)
-    form_def = cast("dict[str, Any]", form_def_obj)
-    effective_form = dict(form_def)
-    effective_form.setdefault("name", form_name)
-    if "write_principals" not in effective_form:
-        acl = access.form_acls.get(form_name)
-        if isinstance(acl, dict) and "write_principals" in acl:
-            effective_form["write_principals"] = acl.get("write_principals")
-    _check_form_acl(
-        effective_form,
+    principals = await _form_principals(
+        storage_config,
+        access,
+        form_name,
         "write_principals",
+    )
+    _check_form_acl(
+        principals,
         identity,
         access,
         "entry_write",
+        form_name=form_name,
+        acl_field="write_principals",
     )
     return access
 
@@ -579,13 +715,42 @@ async def filter_readable_entries(
     entries: list[dict[str, Any]],
 ) -> list[dict[str, Any]]:
     """Filter entries by read authorization (deny-by-default on ACL mismatch)."""
+    if not entries:
+        return []
+    # Role and groups are the same for every entry, so resolve them once.
+    try:
+        access = await resolve_access_context(storage_config, space_id, identity)
+    except AuthorizationError:
+        return []
+
+    # Space-level permissions are fixed for the call, and the ACL decision
+    # only depends on the form, so each distinct form is fetched and checked
+    # once; `None` keys entries without a form.
+    form_readable = _space_action_permits(access, identity, "form_read")
+    decisions: dict[str | None, bool] = {
+        None: _space_action_permits(access, identity, "entry_read"),
+    }
+    if not form_readable and not decisions[None]:
+        return []
+
     filtered: list[dict[str, Any]] = []
     for entry in entries:
-        try:
-            await require_entry_read(storage_config, space_id, identity, entry)
-        except AuthorizationError:
-            continue
-        filtered.append(entry)
+        form_name = form_name_from_entry(entry)
+        readable = decisions.get(form_name)
+        if readable is None and form_name:
+            readable = form_readable and _form_acl_permits(
+                await _form_principals(
+                    storage_config,
+                    access,
+                    form_name,
+                    "read_principals",
+                ),
+                identity,
+                access,
+            )
+            decisions[form_name] = readable
+        if readable:
+            filtered.append(entry)
     return filtered
 
 
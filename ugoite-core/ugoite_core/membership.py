@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import hashlib
 import json
 import os
 import secrets
+import weakref
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from operator import itemgetter
 from typing import Any, Protocol, cast
 
 from . import _ugoite_core as _core
@@ -17,12 +20,49 @@ _core_any = cast("Any", _core)
 
 MemberRole = str
 MemberState = str
-_VALID_MEMBER_ROLES: set[str] = {"owner", "admin", "editor", "viewer"}
-_MUTABLE_MEMBER_ROLES: set[str] = {"admin", "editor", "viewer"}
+_VALID_MEMBER_ROLES: frozenset[str] = frozenset({"owner", "admin", "editor", "viewer"})
+_MUTABLE_MEMBER_ROLES: frozenset[str] = frozenset({"admin", "editor", "viewer"})
 _DEFAULT_ADMIN_SPACE_ID = "admin-space"
-
-_space_locks: dict[str, asyncio.Lock] = {}
-_space_locks_guard = asyncio.Lock()
+# Member plus invitation count above which settings patches are built off the
+# event loop; below it the thread hand-off costs more than it saves.
+_OFFLOAD_ENTRIES = 512
+# Settings keys written by membership mutations.
+_MEMBERSHIP_SETTINGS_KEYS = (
+    "admin_user_ids",
+    "invitations",
+    "invitations_by_token_hash",
+    "member_roles",
+    "members",
+    "membership_maps_version",
+    "membership_version",
+    "owner_user_id",
+    "pending_invitations_by_user",
+)
+# Key layout of a member record. Copying it and filling the slots is cheaper
+# than building the literal; it is never mutated itself.
+_MEMBER_RECORD_TEMPLATE: dict[str, Any] = {
+    "user_id": None,
+    "role": None,
+    "state": None,
+    "invited_by": None,
+    "invited_at": None,
+    "revoked_at": None,
+}
+# Invitation token hash fields, current format first.
+_TOKEN_HASH_FIELDS = ("token_hash_b", "token_hash")
+
+# Locks live only while a coroutine holds or awaits them, so idle spaces
+# do not accumulate entries.
+_space_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+    weakref.WeakValueDictionary()
+)
+# Invitations waiting for a batched write, keyed by (space id, storage config).
+_pending_invitations: dict[
+    tuple[str, str],
+    list[tuple[InviteMemberInput, asyncio.Future[tuple[dict[str, Any], str]]]],
+] = {}
+# Running batch writes, referenced so the event loop does not drop them.
+_invitation_flushes: set[asyncio.Task[None]] = set()
 
 
 class InvitationDeliveryProvider(Protocol):
@@ -90,12 +130,12 @@ class RevokeMemberInput:
     revoked_by_user_id: str
 
 
-def _now_iso() -> str:
-    return datetime.now(tz=UTC).isoformat().replace("+00:00", "Z")
+def _format_iso(moment: datetime) -> str:
+    return moment.isoformat().replace("+00:00", "Z")
 
 
-def _is_valid_member_role(role: object) -> bool:
-    return isinstance(role, str) and role in _VALID_MEMBER_ROLES
+def _now_iso() -> str:
+    return _format_iso(datetime.now(tz=UTC))
 
 
 def _is_mutable_member_role(role: object) -> bool:
@@ -103,16 +143,133 @@ def _is_mutable_member_role(role: object) -> bool:
 
 
 def _normalize_settings(space_meta: dict[str, Any]) -> dict[str, Any]:
-    settings_obj = space_meta.get("settings")
-    settings = settings_obj if isinstance(settings_obj, dict) else {}
-    normalized = dict(settings)
-    members = normalized.get("members")
-    normalized["members"] = members if isinstance(members, dict) else {}
-    invitations = normalized.get("invitations")
-    normalized["invitations"] = invitations if isinstance(invitations, dict) else {}
-    version = normalized.get("membership_version")
-    normalized["membership_version"] = version if isinstance(version, int) else 0
-    return normalized
+    # Normalizes `space_meta["settings"]` in place: callers own the freshly
+    # read `space_meta` and patch the returned dict back to storage.
+    settings = space_meta.get("settings")
+    if not isinstance(settings, dict):
+        settings = {}
+        space_meta["settings"] = settings
+    if not isinstance(settings.get("members"), dict):
+        settings["members"] = {}
+    if not isinstance(settings.get("invitations"), dict):
+        settings["invitations"] = {}
+    if not isinstance(settings.get("invitations_by_token_hash"), dict):
+        settings["invitations_by_token_hash"] = _invitation_token_index(
+            settings["invitations"],
+        )
+    if not isinstance(settings.get("pending_invitations_by_user"), dict):
+        settings["pending_invitations_by_user"] = _pending_invitation_index(
+            settings["invitations"],
+        )
+    if not isinstance(settings.get("membership_version"), int):
+        settings["membership_version"] = 0
+    return settings
+
+
+def _invitation_token_index(invitations: dict[str, Any]) -> dict[str, str]:
+    # Spaces written before the index existed rebuild it here; the next
+    # membership write persists it alongside the invitations. Only pending
+    # invitations are indexed, so the index does not grow with history.
+    index: dict[str, str] = {}
+    for key, invitation in invitations.items():
+        if not isinstance(key, str) or not isinstance(invitation, dict):
+            continue
+        if invitation.get("state") != "pending":
+            continue
+        for field in _TOKEN_HASH_FIELDS:
+            token_hash = invitation.get(field)
+            if isinstance(token_hash, str):
+                index[token_hash] = key
+    return index
+
+
+def _pending_invitation_index(invitations: dict[str, Any]) -> dict[str, list[str]]:
+    index: dict[str, list[str]] = {}
+    for key, invitation in invitations.items():
+        if not isinstance(key, str) or not isinstance(invitation, dict):
+            continue
+        user_id = invitation.get("user_id")
+        if isinstance(user_id, str) and invitation.get("state") == "pending":
+            index.setdefault(user_id, []).append(key)
+    return index
+
+
+def _drop_pending_invitation(
+    settings: dict[str, Any],
+    user_id: str,
+    invitation_id: str,
+) -> None:
+    pending_index = settings["pending_invitations_by_user"]
+    pending = pending_index.get(user_id)
+    if not isinstance(pending, list):
+        return
+    remaining = [item for item in pending if item != invitation_id]
+    if remaining:
+        pending_index[user_id] = remaining
+    else:
+        pending_index.pop(user_id, None)
+
+
+def _retire_invitation(
+    settings: dict[str, Any],
+    invitation_id: str,
+    invitation: dict[str, Any],
+) -> None:
+    # Called once an invitation leaves the pending state: its tokens can no
+    # longer be accepted, so both indexes forget it.
+    token_index = settings["invitations_by_token_hash"]
+    for field in _TOKEN_HASH_FIELDS:
+        token_hash = invitation.get(field)
+        if isinstance(token_hash, str) and token_index.get(token_hash) == invitation_id:
+            del token_index[token_hash]
+    user_id = invitation.get("user_id")
+    if isinstance(user_id, str):
+        _drop_pending_invitation(settings, user_id, invitation_id)
+
+
+def _find_invitation_by_token(
+    settings: dict[str, Any],
+    token: str,
+) -> tuple[str, dict[str, Any]] | None:
+    invitations = settings["invitations"]
+    token_index = settings["invitations_by_token_hash"]
+    digest = _token_digest(token)
+    # Invitations created before `token_hash_b` store the hex digest.
+    candidates = (("token_hash_b", _token_hash(digest)), ("token_hash", digest.hex()))
+    for field, requested_hash in candidates:
+        indexed_key = token_index.get(requested_hash)
+        if not isinstance(indexed_key, str):
+            continue
+        invitation = invitations.get(indexed_key)
+        if isinstance(invitation, dict) and invitation.get(field) == requested_hash:
+            return indexed_key, invitation
+        del token_index[requested_hash]
+
+    # Writers that do not maintain the index (older workers, the CLI) leave
+    # their invitations out of it, so a miss falls back to a scan and
+    # repairs the index for the invitation it finds.
+    for key, invitation in invitations.items():
+        if not isinstance(key, str) or not isinstance(invitation, dict):
+            continue
+        for field, requested_hash in candidates:
+            if invitation.get(field) == requested_hash:
+                if invitation.get("state") == "pending":
+                    token_index[requested_hash] = key
+                return key, invitation
+    return None
+
+
+def _pending_invitation_ids(settings: dict[str, Any], user_id: str) -> list[str]:
+    # Revocation must not miss an invitation the index lacks, so it scans the
+    # invitations themselves rather than trusting the per-user index.
+    return [
+        key
+        for key, invitation in settings["invitations"].items()
+        if isinstance(key, str)
+        and isinstance(invitation, dict)
+        and invitation.get("user_id") == user_id
+        and invitation.get("state") == "pending"
+    ]
 
 
 def _increment_membership_version(settings: dict[str, Any]) -> None:
@@ -121,18 +278,20 @@ def _increment_membership_version(settings: dict[str, Any]) -> None:
 
 
 def _active_member_roles(settings: dict[str, Any]) -> dict[str, str]:
-    roles: dict[str, str] = {}
     members = settings.get("members")
     if not isinstance(members, dict):
-        return roles
-    for user_id, member in members.items():
-        if not isinstance(user_id, str) or not isinstance(member, dict):
-            continue
-        state = member.get("state")
-        role = member.get("role")
-        if state == "active" and _is_valid_member_role(role):
-            roles[user_id] = cast("str", role)
-    return roles
+        return {}
+    # Members are decoded JSON, so exact type checks suffice; the role is
+    # checked to be a string before the (hashing) set membership test.
+    return {
+        user_id: member["role"]
+        for user_id, member in members.items()
+        if type(user_id) is str
+        and type(member) is dict
+        and member.get("state") == "active"
+        and type(member.get("role")) is str
+        and member["role"] in _VALID_MEMBER_ROLES
+    }
 
 
 def _owner_user_id(space_meta: dict[str, Any], settings: dict[str, Any]) -> str | None:
@@ -151,30 +310,25 @@ def _legacy_maps(
     settings: dict[str, Any],
 ) -> tuple[str | None, list[str], dict[str, str]]:
     owner_user_id = _owner_user_id(space_meta, settings)
-    active_roles = _active_member_roles(settings)
 
-    member_roles = {
-        user_id: role
-        for user_id, role in active_roles.items()
-        if role in _MUTABLE_MEMBER_ROLES
-    }
+    member_roles: dict[str, str] = {}
+    admin_user_ids: set[str] = set()
+    for user_id, role in _active_member_roles(settings).items():
+        if role in _MUTABLE_MEMBER_ROLES:
+            member_roles[user_id] = role
+            if role == "admin":
+                admin_user_ids.add(user_id)
 
     admin_user_ids_obj = settings.get("admin_user_ids")
-    admin_user_ids: list[str] = []
     if isinstance(admin_user_ids_obj, list):
-        admin_user_ids.extend(
+        admin_user_ids.update(
             item for item in admin_user_ids_obj if isinstance(item, str)
         )
 
-    admin_user_ids.extend(
-        user_id for user_id, role in active_roles.items() if role == "admin"
-    )
-
     if owner_user_id:
-        admin_user_ids.append(owner_user_id)
+        admin_user_ids.add(owner_user_id)
 
-    deduped_admin_ids = sorted(set(admin_user_ids))
-    return owner_user_id, deduped_admin_ids, member_roles
+    return owner_user_id, sorted(admin_user_ids), member_roles
 
 
 def _active_space_admin_user_ids(
@@ -214,40 +368,82 @@ def _ensure_space_retains_active_admin(
     raise RuntimeError(msg)
 
 
-async def _space_lock(space_id: str) -> asyncio.Lock:
-    async with _space_locks_guard:
-        existing = _space_locks.get(space_id)
-        if existing is not None:
-            return existing
-        created = asyncio.Lock()
-        _space_locks[space_id] = created
-        return created
+def _space_lock(space_id: str) -> asyncio.Lock:
+    # Runs without awaiting, so the lookup and insert cannot interleave with
+    # another coroutine on the event loop; no guard lock is needed.
+    existing = _space_locks.get(space_id)
+    if existing is not None:
+        return existing
+    return _space_locks.setdefault(space_id, asyncio.Lock())
 
 
-async def _patch_settings(
-    storage_config: dict[str, str],
-    space_id: str,
+def _build_settings_patch(
     space_meta: dict[str, Any],
     settings: dict[str, Any],
-) -> None:
-    owner_user_id, admin_user_ids, member_roles = _legacy_maps(
-        space_meta=space_meta,
-        settings=settings,
-    )
+    *,
+    roles_changed: bool,
+) -> str:
+    # The legacy maps only depend on active members. Writes that cannot change
+    # those reuse the stored maps, provided they were derived by this module
+    # from the previous membership version (other writers bump the version
+    # without refreshing them).
+    version = settings["membership_version"]
+    admin_user_ids = settings.get("admin_user_ids")
+    member_roles = settings.get("member_roles")
+    if (
+        not roles_changed
+        and settings.get("membership_maps_version") == version - 1
+        and isinstance(admin_user_ids, list)
+        and isinstance(member_roles, dict)
+    ):
+        owner_user_id = _owner_user_id(space_meta, settings)
+    else:
+        owner_user_id, admin_user_ids, member_roles = _legacy_maps(
+            space_meta=space_meta,
+            settings=settings,
+        )
+    settings["membership_maps_version"] = version
     settings["admin_user_ids"] = admin_user_ids
     settings["member_roles"] = member_roles
     if owner_user_id:
         settings["owner_user_id"] = owner_user_id
 
-    patch: dict[str, Any] = {
-        "settings": settings,
-        "admin_user_ids": admin_user_ids,
-        "member_roles": member_roles,
+    # `patch_space` merges top-level settings keys, so sending only the keys
+    # this module owns keeps unrelated settings (service accounts, form ACLs)
+    # out of the payload and safe from being overwritten with stale copies.
+    patch = {
+        "settings": {
+            key: settings[key] for key in _MEMBERSHIP_SETTINGS_KEYS if key in settings
+        },
     }
-    if owner_user_id:
-        patch["owner_user_id"] = owner_user_id
+    return json.dumps(patch, separators=(",", ":"))
 
-    await _core_any.patch_space(storage_config, space_id, json.dumps(patch))
+
+async def _patch_settings(
+    storage_config: dict[str, str],
+    space_id: str,
+    space_meta: dict[str, Any],
+    settings: dict[str, Any],
+    *,
+    roles_changed: bool = True,
+) -> None:
+    # Large spaces build the patch on a worker thread so other spaces keep
+    # making progress; the caller holds the space lock, so nothing else
+    # touches `settings` meanwhile.
+    if len(settings["members"]) + len(settings["invitations"]) > _OFFLOAD_ENTRIES:
+        patch_json = await asyncio.to_thread(
+            _build_settings_patch,
+            space_meta,
+            settings,
+            roles_changed=roles_changed,
+        )
+    else:
+        patch_json = _build_settings_patch(
+            space_meta,
+            settings,
+            roles_changed=roles_changed,
+        )
+    await _core_any.patch_space(storage_config, space_id, patch_json)
 
 
 def admin_space_id() -> str:
@@ -297,14 +493,13 @@ def _build_member_record(
     invited_at: str,
     state: str,
 ) -> dict[str, Any]:
-    return {
-        "user_id": user_id,
-        "role": role,
-        "state": state,
-        "invited_by": invited_by,
-        "invited_at": invited_at,
-        "revoked_at": None,
-    }
+    member = _MEMBER_RECORD_TEMPLATE.copy()
+    member["user_id"] = user_id
+    member["role"] = role
+    member["state"] = state
+    member["invited_by"] = invited_by
+    member["invited_at"] = invited_at
+    return member
 
 
 async def bootstrap_space_owner(
@@ -318,7 +513,7 @@ async def bootstrap_space_owner(
         msg = "owner_user_id must not be empty"
         raise RuntimeError(msg)
 
-    lock = await _space_lock(space_id)
+    lock = _space_lock(space_id)
     async with lock:
         space_meta_obj = await _core_any.get_space(storage_config, space_id)
         space_meta = cast("dict[str, Any]", space_meta_obj)
@@ -367,7 +562,7 @@ async def ensure_admin_space(
         if "already exists" not in str(exc).lower():
             raise
 
-    lock = await _space_lock(space_id)
+    lock = _space_lock(space_id)
     async with lock:
         space_meta_obj = await _core_any.get_space(storage_config, space_id)
         space_meta = cast("dict[str, Any]", space_meta_obj)
@@ -398,8 +593,13 @@ async def ensure_admin_space(
         return member
 
 
-def _token_hash(token: str) -> str:
-    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def _token_hash(digest: bytes) -> str:
+    # Unpadded base64url of the raw digest: 43 characters instead of 64 hex.
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
 
 
 async def list_members(
@@ -409,27 +609,117 @@ async def list_members(
     """Return all member records for a space."""
     space_meta_obj = await _core_any.get_space(storage_config, space_id)
     space_meta = cast("dict[str, Any]", space_meta_obj)
-    settings = _normalize_settings(space_meta)
-    members = settings.get("members")
+    settings = space_meta.get("settings")
+    members = settings.get("members") if isinstance(settings, dict) else None
     if not isinstance(members, dict):
         return []
 
+    # The records come from a fresh read, so they are returned without copying.
+    # Records are stored under their user id, so ordering by key orders them
+    # by user id.
     results: list[dict[str, Any]] = []
-    for user_id, member in members.items():
-        if isinstance(user_id, str) and isinstance(member, dict):
-            normalized = dict(member)
-            normalized.setdefault("user_id", user_id)
-            results.append(normalized)
-    results.sort(key=lambda item: str(item.get("user_id", "")))
+    for user_id, member in sorted(members.items(), key=itemgetter(0)):
+        if isinstance(member, dict):
+            member.setdefault("user_id", user_id)
+            results.append(member)
     return results
 
 
-async def create_invitation(
+def _add_invitation(
+    settings: dict[str, Any],
+    payload: InviteMemberInput,
+    now: datetime,
+) -> tuple[dict[str, Any], str]:
+    members = settings["members"]
+    current = members.get(payload.user_id)
+    if isinstance(current, dict) and current.get("state") == "active":
+        msg = f"Member already active: {payload.user_id}"
+        raise RuntimeError(msg)
+
+    token = secrets.token_urlsafe(24)
+    invited_at = _format_iso(now)
+    expires_seconds = max(60, payload.expires_in_seconds)
+    expires_at = (now + timedelta(seconds=expires_seconds)).isoformat()
+
+    token_hash = _token_hash(_token_digest(token))
+    invitation_id = secrets.token_urlsafe(12)
+    invitation = {
+        "id": invitation_id,
+        "token_hash_b": token_hash,
+        "user_id": payload.user_id,
+        "role": payload.role,
+        "email": payload.email,
+        "state": "pending",
+        "invited_by": payload.invited_by_user_id,
+        "invited_at": invited_at,
+        "expires_at": expires_at,
+    }
+    settings["invitations"][invitation_id] = invitation
+    settings["invitations_by_token_hash"][token_hash] = invitation_id
+    pending_index = settings["pending_invitations_by_user"]
+    pending = pending_index.get(payload.user_id)
+    if isinstance(pending, list):
+        pending.append(invitation_id)
+    else:
+        pending_index[payload.user_id] = [invitation_id]
+
+    members[payload.user_id] = _build_member_record(
+        user_id=payload.user_id,
+        role=payload.role,
+        invited_by=payload.invited_by_user_id,
+        invited_at=invited_at,
+        state="invited",
+    )
+    return invitation, token
+
+
+async def _flush_invitations(
     storage_config: dict[str, str],
     space_id: str,
-    payload: InviteMemberInput,
-) -> dict[str, Any]:
-    """Create a member invitation and transition member state to invited."""
+    key: tuple[str, str],
+) -> None:
+    lock = _space_lock(space_id)
+    async with lock:
+        batch = _pending_invitations.pop(key, [])
+        if not batch:
+            return
+        applied: list[tuple[asyncio.Future[Any], tuple[dict[str, Any], str]]] = []
+        try:
+            space_meta_obj = await _core_any.get_space(storage_config, space_id)
+            space_meta = cast("dict[str, Any]", space_meta_obj)
+            settings = _normalize_settings(space_meta)
+            now = datetime.now(tz=UTC)
+            for payload, future in batch:
+                if future.done():
+                    continue
+                try:
+                    applied.append((future, _add_invitation(settings, payload, now)))
+                except RuntimeError as exc:
+                    future.set_exception(exc)
+            if applied:
+                _increment_membership_version(settings)
+                await _patch_settings(
+                    storage_config,
+                    space_id,
+                    space_meta,
+                    settings,
+                    roles_changed=False,
+                )
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        except BaseException:
+            for _, future in batch:
+                future.cancel()
+            raise
+        for future, result in applied:
+            if not future.done():
+                future.set_result(result)
+
+
+def _validate_invitation(payload: InviteMemberInput) -> None:
     if not payload.user_id.strip():
         msg = "invited_user_id must not be empty"
         raise RuntimeError(msg)
@@ -437,52 +727,33 @@ async def create_invitation(
         msg = "role must be one of admin/editor/viewer"
         raise RuntimeError(msg)
 
-    lock = await _space_lock(space_id)
-    async with lock:
-        space_meta_obj = await _core_any.get_space(storage_config, space_id)
-        space_meta = cast("dict[str, Any]", space_meta_obj)
-        settings = _normalize_settings(space_meta)
-
-        members = settings["members"]
-        current = members.get(payload.user_id)
-        if isinstance(current, dict) and current.get("state") == "active":
-            msg = f"Member already active: {payload.user_id}"
-            raise RuntimeError(msg)
-
-        token = secrets.token_urlsafe(24)
-        invited_at = _now_iso()
-        expires_seconds = max(60, payload.expires_in_seconds)
-        expires_at = (
-            datetime.now(tz=UTC) + timedelta(seconds=expires_seconds)
-        ).isoformat()
-
-        token_hash = _token_hash(token)
-        invitation_id = secrets.token_urlsafe(12)
-        invitation = {
-            "id": invitation_id,
-            "token_hash": token_hash,
-            "user_id": payload.user_id,
-            "role": payload.role,
-            "email": payload.email,
-            "state": "pending",
-            "invited_by": payload.invited_by_user_id,
-            "invited_at": invited_at,
-            "expires_at": expires_at,
-        }
-        invitations = settings["invitations"]
-        invitations[invitation_id] = invitation
-
-        members[payload.user_id] = _build_member_record(
-            user_id=payload.user_id,
-            role=payload.role,
-            invited_by=payload.invited_by_user_id,
-            invited_at=invited_at,
-            state="invited",
-        )
-
-        _increment_membership_version(settings)
-        await _patch_settings(storage_config, space_id, space_meta, settings)
 
+def _queue_invitation(
+    storage_config: dict[str, str],
+    space_id: str,
+    payload: InviteMemberInput,
+) -> asyncio.Future[tuple[dict[str, Any], str]]:
+    key = (space_id, json.dumps(storage_config, sort_keys=True))
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[tuple[dict[str, Any], str]] = loop.create_future()
+    queued = _pending_invitations.setdefault(key, [])
+    queued.append((payload, future))
+    if len(queued) == 1:
+        # The batch is written by its own task rather than by the caller that
+        # opened it, so cancelling that caller while it waits for the space
+        # lock cannot strand the invitations queued behind it.
+        task = loop.create_task(_flush_invitations(storage_config, space_id, key))
+        _invitation_flushes.add(task)
+        task.add_done_callback(_invitation_flushes.discard)
+    return future
+
+
+async def _invitation_response(
+    space_id: str,
+    payload: InviteMemberInput,
+    future: asyncio.Future[tuple[dict[str, Any], str]],
+) -> dict[str, Any]:
+    invitation, token = await future
     response_invitation = dict(invitation)
     response_invitation["token"] = token
 
@@ -504,6 +775,49 @@ async def create_invitation(
     }
 
 
+async def create_invitation(
+    storage_config: dict[str, str],
+    space_id: str,
+    payload: InviteMemberInput,
+) -> dict[str, Any]:
+    """Create a member invitation and transition member state to invited."""
+    _validate_invitation(payload)
+
+    # Invitations queued while the space lock is busy are written together;
+    # each caller still gets its own result. A caller cancelled before the
+    # write cancels its future, which drops its invitation from the batch.
+    future = _queue_invitation(storage_config, space_id, payload)
+    return await _invitation_response(space_id, payload, future)
+
+
+async def bulk_create_invitations(
+    storage_config: dict[str, str],
+    items: list[tuple[str, InviteMemberInput]],
+    *,
+    return_exceptions: bool = False,
+) -> list[dict[str, Any] | BaseException]:
+    """Create invitations across spaces, writing each space once.
+
+    Spaces are written concurrently. Results follow the order of `items`; a
+    failed item raises, or is returned in place when `return_exceptions` is
+    true, as with `asyncio.gather`.
+    """
+    for _, payload in items:
+        _validate_invitation(payload)
+
+    queued = [
+        (space_id, payload, _queue_invitation(storage_config, space_id, payload))
+        for space_id, payload in items
+    ]
+    return await asyncio.gather(
+        *(
+            _invitation_response(space_id, payload, future)
+            for space_id, payload, future in queued
+        ),
+        return_exceptions=return_exceptions,
+    )
+
+
 async def accept_invitation(
     storage_config: dict[str, str],
     space_id: str,
@@ -514,28 +828,18 @@ async def accept_invitation(
         msg = "token must not be empty"
         raise RuntimeError(msg)
 
-    lock = await _space_lock(space_id)
+    lock = _space_lock(space_id)
     async with lock:
         space_meta_obj = await _core_any.get_space(storage_config, space_id)
         space_meta = cast("dict[str, Any]", space_meta_obj)
         settings = _normalize_settings(space_meta)
 
         invitations = settings["invitations"]
-        invitation_key: str | None = None
-        invitation_obj: dict[str, Any] | None = None
-        requested_hash = _token_hash(payload.token)
-        for key, candidate in invitations.items():
-            if not isinstance(key, str) or not isinstance(candidate, dict):
-                continue
-            candidate_hash = candidate.get("token_hash")
-            if isinstance(candidate_hash, str) and candidate_hash == requested_hash:
-                invitation_key = key
-                invitation_obj = candidate
-                break
-
-        if invitation_key is None or invitation_obj is None:
+        found = _find_invitation_by_token(settings, payload.token)
+        if found is None:
             msg = "Invitation token not found"
             raise RuntimeError(msg)
+        invitation_key, invitation_obj = found
         if invitation_obj.get("state") != "pending":
             msg = "Invitation token is not pending"
             raise RuntimeError(msg)
@@ -549,11 +853,19 @@ async def accept_invitation(
             raise RuntimeError(msg)
 
         expiry = _parse_expiry(invitation_obj.get("expires_at"))
-        if expiry and expiry < datetime.now(tz=UTC):
+        now = datetime.now(tz=UTC)
+        if expiry and expiry < now:
             invitation_obj["state"] = "expired"
             invitations[invitation_key] = invitation_obj
+            _retire_invitation(settings, invitation_key, invitation_obj)
             _increment_membership_version(settings)
-            await _patch_settings(storage_config, space_id, space_meta, settings)
+            await _patch_settings(
+                storage_config,
+                space_id,
+                space_meta,
+                settings,
+                roles_changed=False,
+            )
             msg = "Invitation token expired"
             raise RuntimeError(msg)
 
@@ -562,11 +874,12 @@ async def accept_invitation(
             msg = "Invitation has invalid role"
             raise TypeError(msg)
 
-        now_iso = _now_iso()
+        now_iso = _format_iso(now)
         invitation_obj["state"] = "accepted"
         invitation_obj["accepted_at"] = now_iso
         invitation_obj["accepted_by"] = payload.accepted_by_user_id
         invitations[invitation_key] = invitation_obj
+        _retire_invitation(settings, invitation_key, invitation_obj)
 
         members = settings["members"]
         members[payload.accepted_by_user_id] = _build_member_record(
@@ -604,7 +917,7 @@ async def update_member_role(
         msg = "role must be one of admin/editor/viewer"
         raise RuntimeError(msg)
 
-    lock = await _space_lock(space_id)
+    lock = _space_lock(space_id)
     async with lock:
         space_meta_obj = await _core_any.get_space(storage_config, space_id)
         space_meta = cast("dict[str, Any]", space_meta_obj)
@@ -621,16 +934,18 @@ async def update_member_role(
             msg = f"Member is revoked: {payload.member_user_id}"
             raise RuntimeError(msg)
 
-        member_obj["role"] = payload.role
-        member_obj["updated_at"] = _now_iso()
-        members[payload.member_user_id] = member_obj
-        _ensure_space_retains_active_admin(
-            space_id=space_id,
-            space_meta=space_meta,
-            settings=settings,
-        )
-        _increment_membership_version(settings)
-        await _patch_settings(storage_config, space_id, space_meta, settings)
+        # Re-assigning the current role changes nothing, so skip the write.
+        if member_obj.get("role") != payload.role:
+            member_obj["role"] = payload.role
+            member_obj["updated_at"] = _now_iso()
+            members[payload.member_user_id] = member_obj
+            _ensure_space_retains_active_admin(
+                space_id=space_id,
+                space_meta=space_meta,
+                settings=settings,
+            )
+            _increment_membership_version(settings)
+            await _patch_settings(storage_config, space_id, space_meta, settings)
 
     event = _audit_event(
         action="member.role_change",
@@ -648,7 +963,7 @@ async def revoke_member(
     payload: RevokeMemberInput,
 ) -> dict[str, Any]:
     """Revoke member access and invalidate pending invitations."""
-    lock = await _space_lock(space_id)
+    lock = _space_lock(space_id)
     async with lock:
         space_meta_obj = await _core_any.get_space(storage_config, space_id)
         space_meta = cast("dict[str, Any]", space_meta_obj)
@@ -668,30 +983,32 @@ async def revoke_member(
             msg = f"Member record malformed: {payload.member_user_id}"
             raise TypeError(msg)
 
-        revoked_at = _now_iso()
-        member_obj["state"] = "revoked"
-        member_obj["revoked_at"] = revoked_at
-        members[payload.member_user_id] = member_obj
-
-        invitations = settings["invitations"]
-        for token, invitation in invitations.items():
-            if not isinstance(invitation, dict):
-                continue
-            same_user = invitation.get("user_id") == payload.member_user_id
-            is_pending = invitation.get("state") == "pending"
-            if same_user and is_pending:
+        # Revoking an already revoked member with no pending invitations is a
+        # no-op, so skip the write.
+        pending = _pending_invitation_ids(settings, payload.member_user_id)
+        already_revoked = member_obj.get("state") == "revoked"
+        if not already_revoked or pending:
+            revoked_at = _now_iso()
+            member_obj["state"] = "revoked"
+            member_obj["revoked_at"] = revoked_at
+            members[payload.member_user_id] = member_obj
+
+            invitations = settings["invitations"]
+            for invitation_id in pending:
+                invitation = invitations[invitation_id]
                 invitation["state"] = "revoked"
                 invitation["revoked_at"] = revoked_at
                 invitation["revoked_by"] = payload.revoked_by_user_id
-                invitations[token] = invitation
+                _retire_invitation(settings, invitation_id, invitation)
+            settings["pending_invitations_by_user"].pop(payload.member_user_id, None)
 
-        _ensure_space_retains_active_admin(
-            space_id=space_id,
-            space_meta=space_meta,
-            settings=settings,
-        )
-        _increment_membership_version(settings)
-        await _patch_settings(storage_config, space_id, space_meta, settings)
+            _ensure_space_retains_active_admin(
+                space_id=space_id,
+                space_meta=space_meta,
+                settings=settings,
+            )
+            _increment_membership_version(settings)
+            await _patch_settings(storage_config, space_id, space_meta, settings)
 
     event = _audit_event(
         action="member.revoke",
@@ -704,8 +1021,9 @@ async def revoke_member(
 
 def is_active_member(space_meta: dict[str, Any], user_id: str) -> bool:
     """Return True when the user is an active member by lifecycle state."""
-    settings = _normalize_settings(space_meta)
-    members = settings.get("members")
+    # Read-only: `space_meta` belongs to the caller, so it is not normalized.
+    settings = space_meta.get("settings")
+    members = settings.get("members") if isinstance(settings, dict) else None
     if not isinstance(members, dict):
         return False
     member_obj = members.get(user_id)
@@ -722,6 +1040,7 @@ __all__ = [
     "TokenOnlyInvitationProvider",
     "UpdateMemberRoleInput",
     "accept_invitation",
+    "bulk_create_invitations",
     "create_invitation",
     "is_active_member",
     "list_members",
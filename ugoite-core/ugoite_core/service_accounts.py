@@ -3,19 +3,23 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import secrets
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from operator import itemgetter
 from typing import Any, cast
 
 from . import _ugoite_core as _core
-from .audit import AuditEventInput, append_audit_event
+from .audit import AuditEventInput, defer_audit_event, patch_space_with_audit
 
 _core_any = cast("Any", _core)
+_created_at = itemgetter("created_at")
 
 _space_locks: dict[str, asyncio.Lock] = {}
-_space_locks_guard = asyncio.Lock()
 
 _ALL_SERVICE_SCOPES: frozenset[str] = frozenset(
     {
@@ -33,7 +37,23 @@ _ALL_SERVICE_SCOPES: frozenset[str] = frozenset(
     },
 )
 
-_API_KEY_HASH_ALGORITHM = "pbkdf2_sha256_v1"
+# Shared scope sets for stored scope lists, keyed by the list as a tuple. Only
+# normalized lists are kept, so the table is bounded by the subsets of
+# _ALL_SERVICE_SCOPES.
+_scope_sets: dict[tuple[str, ...], frozenset[str]] = {}
+
+# Recently verified secrets, keyed by SHA-256 of space id and secret, mapped to
+# (account id, key id, stored secret_hash, monotonic expiry). A hit skips the
+# scan and hashing but is only honoured while the freshly read key record still
+# carries the same secret_hash, so revocation and rotation need no explicit
+# invalidation and other workers' writes are picked up.
+_verified_keys: OrderedDict[bytes, tuple[str, str, str, float]] = OrderedDict()
+_VERIFIED_KEY_TTL_SECONDS = 60.0
+_VERIFIED_KEY_CAPACITY = 1024
+
+_API_KEY_HASH_ALGORITHM = "hmac_sha256_v1"
+_API_KEY_PBKDF2_ALGORITHM = "pbkdf2_sha256_v1"
+_API_KEY_PREFIX_LENGTH = 12
 
 
 @dataclass(frozen=True)
@@ -89,14 +109,13 @@ def _now_iso() -> str:
     return datetime.now(tz=UTC).isoformat().replace("+00:00", "Z")
 
 
-async def _space_lock(space_id: str) -> asyncio.Lock:
-    async with _space_locks_guard:
-        existing = _space_locks.get(space_id)
-        if existing is not None:
-            return existing
-        created = asyncio.Lock()
-        _space_locks[space_id] = created
-        return created
+def _space_lock(space_id: str) -> asyncio.Lock:
+    # Runs without awaiting, so the lookup and insert cannot interleave with
+    # another coroutine on the event loop; no guard lock is needed.
+    existing = _space_locks.get(space_id)
+    if existing is not None:
+        return existing
+    return _space_locks.setdefault(space_id, asyncio.Lock())
 
 
 def _normalize_settings(space_meta: dict[str, Any]) -> dict[str, Any]:
@@ -111,18 +130,30 @@ def _normalize_settings(space_meta: dict[str, Any]) -> dict[str, Any]:
 
 
 def _normalize_scopes(scopes: list[str]) -> list[str]:
-    normalized = [
-        scope.strip() for scope in scopes if isinstance(scope, str) and scope.strip()
-    ]
-    deduped = sorted(set(normalized))
-    if not deduped:
+    cleaned = {scope.strip() for scope in scopes if isinstance(scope, str)}
+    cleaned.discard("")
+    if not cleaned:
         msg = "service account scopes must not be empty"
         raise RuntimeError(msg)
-    invalid = [scope for scope in deduped if scope not in _ALL_SERVICE_SCOPES]
+    invalid = cleaned - _ALL_SERVICE_SCOPES
     if invalid:
         msg = f"invalid service account scope(s): {', '.join(sorted(invalid))}"
         raise RuntimeError(msg)
-    return deduped
+    return sorted(cleaned)
+
+
+def _scope_set(scopes_obj: object) -> frozenset[str]:
+    if not isinstance(scopes_obj, list):
+        return frozenset()
+    key = tuple(scopes_obj)
+    try:
+        return _scope_sets[key]
+    except (KeyError, TypeError):
+        pass
+    scope_set = frozenset(scope for scope in key if isinstance(scope, str))
+    if scope_set <= _ALL_SERVICE_SCOPES and key == tuple(sorted(scope_set)):
+        _scope_sets[key] = scope_set
+    return scope_set
 
 
 def _new_service_account_id() -> str:
@@ -141,21 +172,94 @@ def _hash_api_key_secret(secret: str, salt: str) -> str:
     return cast("str", _core_any.hash_service_api_key_secret(secret, salt))
 
 
-def _verify_api_key_secret(key_obj: dict[str, Any], secret: str) -> bool:
-    key_hash = key_obj.get("secret_hash")
-    if not isinstance(key_hash, str):
-        return False
+def _may_match_prefix(key_obj: dict[str, Any], secret: str) -> bool:
+    # The stored plaintext prefix rules keys out without hashing. Older keys
+    # store a shorter prefix, and keys written before prefixes were recorded
+    # stay candidates.
+    key_prefix = key_obj.get("prefix")
+    return not isinstance(key_prefix, str) or secret.startswith(key_prefix)
+
+
+async def _match_api_key_secret(
+    key_objs: list[dict[str, Any]],
+    secret: str,
+) -> int | None:
+    # One native call for every candidate, so the secret is keyed into HMAC
+    # once rather than once per stored key.
+    candidates = [
+        (
+            key_obj["secret_hash"],
+            key_obj.get("hash_algorithm"),
+            key_obj.get("secret_salt"),
+        )
+        for key_obj in key_objs
+    ]
+    # PBKDF2 keys take far longer than one event-loop step to hash; the native
+    # call releases the GIL, so run those on a worker thread.
+    if any(candidate[1] == _API_KEY_PBKDF2_ALGORITHM for candidate in candidates):
+        return cast(
+            "int | None",
+            await asyncio.to_thread(
+                _core_any.match_service_api_key_secret,
+                secret,
+                candidates,
+            ),
+        )
+    return cast(
+        "int | None",
+        _core_any.match_service_api_key_secret(secret, candidates),
+    )
 
-    hash_algorithm = key_obj.get("hash_algorithm")
-    key_salt = key_obj.get("secret_salt")
-    return bool(
-        _core_any.verify_service_api_key_secret(
-            key_hash,
-            secret,
-            hash_algorithm,
-            key_salt,
-        ),
+
+def _service_accounts_patch(accounts: dict[str, Any]) -> str:
+    # patch_space replaces settings per top-level key, so sending only
+    # service_accounts skips serializing the rest of the settings and cannot
+    # overwrite settings written concurrently by other modules. Key order is
+    # irrelevant: the native side parses into sorted maps before writing.
+    return json.dumps(
+        {"settings": {"service_accounts": accounts}},
+        separators=(",", ":"),
+    )
+
+
+def _cached_key_match(
+    cache_key: bytes,
+    accounts: dict[str, Any],
+) -> tuple[str, dict[str, Any], str, dict[str, Any]] | None:
+    cached = _verified_keys.get(cache_key)
+    if cached is None:
+        return None
+    service_account_id, key_id, secret_hash, expires_at = cached
+    account_obj = accounts.get(service_account_id)
+    keys_obj = account_obj.get("keys") if isinstance(account_obj, dict) else None
+    key_obj = keys_obj.get(key_id) if isinstance(keys_obj, dict) else None
+    if (
+        time.monotonic() >= expires_at
+        or not isinstance(key_obj, dict)
+        or key_obj.get("secret_hash") != secret_hash
+        or bool(cast("dict[str, Any]", account_obj).get("disabled", False))
+    ):
+        del _verified_keys[cache_key]
+        return None
+    _verified_keys.move_to_end(cache_key)
+    return service_account_id, cast("dict[str, Any]", account_obj), key_id, key_obj
+
+
+def _remember_key_match(
+    cache_key: bytes,
+    service_account_id: str,
+    key_id: str,
+    key_obj: dict[str, Any],
+) -> None:
+    _verified_keys[cache_key] = (
+        service_account_id,
+        key_id,
+        key_obj["secret_hash"],
+        time.monotonic() + _VERIFIED_KEY_TTL_SECONDS,
     )
+    _verified_keys.move_to_end(cache_key)
+    while len(_verified_keys) > _VERIFIED_KEY_CAPACITY:
+        _verified_keys.popitem(last=False)
 
 
 def _key_public_view(key_obj: dict[str, Any]) -> dict[str, Any]:
@@ -172,6 +276,15 @@ def _key_public_view(key_obj: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _sort_newest_first(items: list[dict[str, Any]]) -> None:
+    # Stored timestamps are ISO strings, so the C-level itemgetter key sorts
+    # them directly; records missing created_at fall back to sorting it as "".
+    try:
+        items.sort(key=_created_at, reverse=True)
+    except TypeError:
+        items.sort(key=lambda item: str(item.get("created_at") or ""), reverse=True)
+
+
 def _service_account_public_view(
     account_id: str,
     account_obj: dict[str, Any],
@@ -183,7 +296,7 @@ def _service_account_public_view(
         for key_obj in keys.values()
         if isinstance(key_obj, dict)
     ]
-    key_list.sort(key=lambda item: str(item.get("created_at") or ""), reverse=True)
+    _sort_newest_first(key_list)
     return {
         "id": account_id,
         "user_id": account_obj.get("user_id"),
@@ -196,22 +309,27 @@ def _service_account_public_view(
     }
 
 
+async def _read_service_accounts(
+    storage_config: dict[str, str],
+    space_id: str,
+) -> dict[str, Any]:
+    space_meta_obj = await _core_any.get_space(storage_config, space_id)
+    space_meta = cast("dict[str, Any]", space_meta_obj)
+    return _normalize_settings(space_meta)["service_accounts"]
+
+
 async def list_service_accounts(
     storage_config: dict[str, str],
     space_id: str,
 ) -> list[dict[str, Any]]:
     """List service accounts and key metadata for a space."""
-    space_meta_obj = await _core_any.get_space(storage_config, space_id)
-    space_meta = cast("dict[str, Any]", space_meta_obj)
-    settings = _normalize_settings(space_meta)
-    accounts_obj = settings.get("service_accounts")
-    accounts = accounts_obj if isinstance(accounts_obj, dict) else {}
+    accounts = await _read_service_accounts(storage_config, space_id)
     result = [
         _service_account_public_view(account_id, account_obj)
         for account_id, account_obj in accounts.items()
         if isinstance(account_id, str) and isinstance(account_obj, dict)
     ]
-    result.sort(key=lambda item: str(item.get("created_at") or ""), reverse=True)
+    _sort_newest_first(result)
     return result
 
 
@@ -233,13 +351,9 @@ async def create_service_account(
 
     scopes = _normalize_scopes(payload.scopes)
 
-    lock = await _space_lock(space_id)
+    lock = _space_lock(space_id)
     async with lock:
-        space_meta_obj = await _core_any.get_space(storage_config, space_id)
-        space_meta = cast("dict[str, Any]", space_meta_obj)
-        settings = _normalize_settings(space_meta)
-        accounts_obj = settings.get("service_accounts")
-        accounts = accounts_obj if isinstance(accounts_obj, dict) else {}
+        accounts = await _read_service_accounts(storage_config, space_id)
 
         account_id = _new_service_account_id()
         user_id = f"service:{space_id}:{account_id}"
@@ -254,35 +368,26 @@ async def create_service_account(
             "keys": {},
         }
         accounts[account_id] = account
-        settings["service_accounts"] = accounts
 
-        await _core_any.patch_space(
+        await patch_space_with_audit(
             storage_config,
             space_id,
-            json.dumps({"settings": settings}, separators=(",", ":"), sort_keys=True),
+            _service_accounts_patch(accounts),
+            [
+                AuditEventInput(
+                    action="service_account.create",
+                    actor_user_id=created_by,
+                    outcome="success",
+                    target_type="service_account",
+                    target_id=account_id,
+                    metadata={"scopes": scopes},
+                ),
+            ],
         )
-
-    await append_audit_event(
-        storage_config,
-        space_id,
-        AuditEventInput(
-            action="service_account.create",
-            actor_user_id=created_by,
-            outcome="success",
-            target_type="service_account",
-            target_id=account_id,
-            metadata={"scopes": scopes},
-        ),
-    )
     return _service_account_public_view(account_id, account)
 
 
-async def create_service_account_key(
-    storage_config: dict[str, str],
-    space_id: str,
-    payload: CreateServiceAccountKeyInput,
-) -> dict[str, Any]:
-    """Create a new service-account API key with one-time secret reveal."""
+def _create_key_fields(payload: CreateServiceAccountKeyInput) -> tuple[str, str, str]:
     service_account_id = payload.service_account_id.strip()
     key_name = payload.key_name.strip()
     created_by = payload.created_by_user_id.strip()
@@ -295,64 +400,118 @@ async def create_service_account_key(
     if not created_by:
         msg = "created_by_user_id must not be empty"
         raise RuntimeError(msg)
+    return service_account_id, key_name, created_by
+
+
+def _revoke_key_fields(payload: RevokeServiceAccountKeyInput) -> tuple[str, str, str]:
+    service_account_id = payload.service_account_id.strip()
+    key_id = payload.key_id.strip()
+    revoked_by = payload.revoked_by_user_id.strip()
+    if not service_account_id:
+        msg = "service_account_id must not be empty"
+        raise RuntimeError(msg)
+    if not key_id:
+        msg = "key_id must not be empty"
+        raise RuntimeError(msg)
+    if not revoked_by:
+        msg = "revoked_by_user_id must not be empty"
+        raise RuntimeError(msg)
+    return service_account_id, key_id, revoked_by
 
+
+def _new_key(
+    key_name: str,
+    created_by: str,
+    rotated_from: str | None,
+) -> tuple[dict[str, Any], str]:
     secret = _new_secret()
     secret_salt = secrets.token_urlsafe(16)
-    secret_hash = _hash_api_key_secret(secret, secret_salt)
-    key_id = _new_key_id()
+    key_payload = {
+        "id": _new_key_id(),
+        "name": key_name,
+        "prefix": secret[:_API_KEY_PREFIX_LENGTH],
+        "secret_hash": _hash_api_key_secret(secret, secret_salt),
+        "secret_salt": secret_salt,
+        "hash_algorithm": _API_KEY_HASH_ALGORITHM,
+        "created_at": None,
+        "created_by_user_id": created_by,
+        "revoked_at": None,
+        "rotated_from": rotated_from,
+        "last_used_at": None,
+        "usage_count": 0,
+    }
+    return key_payload, secret
 
-    lock = await _space_lock(space_id)
-    async with lock:
-        space_meta_obj = await _core_any.get_space(storage_config, space_id)
-        space_meta = cast("dict[str, Any]", space_meta_obj)
-        settings = _normalize_settings(space_meta)
-        accounts_obj = settings.get("service_accounts")
-        accounts = accounts_obj if isinstance(accounts_obj, dict) else {}
-        account_obj = accounts.get(service_account_id)
-        if not isinstance(account_obj, dict):
-            msg = f"Service account not found: {service_account_id}"
-            raise RuntimeError(msg)
 
-        keys_obj = account_obj.get("keys")
-        keys = keys_obj if isinstance(keys_obj, dict) else {}
-        key_payload = {
-            "id": key_id,
-            "name": key_name,
-            "prefix": secret[:12],
-            "secret_hash": secret_hash,
-            "secret_salt": secret_salt,
-            "hash_algorithm": _API_KEY_HASH_ALGORITHM,
-            "created_at": _now_iso(),
-            "created_by_user_id": created_by,
-            "revoked_at": None,
-            "rotated_from": payload.rotated_from,
-            "last_used_at": None,
-            "usage_count": 0,
-        }
-        keys[key_id] = key_payload
-        account_obj["keys"] = keys
-        accounts[service_account_id] = account_obj
-        settings["service_accounts"] = accounts
+def _account_keys(accounts: dict[str, Any], service_account_id: str) -> dict[str, Any]:
+    account_obj = accounts.get(service_account_id)
+    if not isinstance(account_obj, dict):
+        msg = f"Service account not found: {service_account_id}"
+        raise RuntimeError(msg)
+
+    keys = account_obj.get("keys")
+    if not isinstance(keys, dict):
+        keys = account_obj["keys"] = {}
+    return keys
+
+
+def _revoke_key(keys: dict[str, Any], key_id: str, now: str) -> dict[str, Any]:
+    key_payload = keys.get(key_id)
+    if not isinstance(key_payload, dict):
+        msg = f"Service account key not found: {key_id}"
+        raise RuntimeError(msg)
+
+    if key_payload.get("revoked_at") is None:
+        key_payload["revoked_at"] = now
+    return key_payload
+
+
+def _key_audit_event(
+    action: str,
+    actor_user_id: str,
+    key_id: str,
+    service_account_id: str,
+) -> AuditEventInput:
+    return AuditEventInput(
+        action=action,
+        actor_user_id=actor_user_id,
+        outcome="success",
+        target_type="service_account_key",
+        target_id=key_id,
+        metadata={"service_account_id": service_account_id},
+    )
 
-        await _core_any.patch_space(
+
+async def create_service_account_key(
+    storage_config: dict[str, str],
+    space_id: str,
+    payload: CreateServiceAccountKeyInput,
+) -> dict[str, Any]:
+    """Create a new service-account API key with one-time secret reveal."""
+    service_account_id, key_name, created_by = _create_key_fields(payload)
+    key_payload, secret = _new_key(key_name, created_by, payload.rotated_from)
+
+    lock = _space_lock(space_id)
+    async with lock:
+        accounts = await _read_service_accounts(storage_config, space_id)
+        keys = _account_keys(accounts, service_account_id)
+        key_payload["created_at"] = _now_iso()
+        keys[key_payload["id"]] = key_payload
+
+        await patch_space_with_audit(
             storage_config,
             space_id,
-            json.dumps({"settings": settings}, separators=(",", ":"), sort_keys=True),
+            _service_accounts_patch(accounts),
+            [
+                _key_audit_event(
+                    "service_account.key.create",
+                    created_by,
+                    key_payload["id"],
+                    service_account_id,
+                ),
+            ],
         )
 
-    await append_audit_event(
-        storage_config,
-        space_id,
-        AuditEventInput(
-            action="service_account.key.create",
-            actor_user_id=created_by,
-            outcome="success",
-            target_type="service_account_key",
-            target_id=key_id,
-            metadata={"service_account_id": service_account_id},
-        ),
-    )
-
     return {
         "service_account_id": service_account_id,
         "key": _key_public_view(key_payload),
@@ -366,64 +525,28 @@ async def revoke_service_account_key(
     payload: RevokeServiceAccountKeyInput,
 ) -> dict[str, Any]:
     """Revoke a service-account API key immediately."""
-    service_account_id = payload.service_account_id.strip()
-    key_id = payload.key_id.strip()
-    revoked_by = payload.revoked_by_user_id.strip()
-    if not service_account_id:
-        msg = "service_account_id must not be empty"
-        raise RuntimeError(msg)
-    if not key_id:
-        msg = "key_id must not be empty"
-        raise RuntimeError(msg)
-    if not revoked_by:
-        msg = "revoked_by_user_id must not be empty"
-        raise RuntimeError(msg)
+    service_account_id, key_id, revoked_by = _revoke_key_fields(payload)
 
-    lock = await _space_lock(space_id)
+    lock = _space_lock(space_id)
     async with lock:
-        space_meta_obj = await _core_any.get_space(storage_config, space_id)
-        space_meta = cast("dict[str, Any]", space_meta_obj)
-        settings = _normalize_settings(space_meta)
-        accounts_obj = settings.get("service_accounts")
-        accounts = accounts_obj if isinstance(accounts_obj, dict) else {}
-        account_obj = accounts.get(service_account_id)
-        if not isinstance(account_obj, dict):
-            msg = f"Service account not found: {service_account_id}"
-            raise RuntimeError(msg)
-
-        keys_obj = account_obj.get("keys")
-        keys = keys_obj if isinstance(keys_obj, dict) else {}
-        key_payload = keys.get(key_id)
-        if not isinstance(key_payload, dict):
-            msg = f"Service account key not found: {key_id}"
-            raise RuntimeError(msg)
+        accounts = await _read_service_accounts(storage_config, space_id)
+        keys = _account_keys(accounts, service_account_id)
+        key_payload = _revoke_key(keys, key_id, _now_iso())
 
-        if key_payload.get("revoked_at") is None:
-            key_payload["revoked_at"] = _now_iso()
-        keys[key_id] = key_payload
-        account_obj["keys"] = keys
-        accounts[service_account_id] = account_obj
-        settings["service_accounts"] = accounts
-
-        await _core_any.patch_space(
+        await patch_space_with_audit(
             storage_config,
             space_id,
-            json.dumps({"settings": settings}, separators=(",", ":"), sort_keys=True),
+            _service_accounts_patch(accounts),
+            [
+                _key_audit_event(
+                    "service_account.key.revoke",
+                    revoked_by,
+                    key_id,
+                    service_account_id,
+                ),
+            ],
         )
 
-    await append_audit_event(
-        storage_config,
-        space_id,
-        AuditEventInput(
-            action="service_account.key.revoke",
-            actor_user_id=revoked_by,
-            outcome="success",
-            target_type="service_account_key",
-            target_id=key_id,
-            metadata={"service_account_id": service_account_id},
-        ),
-    )
-
     return {
         "service_account_id": service_account_id,
         "key": _key_public_view(key_payload),
@@ -436,39 +559,51 @@ async def rotate_service_account_key(
     payload: RotateServiceAccountKeyInput,
 ) -> dict[str, Any]:
     """Rotate an API key and return the new one-time secret."""
-    await revoke_service_account_key(
-        storage_config,
-        space_id,
+    service_account_id, key_id, rotated_by = _revoke_key_fields(
         RevokeServiceAccountKeyInput(
             service_account_id=payload.service_account_id,
             key_id=payload.key_id,
             revoked_by_user_id=payload.rotated_by_user_id,
         ),
     )
-    created = await create_service_account_key(
-        storage_config,
-        space_id,
+    _, key_name, _ = _create_key_fields(
         CreateServiceAccountKeyInput(
-            service_account_id=payload.service_account_id,
+            service_account_id=service_account_id,
             key_name=payload.key_name or f"rotated-{payload.key_id}",
-            created_by_user_id=payload.rotated_by_user_id,
-            rotated_from=payload.key_id,
+            created_by_user_id=rotated_by,
         ),
     )
+    key_payload, secret = _new_key(key_name, rotated_by, payload.key_id)
 
-    await append_audit_event(
-        storage_config,
-        space_id,
-        AuditEventInput(
-            action="service_account.key.rotate",
-            actor_user_id=payload.rotated_by_user_id,
-            outcome="success",
-            target_type="service_account_key",
-            target_id=payload.key_id,
-            metadata={"service_account_id": payload.service_account_id},
-        ),
-    )
-    return created
+    # Revocation and the replacement key land in one read and one write.
+    lock = _space_lock(space_id)
+    async with lock:
+        accounts = await _read_service_accounts(storage_config, space_id)
+        keys = _account_keys(accounts, service_account_id)
+        now = _now_iso()
+        _revoke_key(keys, key_id, now)
+        key_payload["created_at"] = now
+        keys[key_payload["id"]] = key_payload
+
+        await patch_space_with_audit(
+            storage_config,
+            space_id,
+            _service_accounts_patch(accounts),
+            [
+                _key_audit_event(action, rotated_by, target_id, service_account_id)
+                for action, target_id in (
+                    ("service_account.key.revoke", key_id),
+                    ("service_account.key.create", key_payload["id"]),
+                    ("service_account.key.rotate", key_id),
+                )
+            ],
+        )
+
+    return {
+        "service_account_id": service_account_id,
+        "key": _key_public_view(key_payload),
+        "secret": secret,
+    }
 
 
 async def resolve_service_api_key(
@@ -485,18 +620,17 @@ async def resolve_service_api_key(
     if not secret:
         msg = "Missing API key"
         raise RuntimeError(msg)
-    hashed = secret
 
-    matched_result: ServiceApiKeyAuthResult | None = None
-    matched_usage_count: int | None = None
-    lock = await _space_lock(space_id)
-    async with lock:
-        space_meta_obj = await _core_any.get_space(storage_config, space_id)
-        space_meta = cast("dict[str, Any]", space_meta_obj)
-        settings = _normalize_settings(space_meta)
-        accounts_obj = settings.get("service_accounts")
-        accounts = accounts_obj if isinstance(accounts_obj, dict) else {}
+    # Matching works on a snapshot read without the space lock, so lookups
+    # never queue behind one another or behind writers while hashing. Only
+    # the usage write below is serialized; it rejects keys revoked since the
+    # snapshot was read.
+    accounts = await _read_service_accounts(storage_config, space_id)
 
+    cache_key = hashlib.sha256(f"{space_id}\0{secret}".encode()).digest()
+    matched = _cached_key_match(cache_key, accounts)
+    if matched is None:
+        candidates: list[tuple[str, dict[str, Any], str, dict[str, Any]]] = []
         for service_account_id, account_obj in accounts.items():
             if not isinstance(service_account_id, str) or not isinstance(
                 account_obj,
@@ -506,70 +640,65 @@ async def resolve_service_api_key(
             if bool(account_obj.get("disabled", False)):
                 continue
 
-            scopes_obj = account_obj.get("scopes")
-            scopes = (
-                [scope for scope in scopes_obj if isinstance(scope, str)]
-                if isinstance(scopes_obj, list)
-                else []
-            )
             keys_obj = account_obj.get("keys")
             keys = keys_obj if isinstance(keys_obj, dict) else {}
+            candidates.extend(
+                (service_account_id, account_obj, key_id, key_obj)
+                for key_id, key_obj in keys.items()
+                if isinstance(key_id, str)
+                and isinstance(key_obj, dict)
+                and isinstance(key_obj.get("secret_hash"), str)
+                and _may_match_prefix(key_obj, secret)
+            )
 
-            for key_id, key_obj in keys.items():
-                if not isinstance(key_id, str) or not isinstance(key_obj, dict):
-                    continue
-                if not _verify_api_key_secret(key_obj, hashed):
-                    continue
-
-                if key_obj.get("revoked_at") is not None:
-                    msg = "API key has been revoked"
-                    raise RuntimeError(msg)
-
-                key_obj["last_used_at"] = _now_iso()
-                usage_count_obj = key_obj.get("usage_count", 0)
-                try:
-                    usage_count_int = int(usage_count_obj)
-                except (TypeError, ValueError):
-                    usage_count_int = 0
-                key_obj["usage_count"] = usage_count_int + 1
-                matched_usage_count = usage_count_int + 1
-                keys[key_id] = key_obj
-                account_obj["keys"] = keys
-                accounts[service_account_id] = account_obj
-                settings["service_accounts"] = accounts
-
-                await _core_any.patch_space(
-                    storage_config,
-                    space_id,
-                    json.dumps(
-                        {"settings": settings},
-                        separators=(",", ":"),
-                        sort_keys=True,
-                    ),
-                )
+        matched_index = await _match_api_key_secret(
+            [candidate[3] for candidate in candidates],
+            secret,
+        )
+        if matched_index is None:
+            msg = "Invalid API key"
+            raise RuntimeError(msg)
 
-                user_id_obj = account_obj.get("user_id")
-                display_name_obj = account_obj.get("display_name")
-                if not isinstance(user_id_obj, str):
-                    user_id_obj = f"service:{space_id}:{service_account_id}"
-                if not isinstance(display_name_obj, str):
-                    display_name_obj = service_account_id
-                matched_result = ServiceApiKeyAuthResult(
-                    user_id=user_id_obj,
-                    service_account_id=service_account_id,
-                    display_name=display_name_obj,
-                    key_id=key_id,
-                    scopes=frozenset(scopes),
-                )
-                break
-            if matched_result is not None:
-                break
+        matched = candidates[matched_index]
+        _remember_key_match(cache_key, matched[0], matched[2], matched[3])
 
-    if matched_result is None:
-        msg = "Invalid API key"
+    service_account_id, account_obj, key_id, key_obj = matched
+    if key_obj.get("revoked_at") is not None:
+        msg = "API key has been revoked"
         raise RuntimeError(msg)
 
-    await append_audit_event(
+    # Only this key's usage fields are rewritten, not the whole settings
+    # document.
+    lock = _space_lock(space_id)
+    async with lock:
+        matched_usage_count = cast(
+            "int",
+            await _core_any.record_service_api_key_use(
+                storage_config,
+                space_id,
+                service_account_id,
+                key_id,
+                _now_iso(),
+            ),
+        )
+
+    user_id_obj = account_obj.get("user_id")
+    display_name_obj = account_obj.get("display_name")
+    if not isinstance(user_id_obj, str):
+        user_id_obj = f"service:{space_id}:{service_account_id}"
+    if not isinstance(display_name_obj, str):
+        display_name_obj = service_account_id
+    matched_result = ServiceApiKeyAuthResult(
+        user_id=user_id_obj,
+        service_account_id=service_account_id,
+        display_name=display_name_obj,
+        key_id=key_id,
+        scopes=_scope_set(account_obj.get("scopes")),
+    )
+
+    # Usage events are written after the caller is authenticated, keeping the
+    # audit log write off the request path.
+    await defer_audit_event(
         storage_config,
         space_id,
         AuditEventInput(
@@ -583,7 +712,7 @@ async def resolve_service_api_key(
             request_id=request_id,
             metadata={
                 "service_account_id": matched_result.service_account_id,
-                "usage_count": str(matched_usage_count or 1),
+                "usage_count": str(matched_usage_count),
             },
         ),
     )